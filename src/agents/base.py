@@ -9,7 +9,7 @@ from src.agents.sims.drives import DriveSystem
 from src.agents.sims.personality import Personality
 from src.memory.context_assembler import ContextAssembler, ConversationCompressor
 from src.memory.mem0_client import AgentMemory
-from src.safety.injection_guard import assert_safe
+from src.safety.injection_guard import aassert_safe, assert_safe
 from src.token_tracker.tracker import TokenTracker
 
 logger = logging.getLogger(__name__)
@@ -193,7 +193,7 @@ class BaseAgent:
         max_tokens: int = 4096,
     ) -> str:
         """Async version of chat."""
-        assert_safe(user_message)
+        await aassert_safe(user_message)
         self._conversation.append({"role": "user", "content": user_message})
 
         # Compress old conversation instead of raw truncation
@@ -24,9 +24,12 @@ import re
 
 import yaml
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
+from src.json_utils import json_bytes
+from src.projects.registry import project_to_dict
+
 logger = logging.getLogger(__name__)
 
 health_router = APIRouter()
@@ -58,7 +61,7 @@ def broadcast_result(result: Any) -> None:
 
 
 @health_router.get("/projects")
-def list_projects(request: Request) -> dict[str, Any]:
+def list_projects(request: Request) -> Response:
     """List all projects from registry, grouped by category."""
     registry = request.app.state.registry
     store = request.app.state.health_store
@@ -86,7 +89,11 @@ def list_projects(request: Request) -> dict[str, Any]:
         g = p.get("group", "other")
         groups.setdefault(g, []).append(p)
 
-    return {"projects": projects, "groups": groups}
+    # Pre-encode (orjson when available) instead of FastAPI's jsonable_encoder walk
+    return Response(
+        content=json_bytes({"projects": projects, "groups": groups}),
+        media_type="application/json",
+    )
 
 
 @health_router.get("/projects/{project_id}")
@@ -99,8 +106,7 @@ def get_project(project_id: str, request: Request) -> dict[str, Any]:
     if not project:
         raise HTTPException(status_code=404, detail=f"Project not found: {project_id}")
 
-    from src.projects.registry import _project_to_dict
-    proj_dict = _project_to_dict(project)
+    proj_dict = project_to_dict(project)
 
     # Attach health status for each check (prod health)
     health_checks = []
@@ -84,6 +84,17 @@ def runner_status(request: Request) -> dict[str, Any]:
     return poller.state.to_dict()
 
 
+@runner_router.post("/reconnect")
+async def runner_reconnect(request: Request) -> dict[str, Any]:
+    """Trigger a health check now, skipping any backoff wait.
+
+    Returns the state as of the request; poll ``/runner/status`` for the result.
+    """
+    poller = request.app.state.runner_poller
+    poller.request_immediate_check()
+    return poller.state.to_dict()
+
+
 @runner_router.get("/debug")
 def runner_debug(request: Request) -> dict[str, Any]:
     """Debug runner connectivity — returns the exact error when offline.
@@ -317,7 +328,7 @@ async def stream_cmd(body: StreamCmdBody, request: Request):
             finally:
                 result_holder["done"] = True
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         loop.run_in_executor(None, _execute)
 
         # Send progress updates every 2s while waiting
@@ -28,7 +28,7 @@ from src.memory.curator import MemoryCurator, MemoryCurationStore
 from src.memory.mem0_client import AgentMemory
 from src.notifications.discord import DiscordNotifier, DiscordBotPoller
 from src.projects.registry import ProjectRegistry
-from src.runner_connector.client import RunnerClient
+from src.runner_connector.client import RunnerClient, aclose_shared_clients
 from src.runner_connector.poller import RunnerPoller
 from src.tasks.store import TaskStore
 from src.token_tracker.tracker import TokenTracker
@@ -278,7 +278,7 @@ async def lifespan(app: FastAPI):
                 )
             return "Heartbeat not running"
         elif command == "tasks":
-            tasks = task_store.list_by_column("backlog")
+            tasks = task_store.list_by_column("backlog", load_metadata=False)
             if tasks:
                 lines = [f"- [{t.priority}] {t.title}" for t in tasks[:10]]
                 return "📋 **Backlog:**\n" + "\n".join(lines)
@@ -412,6 +412,8 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "discord_notifier"):
         await app.state.discord_notifier.close()
     await runner_poller.stop()
+    runner_client.close()
+    await aclose_shared_clients()
     await scheduler.stop()
     store.close()
     task_store.close()
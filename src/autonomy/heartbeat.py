@@ -299,7 +299,7 @@ class HeartbeatScheduler:
 
     def _find_best_task(self) -> Task | None:
         """Find the highest-priority backlog task."""
-        tasks = self.task_store.list_by_column("backlog")
+        tasks = self.task_store.list_by_column("backlog", load_metadata=False)
         # Filter to autopilot-enabled tasks only for autonomous execution
         autopilot_tasks = [t for t in tasks if t.autopilot]
         if not autopilot_tasks:
@@ -310,7 +310,7 @@ class HeartbeatScheduler:
 
     def _find_easy_task(self) -> Task | None:
         """Find a low-priority backlog task (easy win for morale)."""
-        tasks = self.task_store.list_by_column("backlog")
+        tasks = self.task_store.list_by_column("backlog", load_metadata=False)
         autopilot_tasks = [t for t in tasks if t.autopilot]
         if not autopilot_tasks:
             return None
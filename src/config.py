@@ -28,6 +28,9 @@ class Settings(BaseSettings):
     # Daily call limit (not cost — just a rate guard)
     daily_call_limit: int = 200
 
+    # Recent usage records kept in memory by the OpenAI backend (older drop off)
+    max_usage_records: int = 10_000
+
     # Rate limit estimation (Pro plan defaults)
     # Session = 5-hour rolling window, Weekly = 7-day rolling window
     # These are estimated caps — Anthropic doesn't publish exact numbers
@@ -0,0 +1,18 @@
+"""Compact JSON encoding shared by the API and the runner."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional speedup
+    _orjson = None
+
+
+def json_bytes(obj: Any) -> bytes:
+    """Encode *obj* as compact JSON, using orjson when it is installed."""
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
@@ -13,19 +13,22 @@ and the cycle continues until all subtasks are approved.
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.runtime import Runtime
 
 from src.agents.backend import BackendAgent
 from src.agents.frontend import FrontendAgent
 from src.agents.manager import ManagerAgent
 from src.agents.tester import TesterAgent
 from src.memory.mem0_client import AgentMemory
-from src.orchestrator.state import SubtaskResult, WorkflowState
+from src.orchestrator.state import RunContext, SubtaskResult, WorkflowState
 from src.token_tracker.tracker import TokenTracker
 
 logger = logging.getLogger(__name__)
@@ -34,6 +37,20 @@ logger = logging.getLogger(__name__)
 _MAX_PARALLEL_WORKERS = 4
 
 
+@functools.lru_cache(maxsize=64)
+def _get_memory(agent_id: str, project_id: str | None) -> AgentMemory | None:
+    """Return a shared memory handle for *agent_id*, or ``None`` if unavailable.
+
+    Both outcomes are cached, so an unreachable Mem0 backend costs a single
+    connection attempt per process instead of one per graph build.
+    """
+    try:
+        return AgentMemory(agent_id=agent_id, project_id=project_id)
+    except Exception:
+        logger.warning("Memory unavailable for %s, continuing without", agent_id)
+        return None
+
+
 def _create_agents(
     tracker: TokenTracker,
     use_memory: bool = True,
@@ -44,12 +61,7 @@ def _create_agents(
     def _maybe_memory(agent_id: str, project_scoped: bool = True) -> AgentMemory | None:
         if not use_memory:
             return None
-        pid = project_id if project_scoped else None
-        try:
-            return AgentMemory(agent_id=agent_id, project_id=pid)
-        except Exception:
-            logger.warning("Memory unavailable for %s, continuing without", agent_id)
-            return None
+        return _get_memory(agent_id, project_id if project_scoped else None)
 
     # Athena (manager) gets both global memory (user profile) and per-project memory.
     # Sub-agents get only per-project memory (no cross-project leakage).
@@ -246,11 +258,12 @@ def executing_node(
 
     budget_remaining = budget_fn() if budget_fn else None
 
-    logger.info(
-        "Executing %d subtask(s) in parallel: %s",
-        len(ready_queue),
-        ", ".join(ready_queue),
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Executing %d subtask(s) in parallel: %s",
+            len(ready_queue),
+            ", ".join(ready_queue),
+        )
 
     # Use sync parallel execution (works both in and outside an event loop)
     results = _execute_parallel_sync(
@@ -272,11 +285,12 @@ async def aexecuting_node(state: dict, agents: dict[str, Any]) -> dict[str, Any]
     if not ready_queue:
         return {"phase": "reviewing", "results": results, "ready_queue": []}
 
-    logger.info(
-        "Async-executing %d subtask(s) in parallel: %s",
-        len(ready_queue),
-        ", ".join(ready_queue),
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Async-executing %d subtask(s) in parallel: %s",
+            len(ready_queue),
+            ", ".join(ready_queue),
+        )
 
     results = await _execute_parallel_async(ready_queue, results, agents)
     return {"phase": "reviewing", "results": results, "ready_queue": []}
@@ -286,55 +300,60 @@ def reviewing_node(state: dict, agents: dict[str, Any]) -> dict[str, Any]:
     """Manager reviews all newly executed subtask outputs."""
     manager: ManagerAgent = agents["manager"]
     results = dict(state["results"])
+    max_revisions = state["max_revisions"]
     needs_revision: list[str] = []
+    # Verdicts are tallied as we go so the routing below needs no extra passes
+    approved_ids: set[str] = set()
 
     for subtask_id, result in results.items():
-        if result.review_verdict != "pending" and result.output and not result.output.startswith("Error"):
-            if result.review_verdict in ("approve",):
-                continue
+        output = result.output
+        failed = not output or output.startswith("Error")
 
-        if not result.output or result.output.startswith("Error"):
-            if result.attempts < state["max_revisions"]:
+        if not failed and result.review_verdict == "approve":
+            approved_ids.add(subtask_id)
+            continue
+
+        if failed:
+            if result.attempts < max_revisions:
                 result.review_verdict = "redo"
                 needs_revision.append(subtask_id)
             else:
                 result.review_verdict = "approve"
-            results[subtask_id] = result
+                approved_ids.add(subtask_id)
             continue
 
         logger.info("Reviewing subtask %s", subtask_id)
-        review = manager.review_output(result.description, result.output)
+        review = manager.review_output(result.description, output)
 
         result.review_verdict = review.get("verdict", "approve")
         result.review_feedback = review.get("feedback", "")
         result.review_score = review.get("score", 7)
 
-        if result.review_verdict in ("revise", "redo") and result.attempts >= state["max_revisions"]:
+        if result.review_verdict in ("revise", "redo") and result.attempts >= max_revisions:
             logger.info("Subtask %s exceeded max revisions, force-approving", subtask_id)
             result.review_verdict = "approve"
 
         if result.review_verdict in ("revise", "redo"):
             needs_revision.append(subtask_id)
+        elif result.review_verdict == "approve":
+            approved_ids.add(subtask_id)
 
-        results[subtask_id] = result
-
-    all_approved = all(r.review_verdict == "approve" for r in results.values())
-
-    if all_approved:
+    if len(approved_ids) == len(results):
         next_phase = "synthesizing"
         ready_queue: list[str] = []
     else:
         next_phase = "executing"
-        approved_ids = {sid for sid, r in results.items() if r.review_verdict == "approve"}
         ready_queue = list(needs_revision)
+        queued = set(needs_revision)
 
         for st in state["subtasks"]:
             sid = st["id"]
-            if sid in approved_ids or sid in ready_queue:
+            if sid in approved_ids or sid in queued:
                 continue
             deps = st.get("depends_on", [])
             if deps and all(d in approved_ids for d in deps):
                 ready_queue.append(sid)
+                queued.add(sid)
 
     return {"phase": next_phase, "results": results, "ready_queue": ready_queue}
 
@@ -366,35 +385,36 @@ def route_after_review(state: dict) -> str:
 # -- Graph construction --------------------------------------------------------
 
 
-def build_graph(
-    tracker: TokenTracker | None = None,
-    use_memory: bool = True,
-    project_id: str | None = None,
-    stop_event: threading.Event | None = None,
-    token_budget: int | None = None,
-    calls_at_start: int = 0,
-) -> StateGraph:
-    """Build the LangGraph state graph for the multi-agent workflow."""
-    tracker = tracker or TokenTracker()
-    agents = _create_agents(tracker, use_memory=use_memory, project_id=project_id)
+def _plan(state: dict, runtime: Runtime[RunContext]) -> dict[str, Any]:
+    return planning_node(state, runtime.context.agents)
 
-    graph = StateGraph(WorkflowState)
 
-    def _budget_remaining() -> int | None:
-        if token_budget is None:
-            return None
-        used = tracker.global_summary().get("total_calls", 0) - calls_at_start
-        return token_budget - used
+def _execute(state: dict, runtime: Runtime[RunContext]) -> dict[str, Any]:
+    ctx = runtime.context
+    return executing_node(state, ctx.agents, stop_event=ctx.stop_event, budget_fn=ctx.budget_fn)
+
+
+def _review(state: dict, runtime: Runtime[RunContext]) -> dict[str, Any]:
+    return reviewing_node(state, runtime.context.agents)
+
+
+def _synthesize(state: dict, runtime: Runtime[RunContext]) -> dict[str, Any]:
+    return synthesizing_node(state, runtime.context.agents)
+
+
+def build_graph() -> StateGraph:
+    """Build the LangGraph state graph for the multi-agent workflow.
+
+    Agents and stop controls are not bound here; nodes read them from the
+    ``RunContext`` passed to ``invoke(..., context=...)``.
+    """
+    graph = StateGraph(WorkflowState, context_schema=RunContext)
 
-    # Add nodes (bind agents and stop controls via closures)
     graph.add_node("intake", intake_node)
-    graph.add_node("plan", lambda s: planning_node(s, agents))
-    graph.add_node(
-        "execute",
-        lambda s: executing_node(s, agents, stop_event=stop_event, budget_fn=_budget_remaining),
-    )
-    graph.add_node("review", lambda s: reviewing_node(s, agents))
-    graph.add_node("synthesize", lambda s: synthesizing_node(s, agents))
+    graph.add_node("plan", _plan)
+    graph.add_node("execute", _execute)
+    graph.add_node("review", _review)
+    graph.add_node("synthesize", _synthesize)
 
     # Edges
     graph.set_entry_point("intake")
@@ -410,6 +430,33 @@ def build_graph(
     return graph
 
 
+@functools.lru_cache(maxsize=1)
+def _compiled_graph() -> CompiledStateGraph:
+    """Compile the workflow graph once per process."""
+    return build_graph().compile()
+
+
+def build_context(
+    tracker: TokenTracker | None = None,
+    use_memory: bool = True,
+    project_id: str | None = None,
+    stop_event: threading.Event | None = None,
+    token_budget: int | None = None,
+    calls_at_start: int = 0,
+) -> RunContext:
+    """Create the agents and stop controls for a single run."""
+    tracker = tracker or TokenTracker()
+    agents = _create_agents(tracker, use_memory=use_memory, project_id=project_id)
+
+    def _budget_remaining() -> int | None:
+        if token_budget is None:
+            return None
+        used = tracker.global_summary().get("total_calls", 0) - calls_at_start
+        return token_budget - used
+
+    return RunContext(agents=agents, stop_event=stop_event, budget_fn=_budget_remaining)
+
+
 def _initial_state(task: str) -> dict[str, Any]:
     return {
         "task": task,
@@ -434,8 +481,8 @@ def run_task(
     token_budget: int | None = None,
     calls_at_start: int = 0,
 ) -> dict:
-    """Convenience function: build graph and run a task through it (sync)."""
-    graph = build_graph(
+    """Convenience function: run a task through the shared compiled graph (sync)."""
+    context = build_context(
         tracker=tracker,
         use_memory=use_memory,
         project_id=project_id,
@@ -443,8 +490,7 @@ def run_task(
         token_budget=token_budget,
         calls_at_start=calls_at_start,
     )
-    app = graph.compile()
-    return app.invoke(_initial_state(task))
+    return _compiled_graph().invoke(_initial_state(task), context=context)
 
 
 async def arun_task(
@@ -457,7 +503,7 @@ async def arun_task(
     calls_at_start: int = 0,
 ) -> dict:
     """Async convenience function — uses ainvoke for native async execution."""
-    graph = build_graph(
+    context = build_context(
         tracker=tracker,
         use_memory=use_memory,
         project_id=project_id,
@@ -465,5 +511,4 @@ async def arun_task(
         token_budget=token_budget,
         calls_at_start=calls_at_start,
     )
-    app = graph.compile()
-    return await app.ainvoke(_initial_state(task))
+    return await _compiled_graph().ainvoke(_initial_state(task), context=context)
@@ -2,6 +2,11 @@
 
 Each run gets a unique ID and a threading.Event that can be set to
 signal the executing node to stop after the current subtask batch.
+
+Every access below is a single dict operation (get / setitem / pop), which
+is atomic on its own — CPython's GIL, or the per-dict lock on free-threaded
+builds — so no module-level lock is needed. Keep it that way: anything that
+needs read-modify-write across several operations must reintroduce one.
 """
 
 from __future__ import annotations
@@ -11,22 +16,19 @@ import uuid
 
 # run_id -> stop_event
 _active_runs: dict[str, threading.Event] = {}
-_lock = threading.Lock()
 
 
 def start_run() -> tuple[str, threading.Event]:
     """Register a new run and return its ID and stop event."""
     run_id = uuid.uuid4().hex[:8]
     stop_event = threading.Event()
-    with _lock:
-        _active_runs[run_id] = stop_event
+    _active_runs[run_id] = stop_event
     return run_id, stop_event
 
 
 def stop_run(run_id: str) -> bool:
     """Signal the run to stop. Returns True if the run was found."""
-    with _lock:
-        event = _active_runs.get(run_id)
+    event = _active_runs.get(run_id)
     if event:
         event.set()
         return True
@@ -35,11 +37,9 @@ def stop_run(run_id: str) -> bool:
 
 def end_run(run_id: str) -> None:
     """Remove a completed or stopped run from the registry."""
-    with _lock:
-        _active_runs.pop(run_id, None)
+    _active_runs.pop(run_id, None)
 
 
 def get_stop_event(run_id: str) -> threading.Event | None:
     """Return the stop event for a run, or None if not found."""
-    with _lock:
-        return _active_runs.get(run_id)
+    return _active_runs.get(run_id)
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any, Literal
 
 from langgraph.graph import MessagesState
 
 
-@dataclass
+@dataclass(slots=True)
 class SubtaskResult:
     subtask_id: str
     agent_type: str
@@ -53,3 +55,16 @@ class WorkflowState(MessagesState):
     errors: list[str]
     # Iteration guard
     max_revisions: int
+
+
+@dataclass
+class RunContext:
+    """Per-run dependencies injected at invoke time (``context=``).
+
+    Keeping agents and stop controls out of the graph closure lets a single
+    compiled graph serve every task the process runs.
+    """
+
+    agents: dict[str, Any]
+    stop_event: threading.Event | None = None
+    budget_fn: Callable[[], int | None] | None = None
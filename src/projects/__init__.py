@@ -6,6 +6,7 @@ from src.projects.registry import (
     ProjectCommands,
     ProjectRegistry,
     Runbook,
+    project_to_dict,
 )
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     "Project",
     "ProjectRegistry",
     "Runbook",
+    "project_to_dict",
 ]
@@ -6,22 +6,57 @@ The dashboard, orchestrator, and health engine all consume this.
 
 from __future__ import annotations
 
+import functools
+import json
 import logging
+import os
+import sys
+import threading
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
-
-import yaml
+from types import MappingProxyType
+from typing import IO, Any
 
 logger = logging.getLogger(__name__)
 
 REGISTRY_PATH = Path(__file__).parent.parent.parent / "projects.yaml"
 
 
+# ── YAML (imported on first use) ────────────────────────────────────────────
+
+
+@functools.cache
+def _yaml() -> tuple[Any, Any, Any]:
+    """Import PyYAML lazily — a fresh JSON sidecar means it's never needed.
+
+    Prefers the LibYAML bindings, which are several times faster than the
+    pure-Python loader/dumper.
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml, loader, dumper
+
+
+def _yaml_load(data: bytes) -> Any:
+    yaml, loader, _ = _yaml()
+    return yaml.load(data, Loader=loader)
+
+
+def _yaml_dump(obj: Any, stream: IO[str] | None = None) -> str | None:
+    """Dump *obj* as block YAML; writes to *stream* directly when given."""
+    yaml, _, dumper = _yaml()
+    return yaml.dump(
+        obj, stream, Dumper=dumper, allow_unicode=True, sort_keys=False, default_flow_style=False
+    )
+
+
 # ── Data models ──────────────────────────────────────────────────────────────
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HealthCheckDef:
     """Definition of a single health check from the registry."""
 
@@ -37,7 +72,7 @@ class HealthCheckDef:
     command: str = ""  # for command checks
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnvConfig:
     """URLs for a single environment (local / staging / prod)."""
 
@@ -47,7 +82,7 @@ class EnvConfig:
     admin_url: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Runbook:
     """Quick-reference command or doc link."""
 
@@ -56,7 +91,7 @@ class Runbook:
     url: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class LocalConfig:
     """Local development paths per platform."""
 
@@ -65,7 +100,7 @@ class LocalConfig:
     path_mac: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectCommands:
     """Named commands for a project (dev/test/lint/build etc.)."""
 
@@ -76,7 +111,7 @@ class ProjectCommands:
     start: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     """A registered project with all its metadata."""
 
@@ -107,87 +142,222 @@ class ProjectRegistry:
     def __init__(self, path: Path | None = None) -> None:
         self._path = path or REGISTRY_PATH
         self._projects: list[Project] = []
+        self._by_id: dict[str, Project] = {}
+        self._by_group: dict[str, list[Project]] = {}
+        self._all_checks: list[tuple[Project, HealthCheckDef]] = []
+        self._dict_cache: list[dict[str, Any]] | None = None
         self._loaded = False
+        # (st_mtime_ns, st_size) of the file the current projects came from
+        self._cache_key: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+        # Bumped on every reindex so callers can key caches on it
+        self.version = 0
 
     def load(self, force: bool = False) -> list[Project]:
-        """Parse projects.yaml and return Project list."""
+        """Parse projects.yaml and return Project list.
+
+        A forced reload is skipped when the file's mtime and size are
+        unchanged since the last successful parse. Concurrent first loads
+        are serialised so only one thread parses; the rest reuse its result.
+        """
         if self._loaded and not force:
             return self._projects
 
-        self._projects = []
-        if not self._path.exists():
-            logger.warning("Registry file not found: %s", self._path)
-            self._loaded = True
-            return self._projects
+        with self._lock:
+            # Double-checked: another thread may have loaded while we waited
+            if self._loaded and not force:
+                return self._projects
 
-        try:
-            raw = yaml.safe_load(self._path.read_text(encoding="utf-8"))
-        except Exception as e:
-            logger.error("Failed to parse %s: %s", self._path, e)
+            try:
+                st = self._path.stat()
+            except FileNotFoundError:
+                logger.warning("Registry file not found: %s", self._path)
+                self._projects = []
+                self._cache_key = None
+                self._reindex()
+                self._loaded = True
+                return self._projects
+
+            key = (st.st_mtime_ns, st.st_size)
+            if key == self._cache_key:
+                self._loaded = True
+                return self._projects
+
+            self._projects = []
+            self._cache_key = None
+            try:
+                raw = self._read_raw(key)
+            except Exception as e:
+                logger.error("Failed to parse %s: %s", self._path, e)
+                self._reindex()
+                self._loaded = True
+                return self._projects
+
+            for entry in raw.get("projects", []) or []:
+                try:
+                    self._projects.append(_parse_project(entry))
+                except Exception as e:
+                    logger.warning("Skipping malformed project entry: %s", e)
+
+            self._cache_key = key
+            self._reindex()
             self._loaded = True
+            logger.info("Loaded %d projects from registry", len(self._projects))
             return self._projects
 
-        for entry in raw.get("projects", []) or []:
-            try:
-                self._projects.append(_parse_project(entry))
-            except Exception as e:
-                logger.warning("Skipping malformed project entry: %s", e)
+    def _reindex(self) -> None:
+        """Rebuild lookup views over ``self._projects``."""
+        by_id: dict[str, Project] = {}
+        groups: dict[str, list[Project]] = {}
+        checks: list[tuple[Project, HealthCheckDef]] = []
+        for p in self._projects:
+            by_id[p.id] = p
+            groups.setdefault(p.group, []).append(p)
+            checks.extend((p, c) for c in p.health_checks)
+        self._by_id = by_id
+        self._by_group = groups
+        self._all_checks = checks
+        self._dict_cache = None
+        self.version += 1
 
-        self._loaded = True
-        logger.info("Loaded %d projects from registry", len(self._projects))
-        return self._projects
+    @property
+    def _sidecar_path(self) -> Path:
+        return self._path.with_name(self._path.name + ".json")
+
+    def _read_raw(self, key: tuple[int, int]) -> Any:
+        """Return the parsed registry document, preferring the JSON sidecar.
+
+        The sidecar records the YAML's ``(st_mtime_ns, st_size)`` and is only
+        trusted when that still matches; otherwise the YAML is parsed and the
+        sidecar rewritten.  The YAML file stays the source of truth.
+        """
+        sidecar = self._sidecar_path
+        try:
+            cached = json.loads(sidecar.read_bytes())
+            if tuple(cached["key"]) == key:
+                return cached["raw"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        raw = _yaml_load(self._path.read_bytes())
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps({"key": key, "raw": raw}, separators=(",", ":")))
+            os.replace(tmp, sidecar)
+        except (OSError, TypeError, ValueError) as e:
+            # Non-JSON scalars (e.g. YAML dates) or a read-only directory
+            logger.debug("Could not write registry cache %s: %s", sidecar, e)
+            tmp.unlink(missing_ok=True)
+        return raw
 
     @property
     def projects(self) -> list[Project]:
         return self.load()
 
     def get(self, project_id: str) -> Project | None:
-        return next((p for p in self.projects if p.id == project_id), None)
+        self.load()
+        return self._by_id.get(project_id)
 
     def list_ids(self) -> list[str]:
         """Return all project IDs."""
         return [p.id for p in self.projects]
 
     def by_group(self) -> dict[str, list[Project]]:
-        groups: dict[str, list[Project]] = {}
-        for p in self.projects:
-            groups.setdefault(p.group, []).append(p)
-        return groups
+        """Projects keyed by group. The returned mapping is shared — do not mutate."""
+        self.load()
+        return self._by_group
 
     def all_health_checks(self) -> list[tuple[Project, HealthCheckDef]]:
-        """Return all (project, check) pairs for the health scheduler."""
-        result = []
-        for p in self.projects:
-            for c in p.health_checks:
-                result.append((p, c))
-        return result
+        """Return all (project, check) pairs for the health scheduler.
+
+        The returned list is shared — do not mutate.
+        """
+        self.load()
+        return self._all_checks
 
     def to_dict(self) -> list[dict[str, Any]]:
-        """Serialize all projects for the API."""
-        return [_project_to_dict(p) for p in self.projects]
+        """Serialize all projects for the API.
+
+        Serialization is cached until the next reload; callers get fresh
+        top-level dicts so they can attach per-request keys.
+        """
+        self.load()
+        if self._dict_cache is None:
+            self._dict_cache = [project_to_dict(p) for p in self._projects]
+        return [dict(d) for d in self._dict_cache]
 
     def reload(self) -> list[Project]:
         """Force reload from disk."""
         return self.load(force=True)
 
-    def add_project(self, data: dict[str, Any]) -> Project:
+    def add_project(self, data: dict[str, Any], compact: bool = False) -> Project:
         """Append a new project entry to projects.yaml and return the parsed Project.
 
         ``data`` must contain at least ``id`` and ``name``.
         Raises ``ValueError`` if the project id already exists.
+
+        The entry is appended as a YAML block at the end of the file, which
+        keeps comments and formatting intact. ``compact=True`` (or a file
+        layout where ``projects:`` is not the last top-level key) falls back
+        to a full parse-and-rewrite.
         """
         project_id = data.get("id", "").strip()
         if not project_id:
             raise ValueError("Project 'id' is required")
-        if self.get(project_id):
+        if self.get(project_id) is not None:
             raise ValueError(f"Project '{project_id}' already exists in registry")
 
         # Parse into a typed Project (validates structure)
         project = _parse_project(data)
 
-        # Read current YAML, append, write back
+        if compact or not self._append_entry(data):
+            self._rewrite_with(data)
+
+        # Update in-memory cache
+        self._projects.append(project)
+        self._reindex()
+        logger.info("Added project '%s' to registry", project_id)
+        return project
+
+    def _append_entry(self, data: dict[str, Any]) -> bool:
+        """Append *data* to the trailing ``projects:`` list without parsing the file.
+
+        Returns False when the layout isn't a trailing block list we can
+        safely extend.
+        """
+        try:
+            text = self._path.read_text(encoding="utf-8")
+        except OSError:
+            return False
+
+        lines = text.splitlines()
+        top_level = [
+            i for i, line in enumerate(lines)
+            if line and not line[0].isspace() and not line.startswith("#")
+        ]
+        if not top_level or lines[top_level[-1]].split("#", 1)[0].strip() != "projects:":
+            return False
+
+        # Match the indentation of existing items ("- id:" vs "  - id:")
+        indent = ""
+        for line in lines[top_level[-1] + 1:]:
+            stripped = line.lstrip(" ")
+            if stripped.startswith("- "):
+                indent = line[: len(line) - len(stripped)]
+                break
+
+        chunk = _yaml_dump([data]) or ""
+        block = "".join(indent + line if line.strip() else line for line in chunk.splitlines(True))
+        with self._path.open("a", encoding="utf-8") as f:
+            if text and not text.endswith("\n"):
+                f.write("\n")
+            f.write(block)
+        return True
+
+    def _rewrite_with(self, data: dict[str, Any]) -> None:
+        """Full read-modify-write of the registry file with *data* appended."""
         try:
-            raw = yaml.safe_load(self._path.read_text(encoding="utf-8")) or {}
+            raw = _yaml_load(self._path.read_bytes()) or {}
         except Exception as e:
             raise RuntimeError(f"Could not read registry file: {e}") from e
 
@@ -195,109 +365,107 @@ class ProjectRegistry:
         projects_list.append(data)
         raw["projects"] = projects_list
 
-        self._path.write_text(
-            yaml.dump(raw, allow_unicode=True, sort_keys=False, default_flow_style=False),
-            encoding="utf-8",
-        )
-
-        # Update in-memory cache
-        self._projects.append(project)
-        logger.info("Added project '%s' to registry", project_id)
-        return project
+        # Let the emitter write straight to the file instead of building a str
+        with self._path.open("w", encoding="utf-8") as f:
+            _yaml_dump(raw, f)
 
 
 # ── Parsers ──────────────────────────────────────────────────────────────────
 
 
+# Shared read-only default for absent sub-mappings
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _s(value: Any) -> Any:
+    """Intern low-cardinality string fields so equal values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+
+def _parse_env(name: Any, data: Mapping[str, Any]) -> EnvConfig:
+    get = data.get
+    return EnvConfig(
+        name=_s(name),
+        app_url=get("app_url", ""),
+        api_url=get("api_url", ""),
+        admin_url=get("admin_url", ""),
+    )
+
+
+def _parse_check(c: Mapping[str, Any]) -> HealthCheckDef:
+    get = c.get
+    return HealthCheckDef(
+        id=get("id", "unnamed"),
+        type=_s(get("type", "http")),
+        url=get("url", ""),
+        hostname=get("hostname", ""),
+        method=_s(get("method", "GET")),
+        expected_status=get("expected_status", 200),
+        timeout_ms=get("timeout_ms", 10_000),
+        interval_seconds=get("interval_seconds", 60),
+        warn_days_before=get("warn_days_before", 14),
+        command=get("command", ""),
+    )
+
+
+def _parse_runbook(r: Mapping[str, Any]) -> Runbook:
+    get = r.get
+    return Runbook(label=get("label", ""), command=get("command", ""), url=get("url", ""))
+
+
 def _parse_project(raw: dict[str, Any]) -> Project:
-    envs = []
-    raw_envs = raw.get("envs") or []
+    get = raw.get
+
+    raw_envs = get("envs") or ()
     if isinstance(raw_envs, dict):
         # Dict format: { local: {app_url: ...}, prod: {app_url: ...} }
-        for env_name, env_data in raw_envs.items():
-            envs.append(
-                EnvConfig(
-                    name=env_name,
-                    app_url=env_data.get("app_url", ""),
-                    api_url=env_data.get("api_url", ""),
-                    admin_url=env_data.get("admin_url", ""),
-                )
-            )
+        envs = [_parse_env(name, data) for name, data in raw_envs.items()]
     else:
         # List format: [{ name: local, app_url: ... }, ...]
-        for e in raw_envs:
-            envs.append(
-                EnvConfig(
-                    name=e.get("name", "unknown"),
-                    app_url=e.get("app_url", ""),
-                    api_url=e.get("api_url", ""),
-                    admin_url=e.get("admin_url", ""),
-                )
-            )
-
-    checks = []
-    for c in raw.get("health_checks") or []:
-        checks.append(
-            HealthCheckDef(
-                id=c.get("id", "unnamed"),
-                type=c.get("type", "http"),
-                url=c.get("url", ""),
-                hostname=c.get("hostname", ""),
-                method=c.get("method", "GET"),
-                expected_status=c.get("expected_status", 200),
-                timeout_ms=c.get("timeout_ms", 10_000),
-                interval_seconds=c.get("interval_seconds", 60),
-                warn_days_before=c.get("warn_days_before", 14),
-                command=c.get("command", ""),
-            )
-        )
-
-    runbooks = []
-    for r in raw.get("runbooks") or []:
-        runbooks.append(
-            Runbook(
-                label=r.get("label", ""),
-                command=r.get("command", ""),
-                url=r.get("url", ""),
-            )
-        )
+        envs = [_parse_env(e.get("name", "unknown"), e) for e in raw_envs]
+
+    checks = [_parse_check(c) for c in get("health_checks") or ()]
+    runbooks = [_parse_runbook(r) for r in get("runbooks") or ()]
 
     # Parse local config
-    raw_local = raw.get("local") or {}
+    local_get = (get("local") or _EMPTY).get
     local_cfg = LocalConfig(
-        path_windows=raw_local.get("path_windows", ""),
-        path_linux=raw_local.get("path_linux", ""),
-        path_mac=raw_local.get("path_mac", ""),
+        path_windows=local_get("path_windows", ""),
+        path_linux=local_get("path_linux", ""),
+        path_mac=local_get("path_mac", ""),
     )
 
     # Parse commands
-    raw_cmds = raw.get("commands") or {}
+    cmd_get = (get("commands") or _EMPTY).get
     commands = ProjectCommands(
-        dev=raw_cmds.get("dev", ""),
-        test=raw_cmds.get("test", ""),
-        lint=raw_cmds.get("lint", ""),
-        build=raw_cmds.get("build", ""),
-        start=raw_cmds.get("start", ""),
+        dev=cmd_get("dev", ""),
+        test=cmd_get("test", ""),
+        lint=cmd_get("lint", ""),
+        build=cmd_get("build", ""),
+        start=cmd_get("start", ""),
     )
 
+    project_id = raw["id"]
     return Project(
-        id=raw["id"],
-        name=raw.get("name", raw["id"]),
-        group=raw.get("group", "internal"),
-        priority=raw.get("priority", "medium"),
-        ownership=raw.get("ownership", "personal"),
-        repo_path=raw.get("repo_path", ""),
-        git_remote=raw.get("git_remote", ""),
+        id=project_id,
+        name=get("name", project_id),
+        group=_s(get("group", "internal")),
+        priority=_s(get("priority", "medium")),
+        ownership=_s(get("ownership", "personal")),
+        repo_path=get("repo_path", ""),
+        git_remote=get("git_remote", ""),
         local=local_cfg,
         commands=commands,
         envs=envs,
         health_checks=checks,
         runbooks=runbooks,
-        tags=raw.get("tags") or [],
+        tags=get("tags") or [],
     )
 
 
-def _project_to_dict(p: Project) -> dict[str, Any]:
+def project_to_dict(p: Project) -> dict[str, Any]:
+    """Serialise *p* to the plain dict shape served by the API."""
     return {
         "id": p.id,
         "name": p.name,
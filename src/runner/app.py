@@ -2,18 +2,17 @@
 
 from __future__ import annotations
 
+import hmac
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from pathlib import Path
 
-from fastapi import FastAPI, Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.projects.registry import ProjectRegistry
 from src.runner.config import runner_settings
-from src.runner.endpoints import router
+from src.runner.endpoints import invalidate_project_path_cache, router
 
 logger = logging.getLogger(__name__)
 
@@ -21,38 +20,81 @@ logger = logging.getLogger(__name__)
 # ── Auth middleware ───────────────────────────────────────────────────────────
 
 
-class TokenAuthMiddleware(BaseHTTPMiddleware):
-    """Reject requests missing or having an invalid X-Runner-Token header."""
+_UNAUTHORIZED_BODY = b'{"detail":"Invalid or missing X-Runner-Token"}'
+_UNAUTHORIZED_START: Message = {
+    "type": "http.response.start",
+    "status": 401,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_UNAUTHORIZED_BODY)).encode()),
+    ],
+}
+_UNAUTHORIZED_BODY_MSG: Message = {"type": "http.response.body", "body": _UNAUTHORIZED_BODY}
+_TOKEN_HEADER = b"x-runner-token"
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Skip auth if no token is configured (dev mode)
-        token = runner_settings.runner_token
-        if not token:
-            return await call_next(request)
 
-        provided = request.headers.get("X-Runner-Token", "")
-        if provided != token:
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "Invalid or missing X-Runner-Token"},
-            )
+class TokenAuthMiddleware:
+    """Reject requests missing or having an invalid X-Runner-Token header.
 
-        return await call_next(request)
+    Plain ASGI middleware: the header is read straight from the scope, which
+    avoids the per-request task group and streams of ``BaseHTTPMiddleware``.
+    The token is captured when the app is built; an empty token disables
+    auth (dev mode).
+    """
+
+    def __init__(self, app: ASGIApp, token: str = "") -> None:
+        self.app = app
+        self._token = token.encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._token:
+            await self.app(scope, receive, send)
+            return
+
+        provided = b""
+        for name, value in scope["headers"]:
+            if name == _TOKEN_HEADER:
+                provided = value
+                break
+
+        if not hmac.compare_digest(provided, self._token):
+            await send(_UNAUTHORIZED_START)
+            await send(_UNAUTHORIZED_BODY_MSG)
+            return
+
+        await self.app(scope, receive, send)
 
 
 # ── Lifespan ─────────────────────────────────────────────────────────────────
 
 
+# Registry loaded in the parent process by ``preload_registry()`` — called from
+# ``main()`` before serving, or from a pre-forking server's startup hook
+# (gunicorn's ``on_starting``) so workers inherit it copy-on-write instead of
+# each parsing projects.yaml. Importing this module does no file I/O; spawned
+# workers fall back to the registry's mtime + JSON-sidecar cache in ``lifespan``.
+_preloaded_registry: ProjectRegistry | None = None
+
+
+def preload_registry() -> ProjectRegistry | None:
+    """Load the project registry once, before any workers are forked."""
+    global _preloaded_registry
+    if _preloaded_registry is None:
+        registry = ProjectRegistry(path=runner_settings.projects_path)
+        try:
+            registry.load()
+        except Exception:
+            logger.warning("Failed to preload projects file: %s", runner_settings.projects_path)
+            return None
+        _preloaded_registry = registry
+    return _preloaded_registry
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    """Load project registry on startup."""
-    projects_path = Path(runner_settings.runner_projects_file)
-    if not projects_path.is_absolute():
-        projects_path = Path.cwd() / projects_path
-
-    registry = ProjectRegistry(path=projects_path)
+    """Load project registry on startup (reusing the preloaded one if present)."""
+    projects_path = runner_settings.projects_path
+    registry = _preloaded_registry or ProjectRegistry(path=projects_path)
     try:
         registry.load()
         logger.info(
@@ -64,6 +106,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         logger.warning("Failed to load projects file: %s", projects_path)
 
     app.state.registry = registry
+    invalidate_project_path_cache()
 
     yield
 
@@ -79,7 +122,7 @@ def create_runner_app() -> FastAPI:
         lifespan=lifespan,
     )
 
-    app.add_middleware(TokenAuthMiddleware)
+    app.add_middleware(TokenAuthMiddleware, token=runner_settings.runner_token)
     app.include_router(router)
 
     return app
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import functools
+from pathlib import Path
+
 from pydantic_settings import BaseSettings
 
 
@@ -25,11 +28,30 @@ class RunnerSettings(BaseSettings):
 
     # Safety
     runner_max_diff_bytes: int = 500_000  # 500 KB max diff payload
+    runner_max_output_bytes: int = 1_048_576  # 1 MiB kept per stdout/stderr
     runner_command_timeout: int = 1200  # 20 min default
     runner_claude_timeout: int = 7200  # 2 hr default
 
     # Logging
     log_level: str = "INFO"
 
+    @functools.cached_property
+    def projects_path(self) -> Path:
+        """``runner_projects_file`` resolved once against the startup CWD."""
+        path = Path(self.runner_projects_file)
+        if not path.is_absolute():
+            path = Path.cwd() / path
+        return path.resolve()
+
+
+@functools.lru_cache(maxsize=1)
+def get_runner_settings() -> RunnerSettings:
+    """Return the process-wide settings, read once from the env.
+
+    ``runner_settings`` and the endpoint limits are bound at import time, so
+    clearing this cache does not reload them; restart the runner instead.
+    """
+    return RunnerSettings()
+
 
-runner_settings = RunnerSettings()
+runner_settings = get_runner_settings()
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-import subprocess
+import shlex
 import sys
 import time
 from datetime import datetime, timezone
@@ -11,9 +13,10 @@ from pathlib import Path
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import Response
 from pydantic import BaseModel
 
+from src.json_utils import json_bytes
 from src.runner import __version__
 from src.runner.config import runner_settings
 from src.runner.safety import SafetyError, validate_branch_for_push, validate_command
@@ -22,6 +25,21 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# The runner's platform and settings are fixed for the life of the process
+_IS_WIN = sys.platform == "win32"
+# LocalConfig attribute holding this platform's checkout path
+_PLATFORM_PATH_ATTR = {
+    "win32": "path_windows",
+    "linux": "path_linux",
+    "darwin": "path_mac",
+}.get(sys.platform)
+_SHELL_PREFIX = ["cmd", "/c"] if _IS_WIN else ["sh", "-c"]
+_CMD_TIMEOUT = runner_settings.runner_command_timeout
+_CLAUDE_TIMEOUT = runner_settings.runner_claude_timeout
+_CLAUDE_CLI = runner_settings.claude_cli_path
+_MAX_DIFF_BYTES = runner_settings.runner_max_diff_bytes
+_MAX_OUTPUT_BYTES = runner_settings.runner_max_output_bytes
+
 
 # ── Pydantic models ──────────────────────────────────────────────────────────
 
@@ -70,25 +88,22 @@ class GitStatusResponse(BaseModel):
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 
-def _resolve_project_path(project_id: str, request: Request) -> Path:
-    """Look up a project's local path from the registry."""
-    registry = request.app.state.registry
+@functools.lru_cache(maxsize=256)
+def _local_project_path(registry: Any, version: int, project_id: str) -> Path:
+    """Registry lookup + per-OS path choice for a project.
+
+    Keyed on the registry instance and its ``version`` so a reload of
+    projects.yaml naturally misses; errors are raised, never cached.
+    """
     project = registry.get(project_id)
     if not project:
         raise HTTPException(status_code=404, detail=f"Unknown project: {project_id}")
 
     # Determine the local path
-    path_str = ""
-    if sys.platform == "win32" and project.local.path_windows:
-        path_str = project.local.path_windows
-    elif sys.platform == "linux" and project.local.path_linux:
-        path_str = project.local.path_linux
-    elif sys.platform == "darwin" and project.local.path_mac:
-        path_str = project.local.path_mac
-
-    # Fallback to repo_path
-    if not path_str:
-        path_str = project.repo_path
+    # Platform path, falling back to repo_path
+    path_str = (
+        getattr(project.local, _PLATFORM_PATH_ATTR, None) if _PLATFORM_PATH_ATTR else None
+    ) or project.repo_path
 
     if not path_str:
         raise HTTPException(
@@ -96,72 +111,192 @@ def _resolve_project_path(project_id: str, request: Request) -> Path:
             detail=f"No local path configured for project '{project_id}' on {sys.platform}",
         )
 
-    path = Path(path_str)
-    if not path.exists():
-        raise HTTPException(
-            status_code=400,
-            detail=f"Project path does not exist: {path}",
-        )
+    return Path(path_str)
+
+
+# Project path -> monotonic time it was last seen to exist
+_path_exists_at: dict[Path, float] = {}
+_PATH_TTL = 30.0
+
+
+def invalidate_project_path_cache() -> None:
+    """Forget cached project path lookups (call after reloading the registry)."""
+    _local_project_path.cache_clear()
+    _path_exists_at.clear()
+
+
+def _resolve_project_path(project_id: str, request: Request) -> Path:
+    """Look up a project's local path from the registry.
+
+    A path that exists is not stat'ed again for ``_PATH_TTL`` seconds;
+    missing paths are re-checked on every call.
+    """
+    registry = request.app.state.registry
+    path = _local_project_path(registry, registry.version, project_id)
+    now = time.monotonic()
+    checked = _path_exists_at.get(path)
+    if checked is None or now - checked >= _PATH_TTL:
+        if not path.exists():
+            _path_exists_at.pop(path, None)
+            raise HTTPException(
+                status_code=400,
+                detail=f"Project path does not exist: {path}",
+            )
+        _path_exists_at[path] = now
     return path
 
 
-def _run_subprocess(
+async def _read_capped(stream: asyncio.StreamReader, cap: int) -> bytes:
+    """Read a stream to EOF, keeping only the first ``cap`` bytes."""
+    chunks: list[bytes] = []
+    kept = 0
+    dropped = 0
+    while chunk := await stream.read(65536):
+        if kept < cap:
+            piece = chunk[: cap - kept]
+            chunks.append(piece)
+            kept += len(piece)
+            dropped += len(chunk) - len(piece)
+        else:
+            dropped += len(chunk)
+    if dropped:
+        chunks.append(f"\n... [truncated {dropped} bytes]\n".encode())
+    return b"".join(chunks)
+
+
+async def _run_subprocess_async(
     cmd: list[str],
     cwd: Path,
     timeout_sec: int,
     env: dict[str, str] | None = None,
 ) -> CmdResponse:
-    """Run a subprocess safely (no shell) and return structured result."""
+    """Run a subprocess safely (no shell) on the event loop and return structured result.
+
+    Stdout and stderr are each kept to ``_MAX_OUTPUT_BYTES``; the rest is
+    drained and replaced by a truncation marker.
+    """
     t0 = time.perf_counter()
+
+    def _elapsed_ms() -> int:
+        return int((time.perf_counter() - t0) * 1000)
+
     try:
-        result = subprocess.run(
-            cmd,
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
             cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            timeout=timeout_sec,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             env=env,
-            encoding="utf-8",
-            errors="replace",
         )
-        duration_ms = int((time.perf_counter() - t0) * 1000)
+    except FileNotFoundError as e:
         return CmdResponse(
-            exitCode=result.returncode,
-            stdout=result.stdout,
-            stderr=result.stderr,
-            durationMs=duration_ms,
+            exitCode=-1, stdout="", stderr=f"Command not found: {e}", durationMs=_elapsed_ms()
         )
-    except subprocess.TimeoutExpired:
-        duration_ms = int((time.perf_counter() - t0) * 1000)
+    except Exception as e:
         return CmdResponse(
             exitCode=-1,
             stdout="",
-            stderr=f"Command timed out after {timeout_sec}s",
-            durationMs=duration_ms,
+            stderr=f"Error: {type(e).__name__}: {e}",
+            durationMs=_elapsed_ms(),
         )
-    except FileNotFoundError as e:
-        duration_ms = int((time.perf_counter() - t0) * 1000)
-        return CmdResponse(
-            exitCode=-1,
-            stdout="",
-            stderr=f"Command not found: {e}",
-            durationMs=duration_ms,
+
+    assert proc.stdout is not None and proc.stderr is not None
+    try:
+        stdout, stderr, _ = await asyncio.wait_for(
+            asyncio.gather(
+                _read_capped(proc.stdout, _MAX_OUTPUT_BYTES),
+                _read_capped(proc.stderr, _MAX_OUTPUT_BYTES),
+                proc.wait(),
+            ),
+            timeout=timeout_sec,
         )
-    except Exception as e:
-        duration_ms = int((time.perf_counter() - t0) * 1000)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
         return CmdResponse(
             exitCode=-1,
             stdout="",
-            stderr=f"Error: {type(e).__name__}: {e}",
-            durationMs=duration_ms,
+            stderr=f"Command timed out after {timeout_sec}s",
+            durationMs=_elapsed_ms(),
+        )
+
+    return CmdResponse(
+        exitCode=proc.returncode if proc.returncode is not None else -1,
+        stdout=stdout.decode("utf-8", errors="replace"),
+        stderr=stderr.decode("utf-8", errors="replace"),
+        durationMs=_elapsed_ms(),
+    )
+
+
+class _OutputTooLargeError(Exception):
+    """Raised by ``_read_output_capped`` once stdout passes its byte limit."""
+
+
+async def _read_output_capped(
+    cmd: list[str],
+    cwd: Path,
+    timeout_sec: int,
+    max_bytes: int,
+) -> tuple[int, bytes, str]:
+    """Run a subprocess and return (exit code, raw stdout, stderr).
+
+    Stdout is read in chunks and counted as it arrives; the process is killed
+    and ``_OutputTooLargeError`` raised as soon as it exceeds ``max_bytes``, so an
+    oversized output is never fully buffered. Raises ``asyncio.TimeoutError``
+    after ``timeout_sec``.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(cwd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    assert proc.stdout is not None and proc.stderr is not None
+    stdout_pipe = proc.stdout
+
+    async def _collect() -> bytes:
+        chunks: list[bytes] = []
+        total = 0
+        while chunk := await stdout_pipe.read(65536):
+            total += len(chunk)
+            if total > max_bytes:
+                raise _OutputTooLargeError(total)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            asyncio.gather(_collect(), proc.stderr.read()), timeout=timeout_sec
         )
+        await proc.wait()
+    except BaseException:
+        # Over the limit, timed out, or cancelled by the caller
+        proc.kill()
+        await proc.wait()
+        raise
+
+    exit_code = proc.returncode if proc.returncode is not None else -1
+    return exit_code, stdout, stderr.decode("utf-8", errors="replace")
+
+
+async def _run_subprocess_bytes(cmd: list[str], cwd: Path, timeout_sec: int) -> tuple[int, bytes]:
+    """Run a subprocess and return (exit code, raw stdout) without decoding.
+
+    For machine-readable git output that is parsed, not shown. Spawn
+    failures and timeouts report exit code -1.
+    """
+    try:
+        exit_code, stdout, _ = await _read_output_capped(cmd, cwd, timeout_sec, sys.maxsize)
+    except (OSError, asyncio.TimeoutError):
+        return -1, b""
+    return exit_code, stdout
 
 
 # ── Endpoints ────────────────────────────────────────────────────────────────
 
 
 @router.get("/health")
-def health_check() -> dict[str, Any]:
+async def health_check() -> dict[str, Any]:
     """Runner health endpoint."""
     return {
         "ok": True,
@@ -173,11 +308,13 @@ def health_check() -> dict[str, Any]:
 
 
 @router.get("/usage")
-def local_usage() -> dict[str, Any]:
+def local_usage() -> Response:
     """Serve local Claude Code usage data (~/.claude) over the tunnel.
 
     The VPS cannot access ~/.claude directly — this endpoint exposes it
     through the reverse SSH tunnel so the dashboard shows real usage data.
+    The report is a large plain dict, so it is encoded once (orjson when
+    installed) rather than walked by ``jsonable_encoder``.
     """
     try:
         from src.token_tracker.session_parser import (
@@ -196,14 +333,15 @@ def local_usage() -> dict[str, Any]:
         )
         data = report_to_dict(report)
         data["rate_limits"] = rate_limits
-        return {"ok": True, "data": data}
+        payload: dict[str, Any] = {"ok": True, "data": data}
     except Exception as e:
         logger.warning("Usage data unavailable: %s", e)
-        return {"ok": False, "error": str(e), "data": {}}
+        payload = {"ok": False, "error": str(e), "data": {}}
+    return Response(json_bytes(payload), media_type="application/json")
 
 
 @router.post("/cmd", response_model=CmdResponse)
-def run_command(req: CmdRequest, request: Request) -> CmdResponse:
+async def run_command(req: CmdRequest, request: Request) -> CmdResponse:
     """Execute an arbitrary command in a project directory.
 
     Short named aliases (dev/test/lint/build/start) are resolved to the
@@ -234,62 +372,87 @@ def run_command(req: CmdRequest, request: Request) -> CmdResponse:
         raise HTTPException(status_code=400, detail=str(e))
 
     project_path = _resolve_project_path(req.projectId, request)
-    timeout = min(req.timeoutSec, runner_settings.runner_command_timeout)
-
-    if sys.platform == "win32":
-        cmd = ["cmd", "/c", command]
-    else:
-        cmd = ["sh", "-c", command]
+    timeout = min(req.timeoutSec, _CMD_TIMEOUT)
+    cmd = [*_SHELL_PREFIX, command]
 
     logger.info("CMD [%s] in %s: %s", req.projectId, project_path, command)
-    return _run_subprocess(cmd, project_path, timeout)
+    return await _run_subprocess_async(cmd, project_path, timeout)
+
+
+# Porcelain v2 entry type -> index of the path field after splitting on spaces
+_PORCELAIN_PATH_FIELD = {b"1": 8, b"2": 9, b"u": 10}
+
+
+def _parse_porcelain_v2(output: bytes) -> tuple[str, str, list[str]]:
+    """Parse ``git status --branch --porcelain=v2`` into (branch, oid, changed files).
+
+    Works on the raw bytes in one pass, dispatching on each line's first
+    byte; only the branch, oid and paths are decoded.
+    """
+    branch = "unknown"
+    oid = ""
+    changed_files: list[str] = []
+    for line in output.split(b"\n"):
+        kind = line[:1]
+        field = _PORCELAIN_PATH_FIELD.get(kind)
+        if field is not None:
+            path = line.split(b" ", field)[field]
+            if kind == b"2":
+                # Rename/copy: "<path>\t<origPath>"
+                path = path.partition(b"\t")[0]
+            changed_files.append(path.decode("utf-8", "replace"))
+        elif kind == b"?":
+            changed_files.append(line[2:].decode("utf-8", "replace"))
+        elif line.startswith(b"# branch.head "):
+            head = line[14:].decode("utf-8", "replace")
+            branch = "HEAD" if head == "(detached)" else head
+        elif line.startswith(b"# branch.oid "):
+            oid = line[13:].decode("ascii", "replace")
+            if oid == "(initial)":
+                oid = ""
+    return branch, oid, changed_files
 
 
 @router.get("/git/status", response_model=GitStatusResponse)
-def git_status(
+async def git_status(
     projectId: str = Query(...),  # noqa: N803
+    includeCommit: bool = Query(True),  # noqa: N803
     request: Request = None,  # type: ignore[assignment]
 ) -> GitStatusResponse:
-    """Get git status for a project."""
+    """Get git status for a project.
+
+    Branch, HEAD sha and changed files come from a single porcelain v2
+    call. ``includeCommit=false`` skips the extra ``git log`` for the last
+    commit's message/author/date.
+    """
     project_path = _resolve_project_path(projectId, request)
 
-    # Get current branch
-    branch_result = _run_subprocess(
-        ["git", "rev-parse", "--abbrev-ref", "HEAD"], project_path, 10
-    )
-    branch = branch_result.stdout.strip() if branch_result.exitCode == 0 else "unknown"
-
-    # Get last commit info
-    log_result = _run_subprocess(
-        [
-            "git", "log", "-1",
-            "--format=%H%n%s%n%an%n%aI",
-        ],
-        project_path,
-        10,
-    )
-    last_commit: dict[str, str] = {"sha": "", "message": "", "author": "", "date": ""}
-    if log_result.exitCode == 0:
-        lines = log_result.stdout.strip().split("\n")
+    status_cmd = ["git", "status", "--branch", "--porcelain=v2"]
+    log_cmd = ["git", "log", "-1", "--format=%H%n%s%n%an%n%aI"]
+    if includeCommit:
+        (status_code, status_out), (log_code, log_out) = await asyncio.gather(
+            _run_subprocess_bytes(status_cmd, project_path, 10),
+            _run_subprocess_bytes(log_cmd, project_path, 10),
+        )
+    else:
+        status_code, status_out = await _run_subprocess_bytes(status_cmd, project_path, 10)
+        log_code, log_out = -1, b""
+
+    branch, oid, changed_files = "unknown", "", []
+    if status_code == 0:
+        branch, oid, changed_files = _parse_porcelain_v2(status_out)
+
+    last_commit: dict[str, str] = {"sha": oid[:12], "message": "", "author": "", "date": ""}
+    if log_code == 0:
+        lines = log_out.split(b"\n", 4)
         if len(lines) >= 4:
             last_commit = {
-                "sha": lines[0][:12],
-                "message": lines[1],
-                "author": lines[2],
-                "date": lines[3],
+                "sha": lines[0][:12].decode("ascii", "replace"),
+                "message": lines[1].decode("utf-8", "replace"),
+                "author": lines[2].decode("utf-8", "replace"),
+                "date": lines[3].decode("ascii", "replace"),
             }
 
-    # Get changed files
-    status_result = _run_subprocess(
-        ["git", "status", "--porcelain"], project_path, 10
-    )
-    changed_files: list[str] = []
-    if status_result.exitCode == 0 and status_result.stdout.strip():
-        for line in status_result.stdout.strip().split("\n"):
-            if line.strip():
-                # Format is "XY filename" — extract just the filename
-                changed_files.append(line[3:].strip())
-
     return GitStatusResponse(
         branch=branch,
         lastCommit=last_commit,
@@ -299,45 +462,77 @@ def git_status(
 
 
 @router.get("/git/diff")
-def git_diff(
+async def git_diff(
     projectId: str = Query(...),  # noqa: N803
     request: Request = None,  # type: ignore[assignment]
-) -> PlainTextResponse:
-    """Get unified diff for a project. Returns 413 if diff is too large."""
+) -> Response:
+    """Get unified diff for a project. Returns 413 if diff is too large.
+
+    The unstaged diff runs alongside ``git diff --cached --quiet``, a cheap
+    probe that exits 1 only when something is staged; the full staged diff
+    is spawned only then (most requests have nothing staged). Diffs are read
+    as bytes with a running size count and passed through without a
+    decode/encode round-trip; git is killed as soon as the limit is passed.
+    """
     project_path = _resolve_project_path(projectId, request)
+    max_bytes = _MAX_DIFF_BYTES
 
-    diff_result = _run_subprocess(["git", "diff"], project_path, 30)
-
-    if diff_result.exitCode != 0:
-        raise HTTPException(status_code=500, detail=f"git diff failed: {diff_result.stderr}")
-
-    diff_text = diff_result.stdout
-
-    # Also include staged changes
-    staged_result = _run_subprocess(["git", "diff", "--cached"], project_path, 30)
-    if staged_result.exitCode == 0 and staged_result.stdout:
-        diff_text += "\n" + staged_result.stdout
-
-    # Size limit
-    max_bytes = runner_settings.runner_max_diff_bytes
-    if len(diff_text.encode("utf-8", errors="replace")) > max_bytes:
-        raise HTTPException(
-            status_code=413,
-            detail=f"Diff too large ({len(diff_text)} chars). "
-            f"Max allowed: {max_bytes} bytes. "
-            "Use 'git diff -- <path>' for specific files.",
+    unstaged = asyncio.ensure_future(
+        _read_output_capped(["git", "diff"], project_path, 30, max_bytes)
+    )
+    staged: asyncio.Future[tuple[int, bytes, str]] | None = None
+    try:
+        probe_code, _ = await _run_subprocess_bytes(
+            ["git", "diff", "--cached", "--quiet"], project_path, 10,
         )
-
-    return PlainTextResponse(diff_text, media_type="text/plain")
+        if probe_code != 0:  # 1 = staged changes; anything else, look anyway
+            staged = asyncio.ensure_future(
+                _read_output_capped(["git", "diff", "--cached"], project_path, 30, max_bytes)
+            )
+        diff_code, diff_out, diff_err = await unstaged
+        staged_code, staged_out = 0, b""
+        if staged is not None:
+            staged_code, staged_out, _ = await staged
+    except _OutputTooLargeError:
+        raise _diff_too_large(max_bytes)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=500, detail="git diff timed out after 30s")
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"git diff failed: {e}")
+    finally:
+        # No-ops once finished; stop the other git if one of them failed
+        unstaged.cancel()
+        if staged is not None:
+            staged.cancel()
+
+    if diff_code != 0:
+        raise HTTPException(status_code=500, detail=f"git diff failed: {diff_err}")
+
+    body = diff_out
+    if staged_code == 0 and staged_out:
+        body += b"\n" + staged_out
+
+    if len(body) > max_bytes:
+        raise _diff_too_large(max_bytes)
+
+    return Response(body, media_type="text/plain; charset=utf-8")
+
+
+def _diff_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Diff too large. Max allowed: {max_bytes} bytes. "
+        "Use 'git diff -- <path>' for specific files.",
+    )
 
 
 @router.post("/claude/run", response_model=CmdResponse)
-def run_claude(req: ClaudeRunRequest, request: Request) -> CmdResponse:
+async def run_claude(req: ClaudeRunRequest, request: Request) -> CmdResponse:
     """Execute Claude CLI in a project directory."""
     project_path = _resolve_project_path(req.projectId, request)
-    timeout = min(req.timeoutSec, runner_settings.runner_claude_timeout)
+    timeout = min(req.timeoutSec, _CLAUDE_TIMEOUT)
 
-    cmd = [runner_settings.claude_cli_path, "-p", req.prompt]
+    cmd = [_CLAUDE_CLI, "-p", req.prompt]
 
     if req.model:
         cmd.extend(["--model", req.model])
@@ -349,11 +544,11 @@ def run_claude(req: ClaudeRunRequest, request: Request) -> CmdResponse:
         "CLAUDE [%s] model=%s prompt_len=%d skip_perms=%s",
         req.projectId, req.model, len(req.prompt), req.dangerouslySkipPermissions,
     )
-    return _run_subprocess(cmd, project_path, timeout)
+    return await _run_subprocess_async(cmd, project_path, timeout)
 
 
 @router.post("/git/push-pr", response_model=PushPrResponse)
-def push_pr(req: PushPrRequest, request: Request) -> PushPrResponse:
+async def push_pr(req: PushPrRequest, request: Request) -> PushPrResponse:
     """Create a branch, commit staged changes, push, and open a PR."""
     # Safety: never push to main/master
     try:
@@ -363,41 +558,109 @@ def push_pr(req: PushPrRequest, request: Request) -> PushPrResponse:
 
     project_path = _resolve_project_path(req.projectId, request)
 
-    # 1. Check if branch exists; create if not
-    check_branch = _run_subprocess(
+    # 1-5. Branch, stage, commit, push
+    if _IS_WIN:
+        await _commit_and_push_steps(req, project_path)
+    else:
+        result = await _run_subprocess_async(
+            ["sh", "-c", _commit_and_push_script(req)], project_path, 120
+        )
+        if result.exitCode == 2:
+            raise HTTPException(
+                status_code=400,
+                detail="Nothing to commit — working tree is clean.",
+            )
+        if result.exitCode != 0:
+            step = _PUSH_SCRIPT_ERRORS.get(result.exitCode, "Commit/push failed")
+            raise HTTPException(status_code=500, detail=f"{step}: {result.stderr}")
+
+    # 6. Create PR via GitHub CLI
+    pr_cmd = [
+        "gh", "pr", "create",
+        "--base", req.base,
+        "--head", req.branch,
+        "--title", req.title,
+    ]
+    if req.body:
+        pr_cmd.extend(["--body", req.body])
+    else:
+        pr_cmd.extend(["--body", f"Automated PR created by CLA runner.\n\nBranch: {req.branch}"])
+
+    pr_result = await _run_subprocess_async(pr_cmd, project_path, 30)
+
+    if pr_result.exitCode != 0:
+        # PR creation failed but push succeeded — return partial info
+        raise HTTPException(
+            status_code=500,
+            detail=(
+                f"Branch pushed successfully but PR creation failed. "
+                f"Ensure 'gh' CLI is installed and authenticated.\n"
+                f"Error: {pr_result.stderr}\n"
+                f"You can create the PR manually."
+            ),
+        )
+
+    # gh pr create outputs the PR URL as the last line
+    pr_url = pr_result.stdout.strip().split("\n")[-1]
+
+    return PushPrResponse(prUrl=pr_url)
+
+
+# Exit codes of the commit/push script; 2 means nothing to commit.
+_PUSH_SCRIPT_ERRORS = {
+    3: "Failed to checkout branch",
+    4: "Failed to stage changes",
+    5: "Commit failed",
+    6: "Push failed",
+}
+
+
+def _commit_and_push_script(req: PushPrRequest) -> str:
+    """Shell script doing checkout, add, commit and push in one process.
+
+    Replaces five separate git spawns; every user value goes through
+    ``shlex.quote``.
+    """
+    branch = shlex.quote(req.branch)
+    return (
+        f"if git rev-parse --verify --quiet {branch} >/dev/null; "
+        f"then git checkout {branch} || exit 3; "
+        f"else git checkout -b {branch} || exit 3; fi\n"
+        "git add -A || exit 4\n"
+        "git diff --cached --quiet && exit 2\n"
+        f"git commit -m {shlex.quote(req.title)} || exit 5\n"
+        f"git push -u {shlex.quote(req.remote)} {branch} || exit 6\n"
+    )
+
+
+async def _commit_and_push_steps(req: PushPrRequest, project_path: Path) -> None:
+    """Step-by-step checkout, add, commit and push (Windows, no ``sh``)."""
+    # Check if branch exists; create if not
+    check_branch = await _run_subprocess_async(
         ["git", "rev-parse", "--verify", req.branch], project_path, 10
     )
     if check_branch.exitCode != 0:
-        # Create and checkout new branch
-        create_result = _run_subprocess(
+        co_result = await _run_subprocess_async(
             ["git", "checkout", "-b", req.branch], project_path, 10
         )
-        if create_result.exitCode != 0:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to create branch: {create_result.stderr}",
-            )
     else:
-        # Checkout existing branch
-        co_result = _run_subprocess(
+        co_result = await _run_subprocess_async(
             ["git", "checkout", req.branch], project_path, 10
         )
-        if co_result.exitCode != 0:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to checkout branch: {co_result.stderr}",
-            )
+    if co_result.exitCode != 0:
+        raise HTTPException(
+            status_code=500,
+            detail=f"{_PUSH_SCRIPT_ERRORS[3]}: {co_result.stderr}",
+        )
 
-    # 2. Stage all changes
-    stage_result = _run_subprocess(["git", "add", "-A"], project_path, 10)
+    stage_result = await _run_subprocess_async(["git", "add", "-A"], project_path, 10)
     if stage_result.exitCode != 0:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to stage changes: {stage_result.stderr}",
+            detail=f"{_PUSH_SCRIPT_ERRORS[4]}: {stage_result.stderr}",
         )
 
-    # 3. Check if there's anything to commit
-    status_result = _run_subprocess(
+    status_result = await _run_subprocess_async(
         ["git", "status", "--porcelain"], project_path, 10
     )
     if not status_result.stdout.strip():
@@ -406,53 +669,20 @@ def push_pr(req: PushPrRequest, request: Request) -> PushPrResponse:
             detail="Nothing to commit — working tree is clean.",
         )
 
-    # 4. Commit
-    commit_result = _run_subprocess(
+    commit_result = await _run_subprocess_async(
         ["git", "commit", "-m", req.title], project_path, 30
     )
     if commit_result.exitCode != 0:
         raise HTTPException(
             status_code=500,
-            detail=f"Commit failed: {commit_result.stderr}",
+            detail=f"{_PUSH_SCRIPT_ERRORS[5]}: {commit_result.stderr}",
         )
 
-    # 5. Push branch
-    push_result = _run_subprocess(
+    push_result = await _run_subprocess_async(
         ["git", "push", "-u", req.remote, req.branch], project_path, 60
     )
     if push_result.exitCode != 0:
         raise HTTPException(
             status_code=500,
-            detail=f"Push failed: {push_result.stderr}",
+            detail=f"{_PUSH_SCRIPT_ERRORS[6]}: {push_result.stderr}",
         )
-
-    # 6. Create PR via GitHub CLI
-    pr_cmd = [
-        "gh", "pr", "create",
-        "--base", req.base,
-        "--head", req.branch,
-        "--title", req.title,
-    ]
-    if req.body:
-        pr_cmd.extend(["--body", req.body])
-    else:
-        pr_cmd.extend(["--body", f"Automated PR created by CLA runner.\n\nBranch: {req.branch}"])
-
-    pr_result = _run_subprocess(pr_cmd, project_path, 30)
-
-    if pr_result.exitCode != 0:
-        # PR creation failed but push succeeded — return partial info
-        raise HTTPException(
-            status_code=500,
-            detail=(
-                f"Branch pushed successfully but PR creation failed. "
-                f"Ensure 'gh' CLI is installed and authenticated.\n"
-                f"Error: {pr_result.stderr}\n"
-                f"You can create the PR manually."
-            ),
-        )
-
-    # gh pr create outputs the PR URL as the last line
-    pr_url = pr_result.stdout.strip().split("\n")[-1]
-
-    return PushPrResponse(prUrl=pr_url)
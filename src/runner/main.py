@@ -43,11 +43,21 @@ def main() -> None:
             "Set RUNNER_TOKEN in .env for production use.[/yellow]\n"
         )
 
+    from src.runner.app import preload_registry, runner_app
+
+    preload_registry()
+
+    # uvicorn[standard] ships uvloop (not on Windows) and httptools; name them
+    # explicitly rather than relying on "auto". /cmd and /claude/run log what
+    # they run, so uvicorn's per-request access log is off.
     uvicorn.run(
-        "src.runner.app:runner_app",
+        runner_app,
         host=runner_settings.runner_host,
         port=runner_settings.runner_port,
         log_level=runner_settings.log_level.lower(),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        access_log=False,
     )
 
 
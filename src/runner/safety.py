@@ -6,25 +6,38 @@ import re
 
 # ── Blocked patterns ─────────────────────────────────────────────────────────
 
-# Git push to protected branches
-_PROTECTED_BRANCH_PUSH = re.compile(
-    r"git\s+push\s+\S+\s+(main|master)\b", re.IGNORECASE
+# One alternation so each command is scanned once; the named group that
+# matched (``m.lastgroup``) selects the error message.
+_BLOCKLIST = re.compile(
+    # Git push to protected branches
+    r"(?P<push>git\s+push\s+\S+\s+(?:main|master)\b)"
+    # Git merge into protected branches
+    r"|(?P<merge>git\s+merge\s+.*(?:main|master))"
+    # Destructive filesystem commands
+    r"|(?P<fs>rm\s+-rf\s+[/\\]|rmdir\s+/s|del\s+/s|format\s+[a-z]:)"
+    # Deploy commands (should never be automated)
+    r"|(?P<deploy>vercel\s+--prod|fly\s+deploy|docker\s+push|kubectl\s+apply)",
+    re.IGNORECASE,
 )
 
-# Git merge into protected branches
-_PROTECTED_MERGE = re.compile(
-    r"git\s+merge\s+.*(main|master)", re.IGNORECASE
-)
-
-# Destructive filesystem commands
-_DESTRUCTIVE_FS = re.compile(
-    r"(rm\s+-rf\s+[/\\]|rmdir\s+/s|del\s+/s|format\s+[a-z]:)", re.IGNORECASE
-)
-
-# Deploy commands (should never be automated)
-_DEPLOY = re.compile(
-    r"(vercel\s+--prod|fly\s+deploy|docker\s+push|kubectl\s+apply)", re.IGNORECASE
-)
+_BLOCKED_MESSAGES: dict[str, str] = {
+    "push": (
+        "Blocked: pushing directly to main/master is not allowed. "
+        "Use a feature branch and create a PR instead."
+    ),
+    "merge": (
+        "Blocked: merging to main/master is not allowed via runner. "
+        "Use GitHub PR review workflow."
+    ),
+    "fs": (
+        "Blocked: destructive filesystem command detected. "
+        "This operation is not permitted via remote runner."
+    ),
+    "deploy": (
+        "Blocked: deployment commands are not allowed via runner. "
+        "Deploy manually or through CI/CD."
+    ),
+}
 
 
 class SafetyError(Exception):
@@ -33,26 +46,10 @@ class SafetyError(Exception):
 
 def validate_command(command: str) -> None:
     """Check a command against the blocklist. Raises SafetyError if blocked."""
-    if _PROTECTED_BRANCH_PUSH.search(command):
-        raise SafetyError(
-            "Blocked: pushing directly to main/master is not allowed. "
-            "Use a feature branch and create a PR instead."
-        )
-    if _PROTECTED_MERGE.search(command):
-        raise SafetyError(
-            "Blocked: merging to main/master is not allowed via runner. "
-            "Use GitHub PR review workflow."
-        )
-    if _DESTRUCTIVE_FS.search(command):
-        raise SafetyError(
-            "Blocked: destructive filesystem command detected. "
-            "This operation is not permitted via remote runner."
-        )
-    if _DEPLOY.search(command):
-        raise SafetyError(
-            "Blocked: deployment commands are not allowed via runner. "
-            "Deploy manually or through CI/CD."
-        )
+    m = _BLOCKLIST.search(command)
+    if m:
+        # Every top-level alternative is a named group, so lastgroup is set.
+        raise SafetyError(_BLOCKED_MESSAGES[m.lastgroup])  # type: ignore[index]
 
 
 def validate_branch_for_push(branch: str) -> None:
@@ -5,7 +5,9 @@ All methods return typed responses or raise RunnerOfflineError / RunnerError.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import weakref
 from typing import Any
 
 import httpx
@@ -36,20 +38,52 @@ class RunnerError(Exception):
         super().__init__(f"Runner error {status_code}: {detail}")
 
 
+def _auth_headers(token: str) -> dict[str, str]:
+    return {"X-Runner-Token": token} if token else {}
+
+
+def _extract_detail(resp: httpx.Response) -> str:
+    """Return FastAPI's ``detail`` for JSON error bodies, else the raw text."""
+    if resp.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = resp.json()
+        except ValueError:
+            return resp.text
+        if isinstance(body, dict):
+            return str(body.get("detail", resp.text))
+    return resp.text
+
+
+def _raise_for_status(resp: httpx.Response) -> None:
+    """Raise RunnerError with the runner's ``detail`` for 4xx/5xx responses."""
+    if resp.status_code >= 400:
+        raise RunnerError(resp.status_code, _extract_detail(resp))
+
+
 class RunnerClient:
-    """Synchronous httpx client for the CLA local runner."""
+    """Synchronous httpx client for the CLA local runner.
+
+    A single ``httpx.Client`` is kept for the lifetime of the instance so
+    requests reuse pooled keep-alive connections. Call ``close()`` on shutdown.
+    """
 
     def __init__(self, base_url: str, token: str, timeout: float = 30.0) -> None:
         self._base_url = base_url.rstrip("/")
         self._token = token
         self._timeout = timeout
+        self._client = httpx.Client(
+            base_url=self._base_url,
+            headers=self._headers,
+            timeout=timeout,
+        )
 
     @property
     def _headers(self) -> dict[str, str]:
-        h: dict[str, str] = {}
-        if self._token:
-            h["X-Runner-Token"] = self._token
-        return h
+        return _auth_headers(self._token)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._client.close()
 
     def _get(
         self,
@@ -59,19 +93,8 @@ class RunnerClient:
     ) -> httpx.Response:
         """Perform a GET request to the runner."""
         try:
-            with httpx.Client(timeout=timeout or self._timeout) as client:
-                resp = client.get(
-                    f"{self._base_url}{path}",
-                    headers=self._headers,
-                    params=params,
-                )
-            if resp.status_code >= 400:
-                detail = resp.text
-                try:
-                    detail = resp.json().get("detail", resp.text)
-                except Exception:
-                    pass
-                raise RunnerError(resp.status_code, str(detail))
+            resp = self._client.get(path, params=params, timeout=timeout or self._timeout)
+            _raise_for_status(resp)
             return resp
         except httpx.ConnectError:
             raise RunnerOfflineError("Runner is offline or unreachable")
@@ -86,19 +109,8 @@ class RunnerClient:
     ) -> httpx.Response:
         """Perform a POST request to the runner."""
         try:
-            with httpx.Client(timeout=timeout or self._timeout) as client:
-                resp = client.post(
-                    f"{self._base_url}{path}",
-                    headers=self._headers,
-                    json=json_data,
-                )
-            if resp.status_code >= 400:
-                detail = resp.text
-                try:
-                    detail = resp.json().get("detail", resp.text)
-                except Exception:
-                    pass
-                raise RunnerError(resp.status_code, str(detail))
+            resp = self._client.post(path, json=json_data, timeout=timeout or self._timeout)
+            _raise_for_status(resp)
             return resp
         except httpx.ConnectError:
             raise RunnerOfflineError("Runner is offline or unreachable")
@@ -143,3 +155,79 @@ class RunnerClient:
         """GET /usage — fetch local ~/.claude usage data through the tunnel."""
         resp = self._get("/usage", timeout=15.0)
         return resp.json()
+
+
+# loop -> base_url -> AsyncClient shared by every AsyncRunnerClient for that
+# runner. An httpx.AsyncClient is bound to the loop it first ran on, so pools
+# are kept per loop (and dropped with it).
+_shared_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+_SHARED_LIMITS = httpx.Limits(max_keepalive_connections=4, max_connections=8)
+
+
+def _get_shared_client(base_url: str, timeout: float) -> httpx.AsyncClient:
+    """Return the running loop's AsyncClient for *base_url*, creating it lazily.
+
+    A closed client is replaced. Auth headers are sent per request, so
+    instances with different tokens can share one pool.
+    """
+    per_url = _shared_async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = per_url.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=_SHARED_LIMITS)
+        per_url[base_url] = client
+    return client
+
+
+async def aclose_shared_clients() -> None:
+    """Close the running loop's shared AsyncClients (call on application shutdown)."""
+    per_url = _shared_async_clients.pop(asyncio.get_running_loop(), {})
+    for client in per_url.values():
+        await client.aclose()
+
+
+class AsyncRunnerClient:
+    """Async httpx client for the runner, used on the event loop (poller).
+
+    Mirrors ``RunnerClient`` for the calls that run inside the API process's
+    loop, so they await the socket directly instead of hopping to the default
+    threadpool. All instances for the same runner share one connection pool
+    per event loop, looked up on each request; close it with
+    ``aclose_shared_clients()`` on shutdown.
+    """
+
+    def __init__(self, base_url: str, token: str, timeout: float = 30.0) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._headers = _auth_headers(token)
+        self._timeout = timeout
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        return _get_shared_client(self._base_url, self._timeout)
+
+    async def _get(
+        self,
+        path: str,
+        params: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        """Perform a GET request to the runner."""
+        try:
+            resp = await self._client.get(
+                path,
+                params=params,
+                headers=self._headers,
+                timeout=timeout or self._timeout,
+            )
+            _raise_for_status(resp)
+            return resp
+        except httpx.ConnectError:
+            raise RunnerOfflineError("Runner is offline or unreachable")
+        except httpx.TimeoutException:
+            raise RunnerOfflineError("Runner request timed out")
+
+    async def health(self) -> RunnerHealth:
+        """GET /health"""
+        resp = await self._get("/health", timeout=5.0)
+        return RunnerHealth(**resp.json())
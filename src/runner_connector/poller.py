@@ -1,19 +1,31 @@
 """Background poller — periodically checks runner health and stores state.
 
 Features:
-- Exponential backoff on consecutive failures (10s → 20s → 40s … 300s)
+- Exponential backoff on consecutive failures (10s → 20s → 40s … 300s),
+  plus up to a quarter-interval of random jitter so pollers don't retry in lockstep
 - Instant recovery: resets to base interval on first success after failure
 - Tracks consecutive failure count + reconnect attempts for diagnostics
+- Health pings go through ``AsyncRunnerClient`` — no threadpool hop per tick
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import random
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
-from src.runner_connector.client import RunnerClient, RunnerOfflineError
+import httpx
+
+from src.runner_connector.client import (
+    AsyncRunnerClient,
+    RunnerClient,
+    RunnerError,
+    RunnerOfflineError,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +33,30 @@ logger = logging.getLogger(__name__)
 _BASE_INTERVAL = 10.0    # seconds
 _MAX_INTERVAL = 300.0    # 5 minutes cap
 _BACKOFF_FACTOR = 2.0
+_JITTER_FRACTION = 0.25  # of the base interval, added while offline
+
+
+@lru_cache(maxsize=8)
+def _iso(ts: float | None) -> str | None:
+    """Format an epoch timestamp as UTC ISO-8601 (None passes through).
+
+    Cached: status requests between two ticks format the same few values.
+    """
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
 
 
 class RunnerState:
-    """Thread-safe state container for runner online/offline status."""
+    """Thread-safe state container for runner online/offline status.
+
+    Timestamps are stored as epoch seconds and only formatted in ``to_dict``.
+    """
 
     def __init__(self) -> None:
         self.online: bool = False
-        self.last_seen: str | None = None
-        self.last_check: str | None = None
+        self.last_seen: float | None = None
+        self.last_check: float | None = None
         self.version: str | None = None
         self.platform: str | None = None
         self.error: str | None = None
@@ -37,20 +64,24 @@ class RunnerState:
         self.consecutive_failures: int = 0
         self.reconnect_attempts: int = 0
         self.current_interval: float = _BASE_INTERVAL
-        self.last_transition: str | None = None  # "online→offline" timestamp
+        self.last_transition: str | None = None  # "online→offline" / "offline→online"
+        self.last_transition_at: float | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
             "online": self.online,
-            "last_seen": self.last_seen,
-            "last_check": self.last_check,
+            "last_seen": _iso(self.last_seen),
+            "last_check": _iso(self.last_check),
             "version": self.version,
             "platform": self.platform,
             "error": self.error,
             "consecutive_failures": self.consecutive_failures,
             "reconnect_attempts": self.reconnect_attempts,
             "current_interval": round(self.current_interval, 1),
-            "last_transition": self.last_transition,
+            "last_transition": (
+                f"{self.last_transition} @ {_iso(self.last_transition_at)}"
+                if self.last_transition else None
+            ),
         }
 
 
@@ -62,13 +93,19 @@ class RunnerPoller:
         client: RunnerClient,
         interval: float = _BASE_INTERVAL,
         max_interval: float = _MAX_INTERVAL,
+        async_client: AsyncRunnerClient | None = None,
     ) -> None:
         self.client = client
+        self._async_client = async_client or AsyncRunnerClient(
+            base_url=client._base_url, token=client._token, timeout=client._timeout,
+        )
         self.base_interval = interval
         self.max_interval = max_interval
         self.state = RunnerState()
         self._task: asyncio.Task[None] | None = None
         self._running = False
+        # Set to end the current backoff sleep early (stop / manual reconnect)
+        self._wake = asyncio.Event()
 
     async def start(self) -> None:
         """Start the background polling loop."""
@@ -81,6 +118,7 @@ class RunnerPoller:
     async def stop(self) -> None:
         """Stop the background poller."""
         self._running = False
+        self._wake.set()
         if self._task:
             self._task.cancel()
             try:
@@ -92,55 +130,86 @@ class RunnerPoller:
     async def _poll_loop(self) -> None:
         """Polling loop with adaptive interval."""
         while self._running:
-            await self._check_once()
-            await asyncio.sleep(self.state.current_interval)
+            try:
+                await self._check_once()
+            except Exception:
+                # A bug rather than a runner outage: log it loudly, keep polling
+                logger.exception("Runner health check crashed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._next_delay())
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._wake.clear()
+
+    def _next_delay(self) -> float:
+        """Seconds until the next check — jittered only while backing off."""
+        delay = self.state.current_interval
+        if not self.state.online:
+            delay += random.uniform(0, self.base_interval * _JITTER_FRACTION)
+        return delay
+
+    def request_immediate_check(self) -> None:
+        """Wake the poll loop now instead of waiting out the current interval.
+
+        Must be called from the event loop (e.g. an ``async def`` route).
+        """
+        self._wake.set()
 
     async def _check_once(self) -> None:
         """Single health check with backoff logic."""
-        now = datetime.now(timezone.utc).isoformat()
+        now = time.time()
         self.state.last_check = now
         was_online = self.state.online
 
         try:
-            loop = asyncio.get_event_loop()
-            health = await loop.run_in_executor(None, self.client.health)
-
-            # ── Success ──
-            self.state.online = True
-            self.state.last_seen = now
-            self.state.version = health.version
-            self.state.platform = health.platform
-            self.state.error = None
-            self.state.consecutive_failures = 0
-            self.state.current_interval = self.base_interval  # reset to fast
-
-            if not was_online:
-                self.state.last_transition = f"offline→online @ {now}"
-                logger.info(
-                    "Runner reconnected: %s v%s (after %d attempts)",
-                    health.platform, health.version, self.state.reconnect_attempts,
-                )
-                self.state.reconnect_attempts = 0
-
-        except (RunnerOfflineError, Exception) as e:
-            # ── Failure — apply backoff ──
-            self.state.consecutive_failures += 1
-            self.state.error = str(e) if not isinstance(e, RunnerOfflineError) else "Runner unreachable"
-
-            if was_online:
-                self.state.last_transition = f"online→offline @ {now}"
-                logger.warning("Runner went offline: %s", self.state.error)
-
-            self.state.online = False
-            self.state.reconnect_attempts += 1
-
-            # Exponential backoff: base * factor^(failures-1), capped
-            self.state.current_interval = min(
-                self.base_interval * (_BACKOFF_FACTOR ** (self.state.consecutive_failures - 1)),
-                self.max_interval,
-            )
-            logger.debug(
-                "Runner poll failed (%d consecutive), next check in %.0fs",
-                self.state.consecutive_failures,
-                self.state.current_interval,
+            health = await self._async_client.health()
+        except RunnerOfflineError:
+            self._record_failure(now, was_online, "Runner unreachable")
+            return
+        except (RunnerError, httpx.HTTPError, ValueError) as e:
+            # ValueError covers a malformed /health payload (JSON or schema)
+            self._record_failure(now, was_online, str(e))
+            return
+
+        # ── Success ──
+        self.state.online = True
+        self.state.last_seen = now
+        self.state.version = health.version
+        self.state.platform = health.platform
+        self.state.error = None
+        self.state.consecutive_failures = 0
+        self.state.current_interval = self.base_interval  # reset to fast
+
+        if not was_online:
+            self.state.last_transition = "offline→online"
+            self.state.last_transition_at = now
+            logger.info(
+                "Runner reconnected: %s v%s (after %d attempts)",
+                health.platform, health.version, self.state.reconnect_attempts,
             )
+            self.state.reconnect_attempts = 0
+
+    def _record_failure(self, now: float, was_online: bool, reason: str) -> None:
+        """Mark the runner offline and apply exponential backoff."""
+        self.state.consecutive_failures += 1
+        self.state.error = reason
+
+        if was_online:
+            self.state.last_transition = "online→offline"
+            self.state.last_transition_at = now
+            logger.warning("Runner went offline: %s", reason)
+
+        self.state.online = False
+        self.state.reconnect_attempts += 1
+
+        # Exponential backoff: base * factor^(failures-1), capped
+        self.state.current_interval = min(
+            self.base_interval * (_BACKOFF_FACTOR ** (self.state.consecutive_failures - 1)),
+            self.max_interval,
+        )
+        logger.debug(
+            "Runner poll failed (%d consecutive), next check in %.0fs",
+            self.state.consecutive_failures,
+            self.state.current_interval,
+        )
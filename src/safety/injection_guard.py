@@ -1,4 +1,4 @@
-"""Prompt injection detection — LlamaGuard (HuggingFace) with regex fallback.
+"""Prompt injection detection — LlamaGuard (vLLM FP8 / HuggingFace) with regex fallback.
 
 Usage:
     from src.safety.injection_guard import is_injection
@@ -7,19 +7,39 @@ Usage:
     if not safe:
         raise ValueError(f"Blocked: {reason}")
 
-LlamaGuard is lazy-loaded on first use. Requires the optional ``ml`` extras:
-    pip install -e ".[ml]"
+LlamaGuard is lazy-loaded on first use. Requires the optional ``ml`` extras
+(add ``vllm`` for the FP8 path):
+    pip install -e ".[ml]"      # or ".[ml,vllm]"
 and a HuggingFace token with access to the gated model:
     huggingface-cli login   # or set HF_TOKEN env var
 
+On GPUs with compute capability >= 8.0 (Ampere and newer) and with the
+``vllm`` extra installed, an FP8-quantized Llama Guard 3 checkpoint is served
+through a vLLM ``AsyncLLMEngine`` with an FP8 KV cache (about half the VRAM
+of fp16 for weights and cached prefixes, faster matmuls). The engine runs on
+its own event-loop thread, so concurrent checks from any thread or loop are
+continuously batched together, and prefix caching keeps the shared guard
+template in the KV cache. Otherwise the fp16 HuggingFace model is used, with
+checks that arrive within a few milliseconds of each other micro-batched into
+one ``generate`` call on the same loop thread.
+
+Async callers should use ``ais_injection`` / ``aassert_safe`` so inference
+never blocks their event loop.
+
 Falls back to regex heuristics if transformers/torch are not installed or if
 the model cannot be loaded (e.g. no HF token, no GPU).
 """
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import functools
 import logging
 import re
+import threading
+import uuid
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
@@ -29,37 +49,243 @@ logger = logging.getLogger(__name__)
 
 _model = None
 _tokenizer = None
+_backend: str | None = None  # "vllm" or "hf" once loaded
+_engine_loop: asyncio.AbstractEventLoop | None = None  # inference loop thread
+_hf_queue: asyncio.Queue[tuple[str, asyncio.Future[str]]] | None = None
+_hf_batcher_task: asyncio.Task[None] | None = None
 _llama_guard_ready = False
 _llama_guard_tried = False  # avoid retrying after a failed load
+_load_lock = threading.Lock()
 
 _LLAMAGUARD_MODEL_ID = "meta-llama/LlamaGuard-7b"
+_LLAMAGUARD_FP8_MODEL_ID = "neuralmagic/Llama-Guard-3-8B-FP8"
+_MAX_NEW_TOKENS = 16
+# Prompt budget inside the engine's 2048-token window, leaving room for the
+# guard template and the verdict. Prompts are first cut by characters
+# (~4 chars/token) so a huge prompt never reaches the tokenizer whole.
+_MAX_PROMPT_TOKENS = 1536
+_MAX_PROMPT_CHARS = _MAX_PROMPT_TOKENS * 4
+# Anything shorter can't carry an injection the regexes would miss
+_MIN_MODEL_CHARS = 8
+# HF micro-batching: checks arriving within the window share one generate()
+_BATCH_MAX = 16
+_BATCH_WINDOW = 0.005  # seconds
+
+
+def _start_engine_loop() -> asyncio.AbstractEventLoop:
+    """Start the daemon thread that owns inference scheduling."""
+    global _engine_loop
+    _engine_loop = asyncio.new_event_loop()
+    threading.Thread(
+        target=_engine_loop.run_forever, name="llamaguard-engine", daemon=True
+    ).start()
+    return _engine_loop
+
+
+def _load_vllm_fp8() -> bool:
+    """Start an FP8 vLLM engine on a dedicated loop thread. Returns True on success."""
+    global _model, _tokenizer, _backend
+    try:
+        from vllm import AsyncEngineArgs, AsyncLLMEngine
+    except ImportError:
+        return False
+    from transformers import AutoTokenizer
+
+    logger.info("Loading LlamaGuard model '%s' (FP8, vLLM)…", _LLAMAGUARD_FP8_MODEL_ID)
+    try:
+        _tokenizer = AutoTokenizer.from_pretrained(_LLAMAGUARD_FP8_MODEL_ID)
+        _model = AsyncLLMEngine.from_engine_args(
+            AsyncEngineArgs(
+                model=_LLAMAGUARD_FP8_MODEL_ID,
+                quantization="fp8",
+                kv_cache_dtype="fp8",
+                max_model_len=2048,
+                gpu_memory_utilization=0.4,
+                enable_prefix_caching=True,
+            )
+        )
+    except Exception as exc:
+        # e.g. GPU OOM at start-up or an unsupported model — fp16 may still fit
+        logger.warning("vLLM engine failed to start (%s); trying HF fp16.", exc)
+        _model = None
+        _tokenizer = None
+        return False
+    _start_engine_loop()
+    _backend = "vllm"
+    return True
+
+
+def _load_hf_fp16() -> None:
+    """Load the fp16 HuggingFace model and start its micro-batcher."""
+    global _model, _tokenizer, _backend
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    logger.info("Loading LlamaGuard model '%s'…", _LLAMAGUARD_MODEL_ID)
+    _tokenizer = AutoTokenizer.from_pretrained(_LLAMAGUARD_MODEL_ID)
+    # Batched decoder-only generation needs left padding
+    _tokenizer.padding_side = "left"
+    if _tokenizer.pad_token is None:
+        _tokenizer.pad_token = _tokenizer.eos_token
+    _model = AutoModelForCausalLM.from_pretrained(
+        _LLAMAGUARD_MODEL_ID,
+        torch_dtype=torch.float16,
+        device_map="auto",
+    )
+    loop = _start_engine_loop()
+    asyncio.run_coroutine_threadsafe(_start_hf_batcher(), loop).result()
+    _backend = "hf"
 
 
 def _try_load_llamaguard() -> bool:
-    """Attempt to load LlamaGuard once. Returns True if ready."""
-    global _model, _tokenizer, _llama_guard_ready, _llama_guard_tried
+    """Attempt to load LlamaGuard once. Returns True if ready.
+
+    Concurrent first callers wait for the one load instead of silently
+    taking the regex path while it is in progress.
+    """
+    global _llama_guard_ready, _llama_guard_tried
     if _llama_guard_tried:
         return _llama_guard_ready
-    _llama_guard_tried = True
+    with _load_lock:
+        if _llama_guard_tried:
+            return _llama_guard_ready
+        _llama_guard_ready = _load_llamaguard()
+        _llama_guard_tried = True
+    return _llama_guard_ready
+
+
+def _load_llamaguard() -> bool:
+    """Load the best available LlamaGuard backend. Returns True on success."""
     try:
         import torch
-        from transformers import AutoModelForCausalLM, AutoTokenizer
-
-        logger.info("Loading LlamaGuard model '%s'…", _LLAMAGUARD_MODEL_ID)
-        _tokenizer = AutoTokenizer.from_pretrained(_LLAMAGUARD_MODEL_ID)
-        _model = AutoModelForCausalLM.from_pretrained(
-            _LLAMAGUARD_MODEL_ID,
-            torch_dtype=torch.float16,
-            device_map="auto",
+
+        # FP8 weights/KV need Ampere+ (capability 8.x); older GPUs keep fp16
+        fp8_capable = (
+            torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8
         )
-        _llama_guard_ready = True
-        logger.info("LlamaGuard loaded successfully.")
+        if not (fp8_capable and _load_vllm_fp8()):
+            _load_hf_fp16()
+        logger.info("LlamaGuard loaded successfully (%s).", _backend)
+        return True
     except Exception as exc:
         logger.warning(
             "LlamaGuard unavailable (%s). Falling back to regex injection detection.", exc
         )
-        _llama_guard_ready = False
-    return _llama_guard_ready
+        return False
+
+
+async def _vllm_generate(prompt: str) -> str:
+    """Submit one request to the vLLM engine (runs on ``_engine_loop``)."""
+    from vllm import SamplingParams
+
+    # The char cut isn't enough for token-dense text (code, CJK, base64);
+    # over max_model_len vLLM would reject the request outright
+    ids = _tokenizer.encode(prompt, add_special_tokens=False)
+    if len(ids) > _MAX_PROMPT_TOKENS:
+        prompt = _tokenizer.decode(ids[:_MAX_PROMPT_TOKENS])
+    chat = _tokenizer.apply_chat_template(
+        [{"role": "user", "content": prompt}], tokenize=False
+    )
+    params = SamplingParams(max_tokens=_MAX_NEW_TOKENS, temperature=0)
+    final = None
+    async for output in _model.generate(chat, params, request_id=uuid.uuid4().hex):
+        final = output
+    return final.outputs[0].text if final is not None else ""
+
+
+async def _start_hf_batcher() -> None:
+    """Create the request queue and batcher task (runs on ``_engine_loop``)."""
+    global _hf_queue, _hf_batcher_task
+    _hf_queue = asyncio.Queue()
+    _hf_batcher_task = asyncio.get_running_loop().create_task(_hf_batcher())
+
+
+async def _hf_batcher() -> None:
+    """Group queued prompts into batches and fan the verdicts back out.
+
+    A batch closes after ``_BATCH_WINDOW`` or ``_BATCH_MAX`` prompts; while
+    the GPU works on it, new requests queue up for the next one.
+    """
+    assert _hf_queue is not None
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _hf_queue.get()]
+        deadline = loop.time() + _BATCH_WINDOW
+        while len(batch) < _BATCH_MAX:
+            try:
+                batch.append(
+                    await asyncio.wait_for(_hf_queue.get(), deadline - loop.time())
+                )
+            except asyncio.TimeoutError:
+                break
+        try:
+            decoded = await asyncio.to_thread(_generate_batch, [p for p, _ in batch])
+        except Exception as exc:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            continue
+        for (_, fut), text in zip(batch, decoded):
+            if not fut.done():
+                fut.set_result(text)
+
+
+async def _hf_generate(prompt: str) -> str:
+    """Queue one prompt for the HF batcher (runs on ``_engine_loop``)."""
+    assert _hf_queue is not None
+    fut: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+    _hf_queue.put_nowait((prompt, fut))
+    return await fut
+
+
+def _generate_batch(prompts: list[str]) -> list[str]:
+    """Classify *prompts* with one ``generate`` call; returns the new text only."""
+    import torch
+
+    inputs = _tokenizer(
+        prompts,
+        return_tensors="pt",
+        padding=True,
+        truncation=True,
+        max_length=_MAX_PROMPT_TOKENS,
+    ).to(_model.device)
+    with torch.no_grad():
+        output_ids = _model.generate(
+            **inputs, max_new_tokens=_MAX_NEW_TOKENS, pad_token_id=_tokenizer.pad_token_id
+        )
+    # Left-padded, so every row's prompt ends at the same column
+    new_tokens = output_ids[:, inputs["input_ids"].shape[1]:]
+    return _tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+
+
+def _submit(prompt: str) -> concurrent.futures.Future[str]:
+    """Schedule a guard request on the engine loop (callable from any thread)."""
+    assert _engine_loop is not None
+    coro = _vllm_generate(prompt) if _backend == "vllm" else _hf_generate(prompt)
+    return asyncio.run_coroutine_threadsafe(coro, _engine_loop)
+
+
+def _generate(prompt: str) -> str:
+    """Run one LlamaGuard classification and return the decoded verdict."""
+    return _submit(prompt).result()
+
+
+def _verdict(decoded: str) -> tuple[bool, str]:
+    is_unsafe = "unsafe" in decoded.lower()
+    return is_unsafe, decoded.strip() if is_unsafe else ""
+
+
+def _use_model(prompt: str) -> bool:
+    return len(prompt.strip()) >= _MIN_MODEL_CHARS and _try_load_llamaguard() and (
+        _model is not None and _tokenizer is not None
+    )
+
+
+def _with_tail_check(prompt: str, verdict: tuple[bool, str]) -> tuple[bool, str]:
+    """The model only sees the head of a long prompt — regex-scan all of it."""
+    if verdict[0] or len(prompt) <= _MAX_PROMPT_CHARS:
+        return verdict
+    return _regex_check(prompt)
 
 
 # ---------------------------------------------------------------------------
@@ -72,14 +298,88 @@ _INJECTION_PATTERNS: list[re.Pattern[str]] = [
     re.compile(r"\byou\s+are\s+now\b", re.I),
     re.compile(r"\bnew\s+(persona|role|identity|character)\b", re.I),
     re.compile(r"\b(jailbreak|DAN\s*mode|developer\s*mode|god\s*mode)\b", re.I),
-    re.compile(r"pretend\s+(you\s+are|to\s+be)\s+.{0,40}(without|no)\s+(restrictions?|limits?|rules?)", re.I),
+    # Same language as ``\s+.{0,40}``, but the span must start on a non-space,
+    # so a long whitespace run can't be re-split 40 ways on every backtrack
+    re.compile(
+        r"pretend\s+(you\s+are|to\s+be)\s+(?:\S.{0,39})?"
+        r"(without|no)\s+(restrictions?|limits?|rules?)",
+        re.I,
+    ),
     re.compile(r"forget\s+(all\s+)?(previous|prior|above)\s+(instructions?|rules?|context)", re.I),
-    re.compile(r"(act|behave)\s+as\s+(if\s+)?(you\s+are\s+)?(a\s+)?(?:unrestricted|uncensored|unfiltered)", re.I),
+    re.compile(
+        r"(act|behave)\s+as\s+(if\s+)?(you\s+are\s+)?(a\s+)?"
+        r"(?:unrestricted|uncensored|unfiltered)",
+        re.I,
+    ),
 ]
 
 
+# All patterns as one alternation, so a clean prompt is scanned once. The
+# lookahead lists every pattern's possible first letter and lets the engine
+# skip most positions without trying each branch — keep it in sync.
+_INJECTION_FIRST_CHARS = "abdfgijnpy"
+_COMBINED_INJECTION = re.compile(
+    f"(?=[{_INJECTION_FIRST_CHARS}])(?:"
+    + "|".join(f"(?:{p.pattern})" for p in _INJECTION_PATTERNS)
+    + ")",
+    re.I,
+)
+
+# ---------------------------------------------------------------------------
+# Result caches — agents re-submit the same prompts, so repeats skip the scan
+# or the model. Long prompts are rarely repeated and are not cached, which
+# also bounds the memory held by cache keys.
+# ---------------------------------------------------------------------------
+
+_CACHE_SIZE = 4096
+_CACHE_MAX_CHARS = 4096
+
+# (model id, prompt) -> LlamaGuard verdict
+_verdict_cache: OrderedDict[tuple[str, str], tuple[bool, str]] = OrderedDict()
+_verdict_lock = threading.Lock()
+
+
+def _model_id() -> str:
+    return _LLAMAGUARD_FP8_MODEL_ID if _backend == "vllm" else _LLAMAGUARD_MODEL_ID
+
+
+def _cached_verdict(prompt: str) -> tuple[bool, str] | None:
+    if len(prompt) > _CACHE_MAX_CHARS:
+        return None
+    key = (_model_id(), prompt)
+    with _verdict_lock:
+        hit = _verdict_cache.get(key)
+        if hit is not None:
+            _verdict_cache.move_to_end(key)
+        return hit
+
+
+def _store_verdict(prompt: str, verdict: tuple[bool, str]) -> tuple[bool, str]:
+    if len(prompt) <= _CACHE_MAX_CHARS:
+        with _verdict_lock:
+            _verdict_cache[(_model_id(), prompt)] = verdict
+            if len(_verdict_cache) > _CACHE_SIZE:
+                _verdict_cache.popitem(last=False)
+    return verdict
+
+
 def _regex_check(text: str) -> tuple[bool, str]:
     """Return (True, reason) if any injection pattern matches, else (False, '')."""
+    if len(text) <= _CACHE_MAX_CHARS:
+        return _regex_check_cached(text)
+    return _regex_scan(text)
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _regex_check_cached(text: str) -> tuple[bool, str]:
+    return _regex_scan(text)
+
+
+def _regex_scan(text: str) -> tuple[bool, str]:
+    # One pass over the text for the common (clean) case; the individual
+    # patterns only run on a hit, to name the one that matched.
+    if not _COMBINED_INJECTION.search(text):
+        return False, ""
     for pattern in _INJECTION_PATTERNS:
         if pattern.search(text):
             return True, f"Injection pattern detected: {pattern.pattern!r}"
@@ -100,24 +400,22 @@ def is_injection(prompt: str) -> tuple[bool, str]:
         ``reason`` describes why (empty string when safe).
 
     Strategy:
-    1. Try LlamaGuard inference (if model available).
+    1. Try LlamaGuard inference (if model available). Very short prompts
+       skip the model; long ones are truncated for it and the full text is
+       regex-scanned as well.
     2. Fall back to regex heuristics.
     """
     if not isinstance(prompt, str) or not prompt.strip():
         return False, ""
 
     # --- LlamaGuard path ---
-    if _try_load_llamaguard() and _model is not None and _tokenizer is not None:
+    if _use_model(prompt):
+        cached = _cached_verdict(prompt)
+        if cached is not None:
+            return cached
         try:
-            import torch
-
-            inputs = _tokenizer(prompt, return_tensors="pt").to(_model.device)
-            with torch.no_grad():
-                output_ids = _model.generate(**inputs, max_new_tokens=16, pad_token_id=_tokenizer.eos_token_id)
-            decoded = _tokenizer.decode(output_ids[0], skip_special_tokens=True)
-            is_unsafe = "unsafe" in decoded.lower()
-            reason = decoded.strip() if is_unsafe else ""
-            return is_unsafe, reason
+            verdict = _verdict(_generate(prompt[:_MAX_PROMPT_CHARS]))
+            return _store_verdict(prompt, _with_tail_check(prompt, verdict))
         except Exception as exc:
             logger.warning("LlamaGuard inference error: %s — using regex fallback.", exc)
 
@@ -125,8 +423,40 @@ def is_injection(prompt: str) -> tuple[bool, str]:
     return _regex_check(prompt)
 
 
+async def ais_injection(prompt: str) -> tuple[bool, str]:
+    """Async ``is_injection``: awaits the model without blocking the event loop.
+
+    With the vLLM backend the request joins the shared engine's running batch;
+    with the HuggingFace model it joins the next micro-batch.
+    """
+    if not isinstance(prompt, str) or not prompt.strip():
+        return False, ""
+
+    if not _llama_guard_tried and len(prompt.strip()) >= _MIN_MODEL_CHARS:
+        await asyncio.to_thread(_try_load_llamaguard)
+    if _use_model(prompt):
+        cached = _cached_verdict(prompt)
+        if cached is not None:
+            return cached
+        head = prompt[:_MAX_PROMPT_CHARS]
+        try:
+            decoded = await asyncio.wrap_future(_submit(head))
+            return _store_verdict(prompt, _with_tail_check(prompt, _verdict(decoded)))
+        except Exception as exc:
+            logger.warning("LlamaGuard inference error: %s — using regex fallback.", exc)
+
+    return _regex_check(prompt)
+
+
 def assert_safe(prompt: str) -> None:
     """Raise ``ValueError`` if *prompt* looks like an injection attempt."""
     unsafe, reason = is_injection(prompt)
     if unsafe:
         raise ValueError(f"Blocked: prompt injection detected — {reason}")
+
+
+async def aassert_safe(prompt: str) -> None:
+    """Async ``assert_safe`` for use inside coroutines."""
+    unsafe, reason = await ais_injection(prompt)
+    if unsafe:
+        raise ValueError(f"Blocked: prompt injection detected — {reason}")
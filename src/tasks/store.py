@@ -9,9 +9,12 @@ from __future__ import annotations
 import json
 import logging
 import sqlite3
+import threading
 import time
 import uuid
-from dataclasses import asdict, dataclass, field
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -22,6 +25,37 @@ DB_PATH = DATA_DIR / "tasks.db"
 
 COLUMNS = ("backlog", "planned", "in-progress", "review", "done")
 
+# Applied to every new connection. WAL + synchronous=NORMAL syncs at
+# checkpoints rather than on every commit; the rest keeps reads in memory.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-65536",     # 64 MB
+)
+
+
+def _load_metadata(meta: Any) -> Any:
+    """Decode a metadata column value; malformed JSON becomes ``{}``."""
+    if isinstance(meta, str):
+        try:
+            return json.loads(meta)
+        except Exception:
+            return {}
+    return meta
+
+
+# Shared by create/create_many so sqlite3's statement cache reuses the plan
+_INSERT_TASK_SQL = """
+    INSERT INTO tasks (id, title, description, "column", project_id,
+                       agent, priority, autopilot, created_at,
+                       updated_at, result, metadata)
+    VALUES (:id, :title, :description, :column, :project_id,
+            :agent, :priority, :autopilot, :created_at,
+            :updated_at, :result, :metadata)
+"""
+
 
 @dataclass
 class Task:
@@ -41,18 +75,21 @@ class Task:
     metadata: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        d = asdict(self)
-        d["metadata"] = json.dumps(d["metadata"])
+        # Shallow copy of the fields; metadata is re-encoded, so nothing
+        # mutable is shared with the caller (asdict would deep-copy it first)
+        d = dict(self.__dict__)
+        d["metadata"] = json.dumps(self.metadata)
         return d
 
     @classmethod
-    def from_row(cls, row: dict[str, Any]) -> "Task":
-        meta = row.get("metadata", "{}")
-        if isinstance(meta, str):
-            try:
-                meta = json.loads(meta)
-            except Exception:
-                meta = {}
+    def from_row(cls, row: dict[str, Any], load_metadata: bool = True) -> "Task":
+        """Build a Task from a DB row.
+
+        With ``load_metadata=False`` the JSON column is not parsed and
+        ``metadata`` is left empty — for callers that only need the
+        scalar fields.
+        """
+        meta = _load_metadata(row.get("metadata", "{}")) if load_metadata else {}
         return cls(
             id=row["id"],
             title=row.get("title", ""),
@@ -75,13 +112,26 @@ class TaskStore:
     def __init__(self, db_path: Path | str | None = None) -> None:
         self._db_path = str(db_path or DB_PATH)
         DATA_DIR.mkdir(parents=True, exist_ok=True)
+        # One connection shared by every thread, opened lazily. Calls are
+        # serialised on the lock: the sync API routes run on a pool of
+        # short-lived worker threads, and a connection per thread would
+        # outlive them.
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
         self._init_db()
 
-    def _conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        return conn
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        """The shared connection, held under the lock for one transaction."""
+        with self._lock:
+            if self._db is None:
+                conn = sqlite3.connect(self._db_path, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                for pragma in _PRAGMAS:
+                    conn.execute(pragma)
+                self._db = conn
+            with self._db:
+                yield self._db
 
     def _init_db(self) -> None:
         with self._conn() as conn:
@@ -131,16 +181,19 @@ class TaskStore:
         task.created_at = time.time()
         task.updated_at = task.created_at
         with self._conn() as conn:
-            conn.execute("""
-                INSERT INTO tasks (id, title, description, "column", project_id,
-                                   agent, priority, autopilot, created_at,
-                                   updated_at, result, metadata)
-                VALUES (:id, :title, :description, :column, :project_id,
-                        :agent, :priority, :autopilot, :created_at,
-                        :updated_at, :result, :metadata)
-            """, task.to_dict())
+            conn.execute(_INSERT_TASK_SQL, task.to_dict())
         return task
 
+    def create_many(self, tasks: list[Task]) -> list[Task]:
+        """Insert several tasks in one transaction (all or nothing)."""
+        now = time.time()
+        for task in tasks:
+            task.created_at = now
+            task.updated_at = now
+        with self._conn() as conn:
+            conn.executemany(_INSERT_TASK_SQL, [t.to_dict() for t in tasks])
+        return tasks
+
     def get(self, task_id: str) -> Task | None:
         """Get a single task by ID."""
         with self._conn() as conn:
@@ -149,7 +202,9 @@ class TaskStore:
             ).fetchone()
         return Task.from_row(dict(row)) if row else None
 
-    def list_all(self, project_id: str | None = None) -> list[Task]:
+    def list_all(
+        self, project_id: str | None = None, load_metadata: bool = True,
+    ) -> list[Task]:
         """List all tasks, optionally filtered by project."""
         with self._conn() as conn:
             if project_id:
@@ -161,9 +216,11 @@ class TaskStore:
                 rows = conn.execute(
                     'SELECT * FROM tasks ORDER BY priority DESC, created_at'
                 ).fetchall()
-        return [Task.from_row(dict(r)) for r in rows]
+        return [Task.from_row(dict(r), load_metadata) for r in rows]
 
-    def list_by_column(self, column: str, project_id: str | None = None) -> list[Task]:
+    def list_by_column(
+        self, column: str, project_id: str | None = None, load_metadata: bool = True,
+    ) -> list[Task]:
         """List tasks in a specific column."""
         with self._conn() as conn:
             if project_id:
@@ -178,7 +235,7 @@ class TaskStore:
                     'ORDER BY priority DESC, created_at',
                     (column,)
                 ).fetchall()
-        return [Task.from_row(dict(r)) for r in rows]
+        return [Task.from_row(dict(r), load_metadata) for r in rows]
 
     def update(self, task_id: str, **fields: Any) -> Task | None:
         """Update specific fields of a task."""
@@ -219,26 +276,43 @@ class TaskStore:
 
     def board(self, project_id: str | None = None) -> dict[str, list[dict[str, Any]]]:
         """Get the full board as a dict of columns → task lists."""
-        tasks = self.list_all(project_id)
+        with self._conn() as conn:
+            if project_id:
+                rows = conn.execute(
+                    'SELECT * FROM tasks WHERE project_id = ? ORDER BY priority DESC, created_at',
+                    (project_id,)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    'SELECT * FROM tasks ORDER BY priority DESC, created_at'
+                ).fetchall()
+        # Rows go straight to dicts — no Task round-trip per card
         board: dict[str, list[dict[str, Any]]] = {col: [] for col in COLUMNS}
-        for t in tasks:
-            col = t.column if t.column in COLUMNS else "backlog"
-            d = asdict(t)
+        for r in rows:
+            d = dict(r)
             d["autopilot"] = bool(d["autopilot"])
-            board[col].append(d)
+            d["metadata"] = _load_metadata(d["metadata"])
+            board[d["column"] if d["column"] in COLUMNS else "backlog"].append(d)
         return board
 
     def stats(self, project_id: str | None = None) -> dict[str, Any]:
         """Summary statistics for the board."""
-        tasks = self.list_all(project_id)
+        query = 'SELECT "column", COUNT(*), SUM(autopilot != 0) FROM tasks'
+        params: tuple[Any, ...] = ()
+        if project_id:
+            query += " WHERE project_id = ?"
+            params = (project_id,)
+        with self._conn() as conn:
+            rows = conn.execute(query + ' GROUP BY "column"', params).fetchall()
         by_col = {col: 0 for col in COLUMNS}
-        for t in tasks:
-            col = t.column if t.column in COLUMNS else "backlog"
-            by_col[col] += 1
+        autopilot = 0
+        for col, count, auto in rows:
+            by_col[col if col in COLUMNS else "backlog"] += count
+            autopilot += auto
         return {
-            "total": len(tasks),
+            "total": sum(by_col.values()),
             "by_column": by_col,
-            "autopilot_count": sum(1 for t in tasks if t.autopilot),
+            "autopilot_count": autopilot,
         }
 
     # ── Chat history ──────────────────────────────────────────────────────
@@ -280,5 +354,8 @@ class TaskStore:
         return [dict(r) for r in reversed(rows)]
 
     def close(self) -> None:
-        """No-op — connections are created per-call."""
-        pass
+        """Close the shared connection; the next call reopens it."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
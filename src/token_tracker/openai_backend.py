@@ -21,14 +21,68 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+import weakref
+from collections import defaultdict, deque
+from functools import lru_cache
 from typing import Any
 
 from src.config import settings
 from src.token_tracker.tracker import ClaudeResponse, UsageRecord
 
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    _HTTP2 = True
+except ImportError:  # pragma: no cover - optional speedup
+    _HTTP2 = False
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _get_client(api_key: str) -> Any:
+    """Sync OpenAI client for *api_key*, shared by every backend.
+
+    Agents each build their own ``OpenAIBackend``; sharing the client means
+    one connection pool (and TLS handshake) per key instead of per agent.
+    """
+    import openai
+
+    return openai.OpenAI(api_key=api_key)
+
+
+# loop -> api_key -> AsyncOpenAI. An httpx.AsyncClient is bound to the loop
+# it first ran on, so async clients are shared per loop (and dropped with it).
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, Any]
+] = weakref.WeakKeyDictionary()
+
+
+def _get_async_client(api_key: str) -> Any:
+    """Async OpenAI client for *api_key* on the running event loop.
+
+    Built on the SDK's ``DefaultAsyncHttpxClient`` (its timeouts, limits and
+    redirect handling); with ``h2`` installed, concurrent calls multiplex
+    over HTTP/2.
+    """
+    import openai
+
+    per_key = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = per_key.get(api_key)
+    if client is None:
+        client = per_key[api_key] = openai.AsyncOpenAI(
+            api_key=api_key,
+            http_client=openai.DefaultAsyncHttpxClient(http2=_HTTP2),
+        )
+    return client
+
+
+def _block_text(block: Any) -> str | None:
+    """Text of a structured content block (dict or SDK object), else None."""
+    if isinstance(block, dict):
+        return block["text"] if block.get("type") == "text" else None
+    return getattr(block, "text", None)
+
+
 class OpenAIBackend:
     """LLM backend that routes calls to OpenAI's ChatGPT API.
 
@@ -43,18 +97,26 @@ class OpenAIBackend:
         model: str = "gpt-4o",
     ) -> None:
         try:
-            import openai
+            self._client = _get_client(api_key)
         except ImportError as exc:
             raise ImportError(
                 "The openai package is required for the ChatGPT backend. "
                 "Install it with:  pip install openai"
             ) from exc
-
-        self._client = openai.OpenAI(api_key=api_key)
-        self._async_client = openai.AsyncOpenAI(api_key=api_key)
+        self._api_key = api_key
         self.model = model
-        self.records: list[UsageRecord] = []
+        # Recent calls only, for introspection; totals live in _agent_stats
+        self.records: deque[UsageRecord] = deque(maxlen=settings.max_usage_records)
         self._call_count: int = 0
+        # Running per-agent totals so agent_summary needn't rescan records
+        self._agent_stats: defaultdict[str, dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "input_chars": 0, "output_chars": 0}
+        )
+
+    @property
+    def _async_client(self) -> Any:
+        """The shared async client for this key on the running loop."""
+        return _get_async_client(self._api_key)
 
     # -- budget helpers (mirror TokenTracker interface) -------------------------
 
@@ -67,14 +129,14 @@ class OpenAIBackend:
         return max(0, settings.daily_call_limit - self._call_count)
 
     def agent_summary(self, agent_id: str) -> dict[str, Any]:
-        agent_records = [r for r in self.records if r.agent_id == agent_id]
+        stats = self._agent_stats.get(agent_id)
         return {
             "agent_id": agent_id,
             "backend": "openai",
             "model": self.model,
-            "calls": len(agent_records),
-            "input_chars": sum(r.input_chars for r in agent_records),
-            "output_chars": sum(r.output_chars for r in agent_records),
+            "calls": stats["calls"] if stats else 0,
+            "input_chars": stats["input_chars"] if stats else 0,
+            "output_chars": stats["output_chars"] if stats else 0,
             "total_cost_usd": 0.0,  # ChatGPT Plus subscription
         }
 
@@ -98,7 +160,7 @@ class OpenAIBackend:
                 f"({self._call_count} calls made)"
             )
 
-        oai_messages = self._build_messages(system, messages)
+        oai_messages, input_chars = self._build_messages(system, messages)
         use_model = model or self.model
 
         t0 = time.perf_counter()
@@ -114,17 +176,8 @@ class OpenAIBackend:
             output = f"Error: OpenAI API call failed — {exc}"
 
         latency = (time.perf_counter() - t0) * 1000
-        input_chars = sum(len(m.get("content", "")) for m in oai_messages)
 
-        record = UsageRecord(
-            agent_id=agent_id,
-            model=use_model,
-            input_chars=input_chars,
-            output_chars=len(output),
-            latency_ms=latency,
-        )
-        self.records.append(record)
-        self._call_count += 1
+        self._record(agent_id, use_model, input_chars, len(output), latency)
 
         return ClaudeResponse(text=output, input_chars=input_chars)
 
@@ -146,7 +199,7 @@ class OpenAIBackend:
                 f"({self._call_count} calls made)"
             )
 
-        oai_messages = self._build_messages(system, messages)
+        oai_messages, input_chars = self._build_messages(system, messages)
         use_model = model or self.model
 
         t0 = time.perf_counter()
@@ -162,17 +215,8 @@ class OpenAIBackend:
             output = f"Error: OpenAI API call failed — {exc}"
 
         latency = (time.perf_counter() - t0) * 1000
-        input_chars = sum(len(m.get("content", "")) for m in oai_messages)
 
-        record = UsageRecord(
-            agent_id=agent_id,
-            model=use_model,
-            input_chars=input_chars,
-            output_chars=len(output),
-            latency_ms=latency,
-        )
-        self.records.append(record)
-        self._call_count += 1
+        self._record(agent_id, use_model, input_chars, len(output), latency)
 
         return ClaudeResponse(text=output, input_chars=input_chars)
 
@@ -197,11 +241,13 @@ class OpenAIBackend:
             yield {"type": "error", "data": "Daily call limit reached"}
             return
 
-        oai_messages = self._build_messages(system, messages)
+        oai_messages, input_chars = self._build_messages(system, messages)
         use_model = model or self.model
 
         t0 = time.perf_counter()
-        full_output = ""
+        # Chunks are joined once at the end — repeated += is quadratic
+        parts: list[str] = []
+        output_chars = 0
 
         try:
             stream = await self._async_client.chat.completions.create(
@@ -212,7 +258,8 @@ class OpenAIBackend:
             async for chunk in stream:
                 delta = chunk.choices[0].delta if chunk.choices else None
                 if delta and delta.content:
-                    full_output += delta.content
+                    parts.append(delta.content)
+                    output_chars += len(delta.content)
                     yield {"type": "chunk", "data": delta.content}
 
         except Exception as exc:
@@ -221,45 +268,60 @@ class OpenAIBackend:
             return
 
         latency = (time.perf_counter() - t0) * 1000
-        input_chars = sum(len(m.get("content", "")) for m in oai_messages)
 
-        record = UsageRecord(
-            agent_id=agent_id,
-            model=use_model,
-            input_chars=input_chars,
-            output_chars=len(full_output),
-            latency_ms=latency,
-        )
-        self.records.append(record)
-        self._call_count += 1
+        self._record(agent_id, use_model, input_chars, output_chars, latency)
 
-        yield {"type": "done", "data": full_output}
+        yield {"type": "done", "data": "".join(parts)}
 
     # -- internals -------------------------------------------------------------
 
+    def _record(
+        self,
+        agent_id: str,
+        model: str,
+        input_chars: int,
+        output_chars: int,
+        latency_ms: float,
+    ) -> None:
+        """Log one call and fold it into the running per-agent totals."""
+        self.records.append(UsageRecord(
+            agent_id=agent_id,
+            model=model,
+            input_chars=input_chars,
+            output_chars=output_chars,
+            latency_ms=latency_ms,
+        ))
+        self._call_count += 1
+        stats = self._agent_stats[agent_id]
+        stats["calls"] += 1
+        stats["input_chars"] += input_chars
+        stats["output_chars"] += output_chars
+
     @staticmethod
     def _build_messages(
         system: str | None,
         messages: list[dict[str, Any]],
-    ) -> list[dict[str, str]]:
-        """Convert system prompt + conversation history to OpenAI message format."""
+    ) -> tuple[list[dict[str, str]], int]:
+        """Convert system prompt + conversation history to OpenAI message format.
+
+        Returns the messages and their total content length, counted in the
+        same pass so callers don't walk the history a second time.
+        """
         oai_messages: list[dict[str, str]] = []
+        input_chars = 0
 
         if system:
             oai_messages.append({"role": "system", "content": system})
+            input_chars = len(system)
 
         for msg in messages:
-            role = msg.get("role", "user")
             content = msg.get("content", "")
             if isinstance(content, list):
                 # Flatten structured content blocks
-                text_parts = []
-                for block in content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        text_parts.append(block["text"])
-                    elif hasattr(block, "text"):
-                        text_parts.append(block.text)
-                content = "\n".join(text_parts)
-            oai_messages.append({"role": role, "content": content})
-
-        return oai_messages
+                content = "\n".join(
+                    text for text in map(_block_text, content) if text is not None
+                )
+            input_chars += len(content)
+            oai_messages.append({"role": msg.get("role", "user"), "content": content})
+
+        return oai_messages, input_chars
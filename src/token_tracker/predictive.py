@@ -6,34 +6,48 @@ Analyses historical session data to predict:
 - Usage trend (accelerating, steady, decelerating)
 - Peak usage hours and recommendations
 
-Uses simple linear regression on daily token counts — no ML deps required.
+Uses simple linear regression on daily token counts (plain NumPy reductions,
+no ML deps required).
 """
 
 from __future__ import annotations
 
+import heapq
+import json
 import logging
 import math
-from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Any
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from src.token_tracker.session_parser import parse_all_sessions
+from src.token_tracker.session_parser import SessionData, _claude_dir, parse_all_sessions
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ["Forecast", "clear_forecast_cache", "compute_forecast", "forecast_to_dict"]
 
 logger = logging.getLogger(__name__)
 
+# Trend / recommendation thresholds
+_STEADY_BAND = 0.05          # |slope| under 5% of the daily average is "steady"
+_WEEKLY_WARN = 0.8 / 7       # daily average above 80% of a seventh of the weekly cap
+_OUTPUT_HEAVY_RATIO = 2      # output tokens at 2x+ input
+_SESSIONS_PER_DAY = 3        # assumed 5-hour sessions per day
+_DAYS_PER_WEEK = 7           # projection horizons
+_DAYS_PER_MONTH = 30
 
-@dataclass
-class TrendPoint:
-    date: str
-    tokens: int
-    input_tokens: int
-    output_tokens: int
+_PEAK_HOURS = 3              # hours reported in peak_hours
+_HOUR_KEYS = tuple(f"{h:02d}" for h in range(24))  # "00" .. "23", in order
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Forecast:
-    """Token usage forecast."""
+    """Token usage forecast (immutable: cached instances are shared)."""
 
     avg_daily_tokens: float
     avg_daily_input: float
@@ -44,86 +58,264 @@ class Forecast:
     projected_30d_tokens: int
     session_limit_days_remaining: float | None  # days until 5hr session cap
     weekly_limit_days_remaining: float | None  # days until weekly cap
-    peak_hours: list[int]  # top 3 hours of day (UTC) by usage
-    recommendations: list[str]
+    peak_hours: tuple[int, ...]  # top 3 hours of day (UTC) by usage
+    recommendations: tuple[str, ...]
+
+
+_NO_DATA_FORECAST = Forecast(
+    avg_daily_tokens=0,
+    avg_daily_input=0,
+    avg_daily_output=0,
+    trend="insufficient_data",
+    trend_slope=0,
+    projected_7d_tokens=0,
+    projected_30d_tokens=0,
+    session_limit_days_remaining=None,
+    weekly_limit_days_remaining=None,
+    peak_hours=(),
+    recommendations=("Not enough usage data yet. Use the system for a few days.",),
+)
 
 
-def _linear_regression(xs: list[float], ys: list[float]) -> tuple[float, float]:
-    """Simple OLS regression. Returns (slope, intercept)."""
-    n = len(xs)
+def _linear_regression(
+    xs: np.ndarray | list[float], ys: np.ndarray | list[float],
+) -> tuple[float, float]:
+    """Simple OLS regression. Returns (slope, intercept).
+
+    Closed form from the four sums, each a single NumPy reduction.
+    """
+    import numpy as np
+
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    n = len(x)
     if n < 2:
-        return 0.0, (ys[0] if ys else 0.0)
-    x_mean = sum(xs) / n
-    y_mean = sum(ys) / n
-    ss_xy = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
-    ss_xx = sum((x - x_mean) ** 2 for x in xs)
-    if ss_xx == 0:
-        return 0.0, y_mean
-    slope = ss_xy / ss_xx
-    intercept = y_mean - slope * x_mean
-    return slope, intercept
+        return 0.0, (float(y[0]) if n else 0.0)
+    sx = x.sum()
+    sy = y.sum()
+    denom = n * np.dot(x, x) - sx * sx
+    if denom == 0:
+        return 0.0, float(sy / n)
+    slope = (n * np.dot(x, y) - sx * sy) / denom
+    intercept = (sy - slope * sx) / n
+    return float(slope), float(intercept)
+
+
+def _top_buckets(totals: list[int], k: int) -> list[int]:
+    """Indexes of the *k* largest non-zero buckets, largest first.
+
+    heapq.nlargest keeps a k-sized heap, so this stays O(n log k) however
+    many buckets there are (e.g. 168 hour-of-week ones); ties keep the lower
+    index first.
+    """
+    return heapq.nlargest(
+        k, (i for i, total in enumerate(totals) if total), key=totals.__getitem__,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Recommendations — (predicate, template) pairs checked in order. Templates
+# are fixed at import; only the peak-hours one has a placeholder to fill.
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True, frozen=True)
+class _RecContext:
+    """The forecast figures the recommendation predicates look at."""
+
+    trend: str
+    avg_daily: float
+    avg_input: float
+    avg_output: float
+    weekly_cap: int
+    peak_hours: tuple[int, ...]
+
+
+_RECOMMENDATIONS: tuple[tuple[Callable[[_RecContext], bool], str], ...] = (
+    (
+        lambda c: c.trend == "accelerating",
+        "Usage is increasing — consider batching prompts to reduce token waste.",
+    ),
+    (
+        lambda c: c.avg_daily > c.weekly_cap * _WEEKLY_WARN,
+        "You're using >80% of estimated weekly capacity. Space out heavy sessions.",
+    ),
+    (
+        lambda c: len(c.peak_hours) >= 2,
+        "Peak hours (UTC): {hours}. Spread work to avoid session-limit spikes.",
+    ),
+    (
+        lambda c: c.avg_output > c.avg_input * _OUTPUT_HEAVY_RATIO,
+        "Output tokens are 2x+ input — consider shorter system prompts to reduce output verbosity.",
+    ),
+)
+_HEALTHY_REC = "Usage looks healthy. Keep it up!"
+
+
+def _recommendations(ctx: _RecContext) -> tuple[str, ...]:
+    """Messages whose predicate holds for *ctx*, or the all-clear message."""
+    recs = [template for applies, template in _RECOMMENDATIONS if applies(ctx)]
+    if not recs:
+        return (_HEALTHY_REC,)
+    hours = ", ".join(f"{h}:00" for h in ctx.peak_hours)
+    return tuple(template.format(hours=hours) for template in recs)
+
+
+def _hour_totals(sessions: list[SessionData]) -> list[int]:
+    """Tokens per hour of day (UTC), indexed 0-23.
+
+    Timestamps are UTC ISO-8601 ("2025-01-15T10:23:45.123Z"), so the hour is
+    always ts[11:13]. The hot loop buckets by that two-char slice into a dict
+    pre-seeded with the 24 valid keys, so no int() runs per query and slices
+    that are not an hour fall out as a KeyError.
+    """
+    by_hour = dict.fromkeys(_HOUR_KEYS, 0)
+    for session in sessions:
+        for q in session.queries:
+            ts = q.assistant_timestamp
+            if ts:
+                try:
+                    by_hour[ts[11:13]] += q.total_tokens
+                except KeyError:
+                    continue
+    return list(by_hour.values())
+
+
+# ---------------------------------------------------------------------------
+# Forecast cache — re-parsing every session file is the expensive part, so a
+# forecast is reused until the session files change on disk. It is kept in
+# memory and in a JSON file, so other processes (CLI, dashboard) reuse it too.
+# ---------------------------------------------------------------------------
+
+FORECAST_CACHE_PATH = Path(__file__).parent.parent.parent / "data" / "forecast.json"
+
+_forecast_cache: tuple[tuple[Any, ...], Forecast] | None = None
+_forecast_lock = threading.Lock()
+
+
+def _sessions_fingerprint() -> tuple[int, int, int]:
+    """(file count, total bytes, newest mtime_ns) of the session JSONL files.
+
+    Stat calls only — no file is opened.
+    """
+    count = size = newest = 0
+    try:
+        project_dirs = [
+            e for e in os.scandir(_claude_dir() / "projects") if e.is_dir()
+        ]
+    except OSError:
+        return 0, 0, 0
+    for proj in project_dirs:
+        try:
+            entries = list(os.scandir(proj.path))
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.name.endswith(".jsonl"):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            count += 1
+            size += st.st_size
+            newest = max(newest, st.st_mtime_ns)
+    return count, size, newest
+
+
+def clear_forecast_cache() -> None:
+    """Drop the in-memory forecast so the next call re-checks the disk cache."""
+    global _forecast_cache
+    with _forecast_lock:
+        _forecast_cache = None
+
+
+def _read_disk_forecast(key: tuple[Any, ...]) -> Forecast | None:
+    """Return the persisted forecast if it was computed for *key*."""
+    try:
+        cached = json.loads(FORECAST_CACHE_PATH.read_bytes())
+        if tuple(cached["key"]) == key:
+            data = cached["forecast"]
+            # JSON has no tuples: restore the immutable sequence fields
+            data["peak_hours"] = tuple(data["peak_hours"])
+            data["recommendations"] = tuple(data["recommendations"])
+            return Forecast(**data)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_disk_forecast(key: tuple[Any, ...], forecast: Forecast) -> None:
+    tmp = FORECAST_CACHE_PATH.with_name(FORECAST_CACHE_PATH.name + ".tmp")
+    try:
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"key": key, "forecast": forecast_to_dict(forecast)}
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp, FORECAST_CACHE_PATH)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not write forecast cache %s: %s", FORECAST_CACHE_PATH, e)
+        tmp.unlink(missing_ok=True)
 
 
 def compute_forecast(
     session_cap: int = 15_000_000,
     weekly_cap: int = 150_000_000,
 ) -> Forecast:
-    """Analyse session data and produce a usage forecast."""
+    """Analyse session data and produce a usage forecast.
+
+    Cached (in memory and in ``FORECAST_CACHE_PATH``) until the session
+    files change; concurrent callers wait for one parse instead of each
+    running their own.
+    """
+    global _forecast_cache
+    with _forecast_lock:
+        key = (*_sessions_fingerprint(), session_cap, weekly_cap)
+        if _forecast_cache is not None and _forecast_cache[0] == key:
+            return _forecast_cache[1]
+        forecast = _read_disk_forecast(key)
+        if forecast is None:
+            forecast = _compute_forecast(session_cap, weekly_cap)
+            _write_disk_forecast(key, forecast)
+        _forecast_cache = (key, forecast)
+        return forecast
+
+
+def _compute_forecast(session_cap: int, weekly_cap: int) -> Forecast:
+    import numpy as np  # deferred: only a real (uncached) forecast needs it
+
     report = parse_all_sessions()
     daily_usage = report.daily_usage  # list of DailyUsage dataclass
 
     if not daily_usage or len(daily_usage) < 2:
-        return Forecast(
-            avg_daily_tokens=0,
-            avg_daily_input=0,
-            avg_daily_output=0,
-            trend="insufficient_data",
-            trend_slope=0,
-            projected_7d_tokens=0,
-            projected_30d_tokens=0,
-            session_limit_days_remaining=None,
-            weekly_limit_days_remaining=None,
-            peak_hours=[],
-            recommendations=["Not enough usage data yet. Use the system for a few days."],
-        )
-
-    # Build daily points
-    points: list[TrendPoint] = []
-    for du in daily_usage:
-        points.append(TrendPoint(
-            date=du.date,
-            tokens=du.total_tokens,
-            input_tokens=du.input_tokens,
-            output_tokens=du.output_tokens,
-        ))
-
-    # Sort by date
-    points.sort(key=lambda p: p.date)
-
-    # Last 14 days for trend analysis
-    recent = points[-14:]
-    xs = list(range(len(recent)))
-    ys = [float(p.tokens) for p in recent]
-
-    slope, intercept = _linear_regression(xs, ys)
+        return _NO_DATA_FORECAST
 
-    # Classify trend
-    avg_daily = sum(ys) / len(ys) if ys else 0
+    # Last 14 days for trend analysis: one (days, 3) array of total / input /
+    # output tokens, filled in a single pass and averaged in one reduction.
+    # parse_all_sessions already returns daily_usage in date order.
+    recent = daily_usage[-14:]
+    usage = np.array(
+        [(du.total_tokens, du.input_tokens, du.output_tokens) for du in recent],
+        dtype=np.int64,
+    )
+    avg_daily, avg_input, avg_output = (float(v) for v in usage.mean(axis=0))
     if avg_daily == 0:
-        trend = "insufficient_data"
-    elif abs(slope) < avg_daily * 0.05:
+        # Sessions logged but no tokens counted: nothing to fit a trend to
+        return _NO_DATA_FORECAST
+
+    slope, intercept = _linear_regression(np.arange(len(recent), dtype=np.float64), usage[:, 0])
+
+    # Classify trend
+    if abs(slope) < avg_daily * _STEADY_BAND:
         trend = "steady"
     elif slope > 0:
         trend = "accelerating"
     else:
         trend = "decelerating"
 
-    avg_input = sum(p.input_tokens for p in recent) / len(recent) if recent else 0
-    avg_output = sum(p.output_tokens for p in recent) / len(recent) if recent else 0
-
-    # Projections
-    proj_7d = int(avg_daily * 7 + slope * 7 * 3.5)  # linear extrapolation
-    proj_30d = int(avg_daily * 30 + slope * 30 * 15)
+    # Projections — linear extrapolation: n days at the average, plus the
+    # slope over the window's midpoint (n * (avg + slope * n / 2))
+    proj_7d = int(_DAYS_PER_WEEK * (avg_daily + slope * (_DAYS_PER_WEEK / 2)))
+    proj_30d = int(_DAYS_PER_MONTH * (avg_daily + slope * (_DAYS_PER_MONTH / 2)))
 
     # Estimate days until limits
     session_days = None
@@ -131,59 +323,36 @@ def compute_forecast(
     if avg_daily > 0:
         # Weekly cap: how many days at current rate until weekly_cap
         weekly_days = max(0, round(weekly_cap / avg_daily, 1))
-        # Session cap per 5hr window: assume ~3 sessions/day
-        session_days = max(0, round(session_cap / (avg_daily / 3), 1)) if avg_daily > 0 else None
+        # Session cap per 5hr window
+        session_days = max(0, round(session_cap * _SESSIONS_PER_DAY / avg_daily, 1))
 
     # Peak hours analysis
-    hour_totals: dict[int, int] = defaultdict(int)
-    for q in report.queries:
-        try:
-            ts = datetime.fromisoformat(q.timestamp.replace("Z", "+00:00"))
-            hour_totals[ts.hour] += q.input_tokens + q.output_tokens
-        except Exception:
-            continue
-    peak_hours = sorted(hour_totals, key=hour_totals.get, reverse=True)[:3]  # type: ignore[arg-type]
-
-    # Recommendations
-    recs: list[str] = []
-    if trend == "accelerating":
-        recs.append("Usage is increasing — consider batching prompts to reduce token waste.")
-    if avg_daily > weekly_cap / 7 * 0.8:
-        recs.append("You're using >80% of estimated weekly capacity. Space out heavy sessions.")
-    if peak_hours and len(peak_hours) >= 2:
-        recs.append(f"Peak hours (UTC): {', '.join(f'{h}:00' for h in peak_hours)}. Spread work to avoid session-limit spikes.")
-    if avg_output > avg_input * 2:
-        recs.append("Output tokens are 2x+ input — consider shorter system prompts to reduce output verbosity.")
-    if not recs:
-        recs.append("Usage looks healthy. Keep it up!")
+    peak_hours = tuple(_top_buckets(_hour_totals(report.sessions), _PEAK_HOURS))
+
+    recs = _recommendations(
+        _RecContext(trend, avg_daily, avg_input, avg_output, weekly_cap, peak_hours)
+    )
 
+    # Positional, in field order — skips building a kwargs dict per call
     return Forecast(
-        avg_daily_tokens=round(avg_daily),
-        avg_daily_input=round(avg_input),
-        avg_daily_output=round(avg_output),
-        trend=trend,
-        trend_slope=round(slope, 1),
-        projected_7d_tokens=max(0, proj_7d),
-        projected_30d_tokens=max(0, proj_30d),
-        session_limit_days_remaining=session_days,
-        weekly_limit_days_remaining=weekly_days,
-        peak_hours=peak_hours,
-        recommendations=recs,
+        round(avg_daily),
+        round(avg_input),
+        round(avg_output),
+        trend,
+        round(slope, 1),
+        max(0, proj_7d),
+        max(0, proj_30d),
+        session_days,
+        weekly_days,
+        peak_hours,
+        recs,
     )
 
 
+_FORECAST_FIELDS = tuple(f.name for f in fields(Forecast))
+_forecast_values = attrgetter(*_FORECAST_FIELDS)
+
+
 def forecast_to_dict(f: Forecast) -> dict[str, Any]:
-    """Serialize a Forecast to a JSON-safe dict."""
-    return {
-        "avg_daily_tokens": f.avg_daily_tokens,
-        "avg_daily_input": f.avg_daily_input,
-        "avg_daily_output": f.avg_daily_output,
-        "trend": f.trend,
-        "trend_slope": f.trend_slope,
-        "projected_7d_tokens": f.projected_7d_tokens,
-        "projected_30d_tokens": f.projected_30d_tokens,
-        "session_limit_days_remaining": f.session_limit_days_remaining,
-        "weekly_limit_days_remaining": f.weekly_limit_days_remaining,
-        "peak_hours": f.peak_hours,
-        "recommendations": f.recommendations,
-    }
+    """Serialize a Forecast to a JSON-safe dict (one key per field)."""
+    return dict(zip(_FORECAST_FIELDS, _forecast_values(f)))
@@ -7,14 +7,33 @@ actual token usage data — no estimation or guessing.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import multiprocessing
 import os
-from dataclasses import dataclass, field
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+
+try:
+    from ciso8601 import parse_datetime as _parse_ts
+except ImportError:  # pragma: no cover - optional speedup
+
+    def _parse_ts(ts: str) -> datetime:
+        """Parse an ISO-8601 timestamp (``Z`` suffix allowed) to a datetime."""
+        return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,9 +42,12 @@ def _claude_dir() -> Path:
     return Path.home() / ".claude"
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryRecord:
-    """A single assistant response with token usage."""
+    """A single assistant response with token usage.
+
+    Slotted: a report holds one per assistant response across all history.
+    """
 
     user_prompt: str | None
     user_timestamp: str | None
@@ -105,7 +127,7 @@ class UsageReport:
     """Complete parsed usage report."""
 
     sessions: list[SessionData] = field(default_factory=list)
-    daily_usage: list[DailyUsage] = field(default_factory=list)
+    daily_usage: list[DailyUsage] = field(default_factory=list)  # sorted by date
     model_breakdown: list[ModelBreakdown] = field(default_factory=list)
     top_prompts: list[TopPrompt] = field(default_factory=list)
     totals: dict[str, Any] = field(default_factory=dict)
@@ -123,74 +145,242 @@ def _fmt(n: int) -> str:
     return f"{n:,}"
 
 
-def _parse_jsonl_file(file_path: Path) -> list[dict[str, Any]]:
-    """Parse a JSONL file, skipping malformed lines."""
-    entries: list[dict[str, Any]] = []
+def _iter_jsonl_files(
+    directory: str | Path, *, recursive: bool = False,
+) -> Iterator[os.DirEntry[str]]:
+    """Yield the ``*.jsonl`` files in *directory* (and below, if *recursive*).
+
+    Uses ``os.scandir``: the file/dir checks come from the directory listing,
+    with no ``Path`` built or extra stat per entry. Unreadable directories are
+    skipped.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.endswith(".jsonl") and entry.is_file():
+            yield entry
+        elif recursive and entry.is_dir(follow_symlinks=False):
+            yield from _iter_jsonl_files(entry.path, recursive=True)
+
+
+def _iter_jsonl_entries(file_path: str | Path) -> Iterator[Any]:
+    """Yield parsed entries of a JSONL file one line at a time.
+
+    Malformed lines are skipped; an unreadable file yields nothing. Lines are
+    decoded straight from bytes (with orjson when it is installed), so nothing
+    but the current entry is held.
+    """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
+        with open(file_path, "rb") as f:
             for line in f:
-                line = line.strip()
-                if not line:
+                if not line.strip():
                     continue
                 try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
+                    yield _loads(line)
+                except ValueError:  # JSONDecodeError, or bytes that aren't UTF-8
                     pass
     except OSError as e:
         logger.debug("Could not read %s: %s", file_path, e)
-    return entries
 
 
-def _extract_session_data(entries: list[dict[str, Any]]) -> list[QueryRecord]:
+def _parse_jsonl_file(file_path: Path) -> list[dict[str, Any]]:
+    """Parse a JSONL file, skipping malformed lines."""
+    return list(_iter_jsonl_entries(file_path))
+
+
+def _extract_session_data(entries: Iterable[dict[str, Any]]) -> list[QueryRecord]:
     """Extract query records from JSONL entries."""
+    return _scan_session(entries)[0]
+
+
+def _scan_session(
+    entries: Iterable[dict[str, Any]],
+) -> tuple[list[QueryRecord], Any]:
+    """Single pass over a session's entries.
+
+    Returns the query records and the first non-empty ``timestamp`` value, so
+    a streamed file never has to be held in memory or read twice.
+    """
     queries: list[QueryRecord] = []
-    pending_user_message: dict[str, Any] | None = None
+    add_query = queries.append
+    pending_prompt: str | None = None
+    pending_timestamp: Any = None
+    first_timestamp: Any = None
 
+    # One lookup per key: entries are rejected on "type" before "message" is
+    # touched, and the message/usage dicts are bound once per entry.
     for entry in entries:
+        timestamp = entry.get("timestamp")
+        if first_timestamp is None and timestamp:
+            first_timestamp = timestamp
+
+        kind = entry.get("type")
+
         # Track user messages
-        if entry.get("type") == "user" and entry.get("message", {}).get("role") == "user":
-            content = entry.get("message", {}).get("content", "")
-            if entry.get("isMeta"):
+        if kind == "user":
+            message = entry.get("message")
+            if not message or message.get("role") != "user" or entry.get("isMeta"):
                 continue
-            if isinstance(content, str) and (
-                content.startswith("<local-command")
-                or content.startswith("<command-")
-            ):
-                continue
-
-            text = content if isinstance(content, str) else json.dumps(content)
-            pending_user_message = {
-                "text": text,
-                "timestamp": entry.get("timestamp"),
-            }
+            content = message.get("content", "")
+            if isinstance(content, str):
+                if content.startswith(("<local-command", "<command-")):
+                    continue
+                pending_prompt = content
+            else:
+                pending_prompt = json.dumps(content)
+            pending_timestamp = timestamp
 
         # Track assistant responses with usage data
-        if entry.get("type") == "assistant" and entry.get("message", {}).get("usage"):
-            usage = entry["message"]["usage"]
-            model = entry["message"].get("model", "unknown")
+        elif kind == "assistant":
+            message = entry.get("message")
+            usage = message.get("usage") if message else None
+            if not usage:
+                continue
+            model = message.get("model", "unknown")
             if model == "<synthetic>":
                 continue
 
             input_tokens = (
-                (usage.get("input_tokens", 0) or 0)
-                + (usage.get("cache_creation_input_tokens", 0) or 0)
-                + (usage.get("cache_read_input_tokens", 0) or 0)
-            )
-            output_tokens = usage.get("output_tokens", 0) or 0
-
-            queries.append(
-                QueryRecord(
-                    user_prompt=pending_user_message["text"] if pending_user_message else None,
-                    user_timestamp=pending_user_message["timestamp"] if pending_user_message else None,
-                    assistant_timestamp=entry.get("timestamp"),
-                    model=model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    total_tokens=input_tokens + output_tokens,
-                )
+                (usage.get("input_tokens") or 0)
+                + (usage.get("cache_creation_input_tokens") or 0)
+                + (usage.get("cache_read_input_tokens") or 0)
             )
+            output_tokens = usage.get("output_tokens") or 0
+
+            # Positional, in field order: no kwargs dict per query
+            add_query(QueryRecord(
+                pending_prompt,         # user_prompt
+                pending_timestamp,      # user_timestamp
+                timestamp,              # assistant_timestamp
+                model,
+                input_tokens,
+                output_tokens,
+                input_tokens + output_tokens,  # total_tokens
+            ))
+
+    return queries, first_timestamp
+
+
+# Below this many files, process start-up costs more than parsing in-process.
+_PARALLEL_MIN_FILES = 32
+
+# Callers run inside threaded servers (threadpool routes, bot and batcher
+# threads); forking there can deadlock a child on a lock another thread held,
+# so workers come from a forkserver (spawn where that is unavailable).
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _scan_session_file(path: Path) -> tuple[list[QueryRecord], Any]:
+    """Queries + first timestamp of one session file (process-pool worker)."""
+    return _scan_session(_iter_jsonl_entries(path))
+
+
+def _scan_session_files(paths: list[Path]) -> list[tuple[list[QueryRecord], Any]]:
+    """Scan session files, in order, fanning out to a process pool when large.
+
+    JSON decoding is CPU-bound, so threads would serialise on the GIL; each
+    file is independent until the caller aggregates the results.
+    """
+    workers = min(os.cpu_count() or 1, len(paths))
+    if len(paths) < _PARALLEL_MIN_FILES or workers < 2:
+        return [_scan_session_file(p) for p in paths]
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_POOL_CONTEXT) as pool:
+            return list(pool.map(_scan_session_file, paths, chunksize=8))
+    except (OSError, BrokenProcessPool) as e:
+        logger.debug("Process pool unavailable (%s); parsing in-process", e)
+        return [_scan_session_file(p) for p in paths]
+
+
+# ---------------------------------------------------------------------------
+# Per-file scan cache — finished sessions never change, so each file's scan is
+# kept on disk keyed by (path, mtime, size) and only new or modified files are
+# decoded again. The newest file is the live session and is never cached.
+# ---------------------------------------------------------------------------
+
+SCAN_CACHE_DIRNAME = "athena_cache"
 
-    return queries
+_QUERY_FIELDS = tuple(f.name for f in fields(QueryRecord))
+_query_values = attrgetter(*_QUERY_FIELDS)
+
+
+def _scan_cache_name(path: Path, st: os.stat_result) -> str:
+    key = f"{path}|{st.st_mtime_ns}|{st.st_size}".encode()
+    return hashlib.blake2b(key, digest_size=8).hexdigest() + ".json"
+
+
+def _read_scan_cache(cache_file: Path) -> tuple[list[QueryRecord], Any] | None:
+    try:
+        rows, first_timestamp = _loads(cache_file.read_bytes())
+        return [QueryRecord(*row) for row in rows], first_timestamp
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_scan_cache(cache_file: Path, scan: tuple[list[QueryRecord], Any]) -> None:
+    queries, first_timestamp = scan
+    tmp = cache_file.with_name(cache_file.name + ".tmp")
+    try:
+        payload = [[_query_values(q) for q in queries], first_timestamp]
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp, cache_file)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not write scan cache %s: %s", cache_file, e)
+        tmp.unlink(missing_ok=True)
+
+
+def _scan_session_files_cached(
+    paths: list[Path], cache_dir: Path,
+) -> list[tuple[list[QueryRecord], Any]]:
+    """Like :func:`_scan_session_files`, reusing scans cached in *cache_dir*.
+
+    Cache entries for files that no longer exist (or have since changed) are
+    pruned, so the directory only ever holds one entry per session file.
+    """
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.debug("Scan cache unavailable (%s)", e)
+        return _scan_session_files(paths)
+
+    names: list[str | None] = []
+    newest = -1
+    newest_mtime = -1
+    for i, path in enumerate(paths):
+        try:
+            st = path.stat()
+        except OSError:
+            names.append(None)
+            continue
+        names.append(_scan_cache_name(path, st))
+        if st.st_mtime_ns > newest_mtime:
+            newest, newest_mtime = i, st.st_mtime_ns
+
+    results: list[tuple[list[QueryRecord], Any] | None] = [
+        _read_scan_cache(cache_dir / name) if name and i != newest else None
+        for i, name in enumerate(names)
+    ]
+    misses = [i for i, scan in enumerate(results) if scan is None]
+    for i, scan in zip(misses, _scan_session_files([paths[i] for i in misses])):
+        results[i] = scan
+        name = names[i]
+        if name and i != newest:
+            _write_scan_cache(cache_dir / name, scan)
+
+    live = set(names)
+    try:
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith(".json") and entry.name not in live:
+                os.unlink(entry.path)
+    except OSError:
+        pass
+
+    return results  # type: ignore[return-value]
 
 
 def parse_all_sessions(claude_dir: Path | None = None) -> UsageReport:
@@ -208,7 +398,7 @@ def parse_all_sessions(claude_dir: Path | None = None) -> UsageReport:
 
     # Read history.jsonl for session display text
     history_path = claude_dir / "history.jsonl"
-    history_entries = _parse_jsonl_file(history_path) if history_path.exists() else []
+    history_entries = _iter_jsonl_entries(history_path) if history_path.exists() else ()
 
     # Build session_id -> first meaningful prompt map
     session_first_prompt: dict[str, str] = {}
@@ -227,123 +417,120 @@ def parse_all_sessions(claude_dir: Path | None = None) -> UsageReport:
 
     # Iterate all project directories
     try:
-        project_dirs = [
-            d for d in projects_dir.iterdir()
-            if d.is_dir()
-        ]
+        with os.scandir(projects_dir) as it:
+            project_dirs = [e for e in it if e.is_dir()]
     except OSError:
         return UsageReport()
 
-    for proj_dir in project_dirs:
-        jsonl_files = list(proj_dir.glob("*.jsonl"))
-
-        for jsonl_file in jsonl_files:
-            session_id = jsonl_file.stem
-            entries = _parse_jsonl_file(jsonl_file)
-            if not entries:
-                continue
-
-            queries = _extract_session_data(entries)
-            if not queries:
-                continue
+    session_files = [
+        (proj_dir.name, Path(jsonl_file.path))
+        for proj_dir in project_dirs
+        for jsonl_file in _iter_jsonl_files(proj_dir.path)
+    ]
+    parsed = _scan_session_files_cached(
+        [path for _, path in session_files], claude_dir / SCAN_CACHE_DIRNAME,
+    )
 
-            input_tokens = sum(q.input_tokens for q in queries)
-            output_tokens = sum(q.output_tokens for q in queries)
-            total_tokens = input_tokens + output_tokens
+    for (project, jsonl_file), (queries, first_timestamp) in zip(session_files, parsed):
+        session_id = jsonl_file.stem
+        if not queries:
+            continue
+
+        # One pass over the queries for the session totals, per-model stats
+        # and per-prompt spans; nothing below walks the query list again.
+        input_tokens = 0
+        output_tokens = 0
+        model_stats: dict[str, list[int]] = {}  # model -> [queries, input, output]
+        spans: list[list[Any]] = []  # [prompt, input, output] per distinct prompt run
+        span: list[Any] | None = None
+        for q in queries:
+            q_in = q.input_tokens
+            q_out = q.output_tokens
+            input_tokens += q_in
+            output_tokens += q_out
+            stats = model_stats.get(q.model)
+            if stats is None:
+                stats = model_stats[q.model] = [0, 0, 0]
+            stats[0] += 1
+            stats[1] += q_in
+            stats[2] += q_out
+            prompt = q.user_prompt
+            if prompt and (span is None or prompt != span[0]):
+                span = [prompt, 0, 0]
+                spans.append(span)
+            if span is not None:
+                span[1] += q_in
+                span[2] += q_out
+        total_tokens = input_tokens + output_tokens
+
+        if first_timestamp and isinstance(first_timestamp, str):
+            date = first_timestamp.split("T")[0]
+        else:
+            date = "unknown"
 
-            # Find first timestamp
-            first_timestamp = next(
-                (e.get("timestamp") for e in entries if e.get("timestamp")),
-                None,
-            )
-            if first_timestamp and isinstance(first_timestamp, str):
-                date = first_timestamp.split("T")[0]
-            else:
-                date = "unknown"
-
-            # Primary model (most used)
-            model_counts: dict[str, int] = {}
-            for q in queries:
-                model_counts[q.model] = model_counts.get(q.model, 0) + 1
-            primary_model = (
-                max(model_counts, key=model_counts.get) if model_counts else "unknown"  # type: ignore[arg-type]
-            )
+        # Primary model (most used)
+        primary_model = max(model_stats, key=lambda m: model_stats[m][0])
 
-            # First prompt
-            first_prompt = (
-                session_first_prompt.get(session_id)
-                or next((q.user_prompt for q in queries if q.user_prompt), None)
-                or "(no prompt)"
-            )
+        # First prompt
+        first_prompt = (
+            session_first_prompt.get(session_id)
+            or (spans[0][0] if spans else None)
+            or "(no prompt)"
+        )
 
-            # Collect per-prompt data for "most expensive prompts"
-            current_prompt: str | None = None
-            prompt_input = 0
-            prompt_output = 0
-
-            def flush_prompt() -> None:
-                nonlocal current_prompt, prompt_input, prompt_output
-                if current_prompt and (prompt_input + prompt_output) > 0:
-                    all_prompts.append(
-                        TopPrompt(
-                            prompt=current_prompt[:300],
-                            input_tokens=prompt_input,
-                            output_tokens=prompt_output,
-                            total_tokens=prompt_input + prompt_output,
-                            date=date,
-                            session_id=session_id,
-                            model=primary_model,
-                        )
+        # Collect per-prompt data for "most expensive prompts"
+        for prompt, prompt_input, prompt_output in spans:
+            if prompt_input + prompt_output > 0:
+                all_prompts.append(
+                    TopPrompt(
+                        prompt=prompt[:300],
+                        input_tokens=prompt_input,
+                        output_tokens=prompt_output,
+                        total_tokens=prompt_input + prompt_output,
+                        date=date,
+                        session_id=session_id,
+                        model=primary_model,
                     )
-
-            for q in queries:
-                if q.user_prompt and q.user_prompt != current_prompt:
-                    flush_prompt()
-                    current_prompt = q.user_prompt
-                    prompt_input = 0
-                    prompt_output = 0
-                prompt_input += q.input_tokens
-                prompt_output += q.output_tokens
-            flush_prompt()
-
-            sessions.append(
-                SessionData(
-                    session_id=session_id,
-                    project=proj_dir.name,
-                    date=date,
-                    timestamp=first_timestamp if isinstance(first_timestamp, str) else None,
-                    first_prompt=first_prompt[:200],
-                    model=primary_model,
-                    query_count=len(queries),
-                    queries=queries,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    total_tokens=total_tokens,
                 )
+
+        sessions.append(
+            SessionData(
+                session_id=session_id,
+                project=project,
+                date=date,
+                timestamp=first_timestamp if isinstance(first_timestamp, str) else None,
+                first_prompt=first_prompt[:200],
+                model=primary_model,
+                query_count=len(queries),
+                queries=queries,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=total_tokens,
             )
+        )
 
-            # Daily aggregation
-            if date != "unknown":
-                if date not in daily_map:
-                    daily_map[date] = DailyUsage(date=date)
-                day = daily_map[date]
-                day.input_tokens += input_tokens
-                day.output_tokens += output_tokens
-                day.total_tokens += total_tokens
-                day.sessions += 1
-                day.queries += len(queries)
-
-            # Model aggregation
-            for q in queries:
-                if q.model in ("<synthetic>", "unknown"):
-                    continue
-                if q.model not in model_map:
-                    model_map[q.model] = ModelBreakdown(model=q.model)
-                mb = model_map[q.model]
-                mb.input_tokens += q.input_tokens
-                mb.output_tokens += q.output_tokens
-                mb.total_tokens += q.total_tokens
-                mb.query_count += 1
+        # Daily aggregation
+        if date != "unknown":
+            if date not in daily_map:
+                daily_map[date] = DailyUsage(date=date)
+            day = daily_map[date]
+            day.input_tokens += input_tokens
+            day.output_tokens += output_tokens
+            day.total_tokens += total_tokens
+            day.sessions += 1
+            day.queries += len(queries)
+
+        # Model aggregation
+        for model, (count, model_input, model_output) in model_stats.items():
+            if model in ("<synthetic>", "unknown"):
+                continue
+            if model not in model_map:
+                model_map[model] = ModelBreakdown(model=model)
+            mb = model_map[model]
+            mb.input_tokens += model_input
+            mb.output_tokens += model_output
+            mb.total_tokens += model_input + model_output
+            mb.query_count += count
 
     # Sort sessions by total tokens descending
     sessions.sort(key=lambda s: s.total_tokens, reverse=True)
@@ -505,9 +692,8 @@ def _generate_insights(
             if not s.timestamp:
                 continue
             try:
-                dt = datetime.fromisoformat(s.timestamp.replace("Z", "+00:00"))
-                day = dt.weekday()
-            except (ValueError, AttributeError):
+                day = _parse_ts(s.timestamp).weekday()
+            except (ValueError, TypeError, AttributeError):
                 continue
             if day not in day_map:
                 day_map[day] = {"tokens": 0, "sessions": 0}
@@ -716,6 +902,10 @@ def compute_rate_limits(
 
     session_cutoff = now - timedelta(hours=session_window_hours)
     weekly_cutoff = now - timedelta(days=weekly_window_days)
+    # Entries dated before this day can't be in either window, whatever their
+    # UTC offset (a day of margin covers ±14h), so they're dropped on a string
+    # compare of the date prefix without parsing the timestamp.
+    oldest_day = (weekly_cutoff - timedelta(days=1)).date().isoformat()
 
     session_tokens = 0
     session_queries = 0
@@ -726,52 +916,41 @@ def compute_rate_limits(
     weekly_oldest_ts: datetime | None = None
 
     if projects_dir.exists():
-        try:
-            jsonl_files = list(projects_dir.rglob("*.jsonl"))
-        except OSError:
-            jsonl_files = []
+        weekly_cutoff_ts = weekly_cutoff.timestamp()
 
-        for jsonl_file in jsonl_files:
+        for jsonl_file in _iter_jsonl_files(projects_dir, recursive=True):
             # Quick stat check — skip files not modified in the weekly window
             try:
-                mtime = jsonl_file.stat().st_mtime
-                file_dt = datetime.fromtimestamp(mtime, tz=timezone.utc)
-                if file_dt < weekly_cutoff:
+                if jsonl_file.stat().st_mtime < weekly_cutoff_ts:
                     continue
             except OSError:
                 continue
 
-            for line in _iter_file_lines(jsonl_file):
-                try:
-                    entry = json.loads(line)
-                except (json.JSONDecodeError, ValueError):
-                    continue
-
+            for entry in _iter_jsonl_entries(jsonl_file.path):
                 if entry.get("type") != "assistant":
                     continue
 
-                usage = entry.get("message", {}).get("usage")
-                if not usage:
+                message = entry.get("message")
+                if not message:
                     continue
-
-                model = entry.get("message", {}).get("model", "")
-                if model == "<synthetic>":
+                usage = message.get("usage")
+                if not usage or message.get("model") == "<synthetic>":
                     continue
 
                 ts_str = entry.get("timestamp")
-                if not ts_str:
+                if not isinstance(ts_str, str) or ts_str[:10] < oldest_day:
                     continue
 
                 try:
-                    ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                except (ValueError, AttributeError):
+                    ts = _parse_ts(ts_str)
+                except (ValueError, TypeError, AttributeError):
                     continue
 
                 tokens = (
-                    (usage.get("input_tokens", 0) or 0)
-                    + (usage.get("cache_creation_input_tokens", 0) or 0)
-                    + (usage.get("cache_read_input_tokens", 0) or 0)
-                    + (usage.get("output_tokens", 0) or 0)
+                    (usage.get("input_tokens") or 0)
+                    + (usage.get("cache_creation_input_tokens") or 0)
+                    + (usage.get("cache_read_input_tokens") or 0)
+                    + (usage.get("output_tokens") or 0)
                 )
 
                 # Weekly window
@@ -894,14 +1073,3 @@ def _read_subscription_type(claude_dir: Path) -> str:
     except (OSError, json.JSONDecodeError):
         return "unknown"
 
-
-def _iter_file_lines(path: Path):
-    """Yield non-empty lines from a file, silently handling errors."""
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    yield line
-    except OSError:
-        return
@@ -28,9 +28,9 @@ from src.token_tracker.session_parser import (
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class UsageRecord:
-    """Single CLI call usage snapshot."""
+    """Single CLI call usage snapshot (slotted: one is kept per call)."""
 
     agent_id: str
     model: str
@@ -44,6 +44,8 @@ class UsageRecord:
 class ClaudeResponse:
     """Mimics the shape of an Anthropic API response for compatibility."""
 
+    __slots__ = ("text", "content", "input_chars", "output_chars")
+
     def __init__(self, text: str, input_chars: int) -> None:
         self.text = text
         self.content = [_TextBlock(text)]
@@ -52,6 +54,8 @@ class ClaudeResponse:
 
 
 class _TextBlock:
+    __slots__ = ("type", "text")
+
     def __init__(self, text: str) -> None:
         self.type = "text"
         self.text = text
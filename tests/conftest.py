@@ -10,6 +10,18 @@ from src.token_tracker.tracker import TokenTracker, UsageRecord, ClaudeResponse
 from src.token_tracker.session_parser import UsageReport
 
 
+@pytest.fixture(autouse=True)
+def _isolated_claude_dir(tmp_path, monkeypatch):
+    """Point the default ~/.claude at a temp dir so parses never touch (or
+    write the scan cache into) the developer's real one."""
+    from src.token_tracker import predictive, session_parser
+
+    claude_dir = tmp_path / ".claude-home"
+    monkeypatch.setattr(session_parser, "_claude_dir", lambda: claude_dir)
+    monkeypatch.setattr(predictive, "_claude_dir", lambda: claude_dir)
+    return claude_dir
+
+
 @pytest.fixture
 def mock_claude_cli():
     """Patch subprocess.run to avoid calling real Claude CLI."""
@@ -105,6 +105,14 @@ class TestRunnerEndpoints:
         assert data["online"] is False
         assert "last_seen" in data
 
+    def test_runner_reconnect_wakes_poller(self, client_with_runner):
+        """Reconnect should wake the poller and return its current state."""
+        resp = client_with_runner.post("/api/runner/reconnect")
+        assert resp.status_code == 200
+        assert resp.json()["online"] is False
+        poller = client_with_runner.app.state.runner_poller
+        assert poller._wake.is_set()
+
     def test_runner_cmd_returns_503_when_offline(self, client_with_runner):
         """Command execution should return 503 when runner is offline."""
         resp = client_with_runner.post("/api/runner/cmd", json={
@@ -125,3 +133,24 @@ class TestRunnerEndpoints:
         data = resp.json()
         assert data["status"] == "offline"
         assert data["project_id"] == "test-project"
+
+
+class TestProjectsRoute:
+    def test_list_projects_json(self, client, tmp_path):
+        from unittest.mock import MagicMock
+
+        from src.projects.registry import ProjectRegistry
+
+        yml = tmp_path / "projects.yaml"
+        yml.write_text("projects:\n- id: alpha\n  group: internal\n")
+        client.app.state.registry = ProjectRegistry(path=yml)
+        store = MagicMock()
+        store.get_all_latest.return_value = {"alpha": [{"status": "up"}]}
+        client.app.state.health_store = store
+
+        resp = client.get("/api/projects")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        data = resp.json()
+        assert data["projects"][0]["health"] == "up"
+        assert data["groups"]["internal"][0]["id"] == "alpha"
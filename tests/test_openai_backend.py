@@ -17,6 +17,11 @@ from src.token_tracker.tracker import ClaudeResponse, UsageRecord
 @pytest.fixture
 def mock_openai():
     """Patch the openai module so no real API calls are made."""
+    from src.token_tracker.openai_backend import _async_clients, _get_client
+
+    # Clients are shared per key (and loop); rebuild them from this mock
+    _get_client.cache_clear()
+    _async_clients.clear()
     with patch.dict("sys.modules", {"openai": MagicMock()}):
         import openai
 
@@ -44,6 +49,8 @@ def mock_openai():
             "response": mock_response,
             "async_response": mock_async_response,
         }
+    _get_client.cache_clear()
+    _async_clients.clear()
 
 
 @pytest.fixture
@@ -90,25 +97,107 @@ class TestOpenAIBackend:
         assert summary["backend"] == "openai"
         assert summary["calls"] == 1
 
+    def test_agent_summary_running_totals(self, openai_backend):
+        for agent in ("manager", "manager", "frontend"):
+            openai_backend.create_message(
+                agent_id=agent,
+                messages=[{"role": "user", "content": "abcd"}],
+            )
+        summary = openai_backend.agent_summary("manager")
+        assert summary["calls"] == 2
+        assert summary["input_chars"] == 8
+        assert summary["output_chars"] == 2 * openai_backend.records[0].output_chars
+        assert openai_backend.agent_summary("unknown")["calls"] == 0
+        assert "unknown" not in openai_backend._agent_stats
+
+    def test_records_bounded(self, openai_backend):
+        from collections import deque
+
+        openai_backend.records = deque(maxlen=2)
+        for _ in range(3):
+            openai_backend.create_message(
+                agent_id="manager",
+                messages=[{"role": "user", "content": "hi"}],
+            )
+        assert len(openai_backend.records) == 2
+        assert openai_backend.agent_summary("manager")["calls"] == 3
+
+    async def test_stream_joins_chunks(self, openai_backend, mock_openai):
+        async def fake_stream():
+            for text in ("Hel", "lo", None, "!"):
+                chunk = MagicMock()
+                chunk.choices = [MagicMock()]
+                chunk.choices[0].delta.content = text
+                yield chunk
+
+        mock_openai["async_client"].chat.completions.create.return_value = fake_stream()
+        events = [
+            e async for e in openai_backend.create_message_stream(
+                agent_id="manager", messages=[{"role": "user", "content": "hi"}],
+            )
+        ]
+        assert [e["data"] for e in events if e["type"] == "chunk"] == ["Hel", "lo", "!"]
+        assert events[-1] == {"type": "done", "data": "Hello!"}
+        assert openai_backend.agent_summary("manager")["output_chars"] == 6
+
+    async def test_backends_share_clients_per_key(self, openai_backend, mock_openai):
+        from src.token_tracker.openai_backend import _HTTP2, OpenAIBackend
+
+        same = OpenAIBackend(api_key="sk-test-key", model="gpt-4o-mini")
+        other = OpenAIBackend(api_key="sk-other-key")
+        assert same._client is openai_backend._client
+        assert same._async_client is openai_backend._async_client
+        assert mock_openai["openai"].OpenAI.call_count == 2
+        assert other._client is mock_openai["client"]  # same mock, built again
+        assert other._async_client is mock_openai["async_client"]
+        assert mock_openai["openai"].AsyncOpenAI.call_count == 2
+        mock_openai["openai"].DefaultAsyncHttpxClient.assert_called_with(http2=_HTTP2)
+
+    def test_async_clients_are_per_event_loop(self, openai_backend, mock_openai):
+        import asyncio
+
+        async def client():
+            return openai_backend._async_client
+
+        asyncio.run(client())
+        asyncio.run(client())
+        # A client bound to a finished loop is never handed to the next one
+        assert mock_openai["openai"].AsyncOpenAI.call_count == 2
+
     def test_budget_tracking(self, openai_backend):
         assert openai_backend.budget_remaining > 0
         assert not openai_backend.is_over_budget
 
     def test_build_messages_with_system(self, openai_backend):
-        msgs = openai_backend._build_messages(
+        msgs, input_chars = openai_backend._build_messages(
             system="Be helpful",
             messages=[{"role": "user", "content": "hi"}],
         )
         assert msgs[0] == {"role": "system", "content": "Be helpful"}
         assert msgs[1] == {"role": "user", "content": "hi"}
+        assert input_chars == len("Be helpful") + len("hi")
 
     def test_build_messages_without_system(self, openai_backend):
-        msgs = openai_backend._build_messages(
+        msgs, input_chars = openai_backend._build_messages(
             system=None,
             messages=[{"role": "user", "content": "hi"}],
         )
         assert len(msgs) == 1
         assert msgs[0]["role"] == "user"
+        assert input_chars == 2
+
+    def test_build_messages_flattens_blocks(self, openai_backend):
+        block = MagicMock(text="from sdk")
+        msgs, input_chars = openai_backend._build_messages(
+            system=None,
+            messages=[{"role": "assistant", "content": [
+                {"type": "text", "text": "a"},
+                {"type": "tool_use", "id": "t1"},
+                block,
+            ]}],
+        )
+        assert msgs == [{"role": "assistant", "content": "a\nfrom sdk"}]
+        assert input_chars == len("a\nfrom sdk")
 
     def test_model_override(self, openai_backend, mock_openai):
         openai_backend.create_message(
@@ -2,8 +2,16 @@
 
 from __future__ import annotations
 
-from src.orchestrator.state import SubtaskResult, WorkflowState
-from src.orchestrator.graph import intake_node, route_after_review
+from unittest.mock import MagicMock, patch
+
+from src.orchestrator.graph import (
+    _compiled_graph,
+    _get_memory,
+    intake_node,
+    reviewing_node,
+    route_after_review,
+)
+from src.orchestrator.state import RunContext, SubtaskResult
 
 
 def _make_state(**overrides) -> dict:
@@ -73,3 +81,67 @@ class TestSubtaskResult:
         r = SubtaskResult(subtask_id="1", agent_type="backend", description="test")
         r.attempts += 1
         assert r.attempts == 1
+
+
+class TestMemoryCache:
+    def test_failed_memory_init_is_cached(self):
+        _get_memory.cache_clear()
+        with patch("src.orchestrator.graph.AgentMemory", side_effect=RuntimeError("down")) as mem:
+            assert _get_memory("frontend", "proj") is None
+            assert _get_memory("frontend", "proj") is None
+        assert mem.call_count == 1
+        _get_memory.cache_clear()
+
+
+class TestCompiledGraph:
+    def test_compiled_graph_is_shared(self):
+        assert _compiled_graph() is _compiled_graph()
+
+    def test_agents_injected_via_context(self):
+        manager = MagicMock()
+        manager.decompose_task.return_value = {
+            "plan": "p",
+            "subtasks": [{"id": "st-1", "agent": "backend", "description": "api"}],
+        }
+        manager.review_output.return_value = {"verdict": "approve", "score": 9}
+        manager.synthesize.return_value = "final"
+        backend = MagicMock()
+        backend.chat.return_value = "done"
+
+        ctx = RunContext(agents={"manager": manager, "backend": backend})
+        result = _compiled_graph().invoke(_make_state(task="Build an API"), context=ctx)
+
+        assert result["final_output"] == "final"
+        assert result["results"]["st-1"].output == "done"
+        backend.chat.assert_called_once()
+
+
+class TestReviewingNode:
+    def test_queues_revisions_and_unblocked_dependents(self):
+        manager = MagicMock()
+        manager.review_output.side_effect = [
+            {"verdict": "approve", "score": 9},
+            {"verdict": "revise", "feedback": "tighten"},
+        ]
+        results = {
+            "a": SubtaskResult(
+                subtask_id="a", agent_type="backend", description="a",
+                output="ok", attempts=1,
+            ),
+            "b": SubtaskResult(
+                subtask_id="b", agent_type="backend", description="b",
+                output="meh", attempts=1,
+            ),
+        }
+        subtasks = [
+            {"id": "a"},
+            {"id": "b"},
+            {"id": "c", "depends_on": ["a"]},
+        ]
+        state = _make_state(results=results, subtasks=subtasks)
+
+        out = reviewing_node(state, {"manager": manager})
+
+        assert out["phase"] == "executing"
+        assert out["ready_queue"] == ["b", "c"]
+        assert out["results"]["b"].review_feedback == "tighten"
@@ -0,0 +1,250 @@
+"""Tests for predictive token analytics."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.token_tracker import predictive
+from src.token_tracker.predictive import _linear_regression, compute_forecast
+from src.token_tracker.session_parser import (
+    DailyUsage,
+    QueryRecord,
+    SessionData,
+    UsageReport,
+)
+
+
+def _query(ts: str | None, tokens: int) -> QueryRecord:
+    return QueryRecord(
+        user_prompt=None, user_timestamp=None, assistant_timestamp=ts, model="sonnet",
+        input_tokens=tokens, output_tokens=0, total_tokens=tokens,
+    )
+
+
+def _report(queries: list[QueryRecord], days: int = 3) -> UsageReport:
+    session = SessionData(
+        session_id="s1", project="p", date="2025-01-01", timestamp=None, first_prompt="",
+        model="sonnet", query_count=len(queries), queries=queries,
+        input_tokens=0, output_tokens=0, total_tokens=0,
+    )
+    daily = [
+        DailyUsage(
+            date=f"2025-01-{d + 1:02d}", input_tokens=1000 * (d + 1),
+            output_tokens=500, total_tokens=1000 * (d + 1) + 500,
+        )
+        for d in range(days)
+    ]
+    return UsageReport(sessions=[session], daily_usage=daily)
+
+
+def _forecast(report: UsageReport, **caps: int) -> predictive.Forecast:
+    with (
+        patch.object(predictive, "_sessions_fingerprint", return_value=(0, 0, 0)),
+        patch.object(predictive, "parse_all_sessions", return_value=report),
+    ):
+        return compute_forecast(**caps)
+
+
+@pytest.fixture(autouse=True)
+def _no_cached_forecast(tmp_path):
+    predictive.clear_forecast_cache()
+    with patch.object(predictive, "FORECAST_CACHE_PATH", tmp_path / "forecast.json"):
+        yield
+    predictive.clear_forecast_cache()
+
+
+class TestLinearRegression:
+    def test_exact_line(self):
+        slope, intercept = _linear_regression([0, 1, 2, 3], [1.0, 3.0, 5.0, 7.0])
+        assert slope == pytest.approx(2.0)
+        assert intercept == pytest.approx(1.0)
+
+    def test_matches_polyfit(self):
+        xs = np.arange(14, dtype=np.float64)
+        ys = np.array([
+            5e6, 7e6, 6e6, 9e6, 1.1e7, 8e6, 1.2e7,
+            1e7, 1.3e7, 9e6, 1.4e7, 1.5e7, 1.2e7, 1.6e7,
+        ])
+        slope, intercept = _linear_regression(xs, ys)
+        ref_slope, ref_intercept = np.polyfit(xs, ys, 1)
+        assert slope == pytest.approx(ref_slope)
+        assert intercept == pytest.approx(ref_intercept)
+
+    def test_degenerate_inputs(self):
+        assert _linear_regression([], []) == (0.0, 0.0)
+        assert _linear_regression([0], [42.0]) == (0.0, 42.0)
+        assert _linear_regression([3, 3, 3], [1.0, 2.0, 3.0]) == (0.0, 2.0)
+
+
+class TestForecastCache:
+    def test_reused_until_sessions_change(self):
+        fingerprint = [(1, 100, 5)]
+        with (
+            patch.object(predictive, "_sessions_fingerprint", side_effect=lambda: fingerprint[0]),
+            patch.object(predictive, "parse_all_sessions", return_value=UsageReport()) as parse,
+        ):
+            first = compute_forecast()
+            assert compute_forecast() is first
+            assert parse.call_count == 1
+
+            with pytest.raises(AttributeError):
+                first.trend = "steady"  # shared, so frozen
+
+            fingerprint[0] = (1, 120, 6)  # a session file grew
+            compute_forecast()
+            assert parse.call_count == 2
+            compute_forecast(weekly_cap=1)  # different caps, different forecast
+            assert parse.call_count == 3
+
+    def test_reused_across_processes_via_disk(self):
+        report = _report([_query("2025-01-01T09:00:00Z", 5)], days=3)
+        first = _forecast(report)
+        assert predictive.FORECAST_CACHE_PATH.exists()
+
+        predictive.clear_forecast_cache()  # as if a fresh process
+        with (
+            patch.object(predictive, "_sessions_fingerprint", return_value=(0, 0, 0)),
+            patch.object(predictive, "parse_all_sessions") as parse,
+        ):
+            assert compute_forecast() == first
+        parse.assert_not_called()
+
+    def test_corrupt_disk_cache_recomputed(self):
+        predictive.FORECAST_CACHE_PATH.write_text("{not json")
+        assert _forecast(_report([], days=3)).trend == "accelerating"
+
+    def test_fingerprint_stats_session_files(self, tmp_path):
+        proj = tmp_path / "projects" / "p1"
+        proj.mkdir(parents=True)
+        (proj / "a.jsonl").write_text("{}\n")
+        (proj / "notes.txt").write_text("ignored")
+        with patch.object(predictive, "_claude_dir", return_value=tmp_path):
+            count, size, newest = predictive._sessions_fingerprint()
+        assert (count, size) == (1, 3)
+        assert newest > 0
+
+    def test_fingerprint_missing_dir(self, tmp_path):
+        with patch.object(predictive, "_claude_dir", return_value=tmp_path / "nope"):
+            assert predictive._sessions_fingerprint() == (0, 0, 0)
+
+
+class TestPeakHours:
+    def test_top_three_hours_by_tokens(self):
+        report = _report([
+            _query("2025-01-01T09:15:00.000Z", 100),
+            _query("2025-01-01T14:00:00.000Z", 500),
+            _query("2025-01-02T14:59:59Z", 100),
+            _query("2025-01-02T22:30:00.000Z", 300),
+            _query("2025-01-03T03:00:00.000Z", 50),
+        ])
+        assert _forecast(report).peak_hours == (14, 22, 9)
+
+    def test_skips_missing_or_malformed_timestamps(self):
+        report = _report([
+            _query(None, 999),
+            _query("garbage", 999),
+            _query("2025-01-01T07:00:00Z", 1),
+        ])
+        assert _forecast(report).peak_hours == (7,)
+
+    def test_top_buckets_any_width(self):
+        totals = [0] * 168  # hour-of-week buckets
+        totals[5] = totals[100] = 7
+        totals[167] = 9
+        totals[42] = 1
+        assert predictive._top_buckets(totals, 3) == [167, 5, 100]
+        assert predictive._top_buckets([0, 0, 4], 3) == [2]
+
+    def test_hour_totals_buckets(self):
+        report = _report([
+            _query("2025-01-01T07:00:00Z", 1),
+            _query("2025-01-01T07:59:00Z", 2),
+            _query("2025-01-01T23:00:00Z", 4),
+            _query("2025-01-01T99:00:00Z", 8),
+            _query("2025-01-01T", 16),
+            _query("", 32),
+        ])
+        totals = predictive._hour_totals(report.sessions)
+        assert len(totals) == 24
+        assert totals[7] == 3
+        assert totals[23] == 4
+        assert sum(totals) == 7
+
+
+class TestForecastTrend:
+    def test_uses_last_fourteen_days(self):
+        f = _forecast(_report([], days=20))
+        # days 7..20 in order: total = 1000*d + 500, input = 1000*d
+        assert f.avg_daily_tokens == round(np.mean([1000 * d + 500 for d in range(7, 21)]))
+        assert f.avg_daily_input == round(np.mean([1000 * d for d in range(7, 21)]))
+        assert f.avg_daily_output == 500
+        assert f.trend_slope == 1000.0
+        assert f.trend == "accelerating"
+        assert f.projected_7d_tokens == 7 * (14_000 + 3.5 * 1000)
+        assert f.projected_30d_tokens == 30 * (14_000 + 15 * 1000)
+
+    def test_to_dict_has_every_field(self):
+        f = _forecast(_report([_query("2025-01-01T09:00:00Z", 5)], days=3))
+        d = predictive.forecast_to_dict(f)
+        assert list(d) == [
+            "avg_daily_tokens", "avg_daily_input", "avg_daily_output", "trend",
+            "trend_slope", "projected_7d_tokens", "projected_30d_tokens",
+            "session_limit_days_remaining", "weekly_limit_days_remaining",
+            "peak_hours", "recommendations",
+        ]
+        assert d["peak_hours"] == (9,)
+        assert d["trend"] == f.trend
+
+    def test_recommendations_and_limits(self):
+        report = _report([
+            _query("2025-01-01T09:00:00Z", 5),
+            _query("2025-01-01T10:00:00Z", 9),
+        ], days=3)
+        f = _forecast(report, session_cap=3000, weekly_cap=7000)
+        # avg_daily 2500 > 80% of 1000/day; slope 1000 > 5% of it
+        assert f.trend == "accelerating"
+        assert f.weekly_limit_days_remaining == 2.8
+        assert f.session_limit_days_remaining == 3.6
+        assert f.recommendations[0].startswith("Usage is increasing")
+        assert f.recommendations[1].startswith("You're using >80%")
+        assert f.recommendations[2] == (
+            "Peak hours (UTC): 10:00, 9:00. Spread work to avoid session-limit spikes."
+        )
+        assert len(f.recommendations) == 3
+
+    @pytest.mark.parametrize(("avg_input", "avg_output", "expected"), [
+        (100.0, 100.0, ("Usage looks healthy. Keep it up!",)),
+        (100.0, 300.0, ("Output tokens are 2x+ input — consider shorter system prompts "
+                        "to reduce output verbosity.",)),
+    ])
+    def test_recommendation_table(self, avg_input, avg_output, expected):
+        ctx = predictive._RecContext("steady", 200.0, avg_input, avg_output, 10**9, (3,))
+        assert predictive._recommendations(ctx) == expected
+
+    def test_insufficient_data(self):
+        f = _forecast(_report([], days=1))
+        assert f is predictive._NO_DATA_FORECAST
+        assert f.trend == "insufficient_data"
+        # shared singleton: callers get immutable sequences, not its lists
+        assert isinstance(predictive.forecast_to_dict(f)["recommendations"], tuple)
+
+    def test_zero_token_days_skip_regression(self):
+        report = UsageReport(daily_usage=[
+            DailyUsage(date=f"2025-01-0{d}", input_tokens=0, output_tokens=0, total_tokens=0)
+            for d in (1, 2, 3)
+        ])
+        with patch.object(predictive, "_linear_regression") as fit:
+            assert _forecast(report) is predictive._NO_DATA_FORECAST
+        fit.assert_not_called()
+
+
+def test_import_does_not_load_numpy():
+    import subprocess
+    import sys
+
+    code = "import sys, src.token_tracker.predictive; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import sys
 import textwrap
+import threading
+import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 import yaml
@@ -152,8 +156,10 @@ class TestProjectRegistry:
         data["projects"].append({"id": "new-one", "name": "New"})
         sample_yaml.write_text(yaml.dump(data))
 
+        version = registry.version
         registry.reload()
         assert registry.get("new-one") is not None
+        assert registry.version > version
 
     def test_simple_project_defaults(self, registry: ProjectRegistry) -> None:
         p = registry.get("simple-project")
@@ -169,3 +175,106 @@ class TestProjectRegistry:
         reg = ProjectRegistry(path=yml)
         projects = reg.load()
         assert projects == []
+
+    def test_reload_skips_unchanged_file(self, registry: ProjectRegistry) -> None:
+        before = registry.load()
+        version = registry.version
+        with patch("src.projects.registry._yaml_load") as yaml_load:
+            after = registry.reload()
+        yaml_load.assert_not_called()
+        assert after is before
+        assert registry.version == version
+
+    def test_json_sidecar_used_on_fresh_load(
+        self, registry: ProjectRegistry, sample_yaml: Path
+    ) -> None:
+        sidecar = sample_yaml.with_name("projects.yaml.json")
+        assert sidecar.exists()
+
+        fresh = ProjectRegistry(path=sample_yaml)
+        with patch("src.projects.registry._yaml_load") as yaml_load:
+            projects = fresh.load()
+        yaml_load.assert_not_called()
+        assert [p.id for p in projects] == ["test-project", "simple-project"]
+
+    def test_stale_json_sidecar_ignored(self, registry: ProjectRegistry, sample_yaml: Path) -> None:
+        sample_yaml.write_text(yaml.dump({"projects": [{"id": "only-one"}]}))
+        fresh = ProjectRegistry(path=sample_yaml)
+        assert [p.id for p in fresh.load()] == ["only-one"]
+
+    def test_add_project_indexed(self, registry: ProjectRegistry) -> None:
+        registry.add_project({"id": "added", "name": "Added"})
+        assert registry.get("added") is not None
+        with pytest.raises(ValueError):
+            registry.add_project({"id": "added", "name": "Again"})
+
+    def test_to_dict_cached_but_isolated(self, registry: ProjectRegistry) -> None:
+        first = registry.to_dict()
+        first[0]["health"] = "up"
+        assert "health" not in registry.to_dict()[0]
+
+    def test_to_dict_invalidated_on_add(self, registry: ProjectRegistry) -> None:
+        registry.to_dict()
+        registry.add_project({"id": "added", "name": "Added"})
+        assert [d["id"] for d in registry.to_dict()][-1] == "added"
+
+    def test_add_project_appends_and_keeps_comments(self, tmp_path: Path) -> None:
+        yml = tmp_path / "projects.yaml"
+        yml.write_text(textwrap.dedent("""\
+            # Registry header
+            projects:
+
+              # first project
+              - id: one
+                name: One
+            """))
+        reg = ProjectRegistry(path=yml)
+        reg.add_project({"id": "two", "name": "Two", "tags": ["x"]})
+
+        text = yml.read_text()
+        assert "# first project" in text
+        assert [p.id for p in ProjectRegistry(path=yml).load()] == ["one", "two"]
+
+    def test_add_project_falls_back_to_rewrite(self, tmp_path: Path) -> None:
+        yml = tmp_path / "projects.yaml"
+        yml.write_text("projects:\n- id: one\nsettings:\n  x: 1\n")
+        reg = ProjectRegistry(path=yml)
+        reg.add_project({"id": "two", "name": "Two"})
+        data = yaml.safe_load(yml.read_text())
+        assert [p["id"] for p in data["projects"]] == ["one", "two"]
+        assert data["settings"] == {"x": 1}
+
+    def test_concurrent_first_load_parses_once(self, sample_yaml: Path) -> None:
+        reg = ProjectRegistry(path=sample_yaml)
+        real_read = reg._read_raw
+        calls = []
+
+        def slow_read(key):
+            calls.append(key)
+            time.sleep(0.05)
+            return real_read(key)
+
+        with patch.object(reg, "_read_raw", side_effect=slow_read):
+            threads = [threading.Thread(target=reg.load) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert len(calls) == 1
+        assert len(reg.projects) == 2
+
+    def test_enum_like_fields_interned(self, registry: ProjectRegistry) -> None:
+        p = registry.get("test-project")
+        assert p is not None
+        assert p.group is sys.intern("internal")
+        assert p.health_checks[1].type is sys.intern("tls")
+        assert p.envs[0].name is sys.intern("local")
+
+    def test_value_objects_are_frozen_and_hashable(self, registry: ProjectRegistry) -> None:
+        p = registry.get("test-project")
+        assert p is not None
+        check = p.health_checks[0]
+        assert {check: 1}[check] == 1
+        with pytest.raises(AttributeError):
+            check.url = "http://elsewhere"  # type: ignore[misc]
@@ -6,12 +6,13 @@ import sys
 from collections.abc import Generator
 from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from src.runner.app import create_runner_app
+from src.runner.endpoints import _run_subprocess_async
 from src.runner.safety import SafetyError, validate_branch_for_push, validate_command
 
 # ── Fixtures ─────────────────────────────────────────────────────────────────
@@ -22,7 +23,7 @@ def runner_app_no_auth() -> Any:
     """Runner app with no auth token (dev mode)."""
     with patch("src.runner.app.runner_settings") as mock_settings:
         mock_settings.runner_token = ""
-        mock_settings.runner_projects_file = "projects.yaml"
+        mock_settings.projects_path = Path("projects.yaml").resolve()
         mock_settings.log_level = "WARNING"
         app = create_runner_app()
     return app
@@ -65,7 +66,7 @@ class TestRunnerAuth:
         """When token is set, requests without it should be rejected."""
         with patch("src.runner.app.runner_settings") as mock_settings:
             mock_settings.runner_token = "secret-token-123"
-            mock_settings.runner_projects_file = "projects.yaml"
+            mock_settings.projects_path = Path("projects.yaml").resolve()
             mock_settings.log_level = "WARNING"
             app = create_runner_app()
             app.state.registry = MagicMock()
@@ -79,7 +80,7 @@ class TestRunnerAuth:
         """Wrong token should be rejected."""
         with patch("src.runner.app.runner_settings") as mock_settings:
             mock_settings.runner_token = "secret-token-123"
-            mock_settings.runner_projects_file = "projects.yaml"
+            mock_settings.projects_path = Path("projects.yaml").resolve()
             mock_settings.log_level = "WARNING"
             app = create_runner_app()
             app.state.registry = MagicMock()
@@ -92,7 +93,7 @@ class TestRunnerAuth:
         """Correct token should be accepted."""
         with patch("src.runner.app.runner_settings") as mock_settings:
             mock_settings.runner_token = "secret-token-123"
-            mock_settings.runner_projects_file = "projects.yaml"
+            mock_settings.projects_path = Path("projects.yaml").resolve()
             mock_settings.log_level = "WARNING"
             app = create_runner_app()
             app.state.registry = MagicMock()
@@ -156,6 +157,12 @@ class TestSafety:
         with pytest.raises(SafetyError, match="deployment"):
             validate_command("vercel --prod")
 
+    def test_block_matches_inside_compound_command(self) -> None:
+        with pytest.raises(SafetyError, match="deployment"):
+            validate_command("npm run build && DOCKER PUSH app:latest")
+        with pytest.raises(SafetyError, match="destructive"):
+            validate_command("echo y | format c:")
+
     def test_allow_safe_commands(self) -> None:
         # These should all pass without raising
         validate_command("npm run dev")
@@ -221,6 +228,16 @@ class TestContractSerialization:
 # ── Diff size limiting tests ────────────────────────────────────────────────
 
 
+def _fake_git_reader(unstaged: bytes, staged: bytes) -> AsyncMock:
+    """Stand-in for ``_read_output_capped`` answering each git diff command."""
+    async def read(cmd, cwd, timeout, max_bytes):
+        if cmd[-1] == "--quiet":
+            return (1 if staged else 0), b"", ""
+        return 0, (staged if "--cached" in cmd else unstaged), ""
+
+    return AsyncMock(side_effect=read)
+
+
 class TestDiffSizeLimiting:
     """Test that large diffs are rejected with 413."""
 
@@ -234,16 +251,12 @@ class TestDiffSizeLimiting:
         mock_project.repo_path = str(Path(__file__).parent.parent)
         mock_registry.get.return_value = mock_project
 
-        # Patch subprocess to return a giant diff
-        large_diff = "x" * 600_000  # Exceeds 500KB default limit
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = large_diff
-        mock_result.stderr = ""
+        # Patch the reader: status shows both sides dirty, then two giant diffs
+        large_diff = b"x" * 300_000  # Unstaged + staged exceed the 500KB default limit
 
-        with patch("src.runner.endpoints.subprocess.run", return_value=mock_result):
-            with patch("src.runner.endpoints.runner_settings") as mock_settings:
-                mock_settings.runner_max_diff_bytes = 500_000
+        reader = _fake_git_reader(large_diff, large_diff)
+        with patch("src.runner.endpoints._read_output_capped", reader):
+            with patch("src.runner.endpoints._MAX_DIFF_BYTES", 500_000):
                 resp = client_no_auth.get("/git/diff?projectId=test-project")
                 assert resp.status_code == 413
 
@@ -257,17 +270,14 @@ class TestDiffSizeLimiting:
         mock_project.repo_path = str(Path(__file__).parent.parent)
         mock_registry.get.return_value = mock_project
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "small diff"
-        mock_result.stderr = ""
-
-        with patch("src.runner.endpoints.subprocess.run", return_value=mock_result):
-            with patch("src.runner.endpoints.runner_settings") as mock_settings:
-                mock_settings.runner_max_diff_bytes = 500_000
+        reader = _fake_git_reader(b"small diff", b"")
+        with patch("src.runner.endpoints._read_output_capped", reader):
+            with patch("src.runner.endpoints._MAX_DIFF_BYTES", 500_000):
                 resp = client_no_auth.get("/git/diff?projectId=test-project")
                 assert resp.status_code == 200
                 assert "small diff" in resp.text
+        commands = [c.args[0] for c in reader.call_args_list]
+        assert ["git", "diff", "--cached"] not in commands  # probe said nothing staged
 
 
 # ── Command execution tests ──────────────────────────────────────────────────
@@ -297,6 +307,54 @@ class TestCommandEndpoint:
         assert resp.status_code == 404
 
 
+class TestUsageEndpoint:
+    """Test GET /usage encoding."""
+
+    def test_usage_unavailable_is_json(self, client_no_auth: TestClient) -> None:
+        with patch(
+            "src.token_tracker.session_parser.parse_all_sessions",
+            side_effect=RuntimeError("no ~/.claude"),
+        ):
+            resp = client_no_auth.get("/usage")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.json() == {"ok": False, "error": "no ~/.claude", "data": {}}
+
+
+# ── Subprocess helper tests ──────────────────────────────────────────────────
+
+
+class TestRunSubprocessAsync:
+    """Test the async subprocess helper against a real interpreter."""
+
+    async def test_captures_output_and_exit_code(self, tmp_path: Path) -> None:
+        result = await _run_subprocess_async(
+            [sys.executable, "-c", "import sys; print('out'); sys.exit(3)"], tmp_path, 10
+        )
+        assert result.exitCode == 3
+        assert result.stdout.strip() == "out"
+
+    async def test_timeout_kills_process(self, tmp_path: Path) -> None:
+        result = await _run_subprocess_async(
+            [sys.executable, "-c", "import time; time.sleep(5)"], tmp_path, 0.2
+        )
+        assert result.exitCode == -1
+        assert "timed out" in result.stderr
+
+    async def test_missing_binary(self, tmp_path: Path) -> None:
+        result = await _run_subprocess_async(["definitely-not-a-binary-xyz"], tmp_path, 5)
+        assert result.exitCode == -1
+        assert "not found" in result.stderr
+
+    async def test_output_capped(self, tmp_path: Path) -> None:
+        script = "import sys; sys.stdout.write('x' * 300000); sys.stderr.write('e')"
+        with patch("src.runner.endpoints._MAX_OUTPUT_BYTES", 1000):
+            result = await _run_subprocess_async([sys.executable, "-c", script], tmp_path, 10)
+        assert result.exitCode == 0
+        assert result.stdout.startswith("x" * 1000 + "\n... [truncated 299000 bytes]")
+        assert result.stderr == "e"
+
+
 # ── Connector model tests ───────────────────────────────────────────────────
 
 
@@ -327,3 +385,472 @@ class TestConnectorModels:
         )
         assert g.branch == "main"
         assert g.dirtyCount == 0
+
+
+class TestRunnerSettings:
+    def test_settings_factory_is_cached(self) -> None:
+        from src.runner.config import get_runner_settings, runner_settings
+
+        assert get_runner_settings() is runner_settings
+
+    def test_projects_path_resolved_against_cwd(self, tmp_path: Path, monkeypatch) -> None:
+        from src.runner.config import RunnerSettings
+
+        monkeypatch.chdir(tmp_path)
+        settings = RunnerSettings(runner_projects_file="reg.yaml")
+        assert settings.projects_path == (tmp_path / "reg.yaml").resolve()
+        assert settings.projects_path is settings.projects_path
+
+    def test_main_preloads_registry_before_serving(self) -> None:
+        from src.runner import main as runner_main
+
+        calls: list[str] = []
+
+        def record(name: str) -> Any:
+            return lambda *args, **kwargs: calls.append(name)
+
+        with (
+            patch("src.runner.app.preload_registry", side_effect=record("preload")),
+            patch.object(runner_main.uvicorn, "run", side_effect=record("run")),
+        ):
+            runner_main.main()
+        assert calls == ["preload", "run"]
+
+
+# ── Git status tests ─────────────────────────────────────────────────────────
+
+
+class TestGitStatusEndpoint:
+    """Test GET /git/status against a real throwaway repository."""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path) -> Path:
+        import subprocess
+
+        def git(*args: str) -> None:
+            subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+        git("init", "-q", "-b", "feature/x")
+        git("config", "user.email", "dev@example.com")
+        git("config", "user.name", "Dev")
+        (tmp_path / "a.txt").write_text("a\n")
+        git("add", "a.txt")
+        git("commit", "-q", "-m", "initial commit")
+        (tmp_path / "a.txt").write_text("changed\n")
+        (tmp_path / "b.txt").write_text("b\n")
+        return tmp_path
+
+    def test_status_reports_branch_commit_and_changes(
+        self, client_no_auth: TestClient, repo: Path
+    ) -> None:
+        mock_project = MagicMock()
+        mock_project.local.path_windows = str(repo)
+        mock_project.local.path_linux = str(repo)
+        mock_project.local.path_mac = str(repo)
+        client_no_auth.app.state.registry.get.return_value = mock_project  # type: ignore[union-attr]
+
+        resp = client_no_auth.get("/git/status?projectId=repo")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["branch"] == "feature/x"
+        assert data["lastCommit"]["message"] == "initial commit"
+        assert data["lastCommit"]["author"] == "Dev"
+        assert sorted(data["changedFiles"]) == ["a.txt", "b.txt"]
+        assert data["dirtyCount"] == 2
+
+    def test_status_without_commit_details(self, client_no_auth: TestClient, repo: Path) -> None:
+        mock_project = MagicMock()
+        mock_project.local.path_windows = str(repo)
+        mock_project.local.path_linux = str(repo)
+        mock_project.local.path_mac = str(repo)
+        client_no_auth.app.state.registry.get.return_value = mock_project  # type: ignore[union-attr]
+
+        resp = client_no_auth.get("/git/status?projectId=repo&includeCommit=false")
+        data = resp.json()
+        assert data["branch"] == "feature/x"
+        assert len(data["lastCommit"]["sha"]) == 12
+        assert data["lastCommit"]["message"] == ""
+        assert data["dirtyCount"] == 2
+
+    def test_diff_streams_and_aborts_over_limit(
+        self, client_no_auth: TestClient, repo: Path
+    ) -> None:
+        import subprocess
+
+        from src.runner.endpoints import _read_output_capped
+
+        mock_project = MagicMock()
+        mock_project.local.path_windows = str(repo)
+        mock_project.local.path_linux = str(repo)
+        mock_project.local.path_mac = str(repo)
+        client_no_auth.app.state.registry.get.return_value = mock_project  # type: ignore[union-attr]
+
+        resp = client_no_auth.get("/git/diff?projectId=repo")
+        assert resp.status_code == 200
+        assert "+changed" in resp.text
+
+        subprocess.run(["git", "add", "a.txt"], cwd=repo, check=True)
+        resp = client_no_auth.get("/git/diff?projectId=repo")
+        assert resp.status_code == 200
+        assert "+changed" in resp.text
+
+        subprocess.run(["git", "commit", "-qm", "second"], cwd=repo, check=True)
+        with patch("src.runner.endpoints._read_output_capped", wraps=_read_output_capped) as reader:
+            resp = client_no_auth.get("/git/diff?projectId=repo")
+        assert resp.status_code == 200
+        assert resp.text == ""
+        assert reader.call_count == 2  # unstaged diff + staged probe, no status call
+
+        (repo / "a.txt").write_text("y\n" * 200_000)
+        with patch("src.runner.endpoints._MAX_DIFF_BYTES", 10_000):
+            resp = client_no_auth.get("/git/diff?projectId=repo")
+        assert resp.status_code == 413
+
+    def test_project_path_resolved_once_per_registry_version(
+        self, client_no_auth: TestClient, repo: Path
+    ) -> None:
+        mock_registry = client_no_auth.app.state.registry  # type: ignore[union-attr]
+        mock_registry.version = 1
+        mock_project = MagicMock()
+        mock_project.local.path_windows = str(repo)
+        mock_project.local.path_linux = str(repo)
+        mock_project.local.path_mac = str(repo)
+        mock_registry.get.return_value = mock_project
+
+        for _ in range(3):
+            assert client_no_auth.get("/git/status?projectId=repo").status_code == 200
+        assert mock_registry.get.call_count == 1
+
+        mock_registry.version = 2
+        assert client_no_auth.get("/git/status?projectId=repo").status_code == 200
+        assert mock_registry.get.call_count == 2
+
+    def test_existing_project_path_stat_cached(
+        self, client_no_auth: TestClient, repo: Path
+    ) -> None:
+        mock_project = MagicMock()
+        mock_project.local.path_windows = str(repo)
+        mock_project.local.path_linux = str(repo)
+        mock_project.local.path_mac = str(repo)
+        client_no_auth.app.state.registry.get.return_value = mock_project  # type: ignore[union-attr]
+
+        assert client_no_auth.get("/git/status?projectId=repo").status_code == 200
+        with patch.object(Path, "exists", autospec=True) as exists:
+            assert client_no_auth.get("/git/status?projectId=repo").status_code == 200
+        exists.assert_not_called()
+
+    def test_parse_porcelain_v2_entries(self) -> None:
+        from src.runner.endpoints import _parse_porcelain_v2
+
+        out = (
+            b"# branch.oid (initial)\n"
+            b"# branch.head (detached)\n"
+            b"1 .M N... 100644 100644 100644 abc abc src/a b.py\n"
+            b"2 R. N... 100644 100644 100644 abc abc R100 new.py\told.py\n"
+            b"u UU N... 100644 100644 100644 100644 a b c conflict.py\n"
+            b"? untracked/\n"
+        )
+        branch, oid, files = _parse_porcelain_v2(out)
+        assert branch == "HEAD"
+        assert oid == ""
+        assert files == ["src/a b.py", "new.py", "conflict.py", "untracked/"]
+
+
+class TestPushPrEndpoint:
+    """Test POST /git/push-pr against a real repository with a bare remote."""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path, client_no_auth: TestClient) -> Path:
+        import subprocess
+
+        work = tmp_path / "work"
+        work.mkdir()
+
+        def git(*args: str) -> None:
+            subprocess.run(["git", *args], cwd=work, check=True, capture_output=True)
+
+        subprocess.run(
+            ["git", "init", "-q", "--bare", str(tmp_path / "remote.git")],
+            check=True, capture_output=True,
+        )
+        git("init", "-q", "-b", "main")
+        git("config", "user.email", "dev@example.com")
+        git("config", "user.name", "Dev")
+        git("remote", "add", "origin", str(tmp_path / "remote.git"))
+        (work / "a.txt").write_text("a\n")
+        git("add", "a.txt")
+        git("commit", "-q", "-m", "initial commit")
+
+        mock_project = MagicMock()
+        mock_project.local.path_windows = str(work)
+        mock_project.local.path_linux = str(work)
+        mock_project.local.path_mac = str(work)
+        client_no_auth.app.state.registry.get.return_value = mock_project  # type: ignore[union-attr]
+        return work
+
+    def test_clean_tree_returns_400(self, client_no_auth: TestClient, repo: Path) -> None:
+        resp = client_no_auth.post("/git/push-pr", json={
+            "projectId": "repo", "branch": "cla/clean", "title": "Nothing",
+        })
+        assert resp.status_code == 400
+        assert "Nothing to commit" in resp.json()["detail"]
+
+    def test_commits_and_pushes_branch(self, client_no_auth: TestClient, repo: Path) -> None:
+        import subprocess
+
+        (repo / "a.txt").write_text("changed\n")
+        resp = client_no_auth.post("/git/push-pr", json={
+            "projectId": "repo", "branch": "cla/it's-$done", "title": "Fix \"quotes\" $HOME",
+        })
+        # No GitHub remote, so gh fails after the push succeeded
+        assert resp.status_code == 500
+        assert "Branch pushed successfully" in resp.json()["detail"]
+
+        log = subprocess.run(
+            ["git", "log", "-1", "--format=%s", "cla/it's-$done"],
+            cwd=repo.parent / "remote.git", check=True, capture_output=True, text=True,
+        )
+        assert log.stdout.strip() == 'Fix "quotes" $HOME'
+
+
+# ── Connector client tests ──────────────────────────────────────────────────
+
+
+def _mock_runner_client(handler: Any) -> Any:
+    """RunnerClient whose pooled httpx client is backed by a MockTransport."""
+    import httpx
+
+    from src.runner_connector.client import RunnerClient
+
+    client = RunnerClient(base_url="http://runner.test", token="tok")
+    client._client.close()
+    client._client = httpx.Client(
+        base_url="http://runner.test",
+        headers=client._headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return client
+
+
+class TestRunnerClient:
+    """Test RunnerClient request plumbing against a mock transport."""
+
+    def test_health_reuses_pooled_client_with_token(self) -> None:
+        import httpx
+
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={
+                "ok": True, "name": "cla-runner", "version": "0.1.0",
+                "platform": "linux", "timestamp": "2025-01-01T00:00:00Z",
+            })
+
+        client = _mock_runner_client(handler)
+        assert client.health().platform == "linux"
+        assert client.health().ok is True
+        assert len(seen) == 2
+        assert all(r.headers["X-Runner-Token"] == "tok" for r in seen)
+        client.close()
+
+    def test_error_detail_extracted(self) -> None:
+        import httpx
+
+        from src.runner_connector.client import RunnerError
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(404, json={"detail": "Unknown project: x"})
+
+        client = _mock_runner_client(handler)
+        with pytest.raises(RunnerError) as exc:
+            client.git_status("x")
+        assert exc.value.status_code == 404
+        assert exc.value.detail == "Unknown project: x"
+        client.close()
+
+    def test_error_detail_plain_text(self) -> None:
+        import httpx
+
+        from src.runner_connector.client import RunnerError
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(502, text="Bad Gateway")
+
+        client = _mock_runner_client(handler)
+        with pytest.raises(RunnerError) as exc:
+            client.usage()
+        assert exc.value.status_code == 502
+        assert exc.value.detail == "Bad Gateway"
+        client.close()
+
+
+def _mock_async_runner_client(handler: Any) -> Any:
+    """AsyncRunnerClient whose shared httpx client is backed by a MockTransport.
+
+    Must be called on the running loop; the mock replaces that loop's pool.
+    """
+    import asyncio
+
+    import httpx
+
+    from src.runner_connector.client import AsyncRunnerClient, _shared_async_clients
+
+    _shared_async_clients.setdefault(asyncio.get_running_loop(), {})[
+        "http://runner.test"
+    ] = httpx.AsyncClient(
+        base_url="http://runner.test",
+        transport=httpx.MockTransport(handler),
+    )
+    return AsyncRunnerClient(base_url="http://runner.test", token="tok")
+
+
+class TestSharedAsyncClient:
+    """Test that async runner clients share one pool per base URL."""
+
+    async def test_same_base_url_shares_pool(self) -> None:
+        from src.runner_connector.client import AsyncRunnerClient, aclose_shared_clients
+
+        a = AsyncRunnerClient(base_url="http://runner.test/", token="a")
+        b = AsyncRunnerClient(base_url="http://runner.test", token="b")
+        c = AsyncRunnerClient(base_url="http://other.test", token="a")
+        assert a._client is b._client
+        assert a._client is not c._client
+        assert a._headers != b._headers
+
+        first = a._client
+        await aclose_shared_clients()
+        assert first.is_closed
+        assert not a._client.is_closed
+        assert a._client is not first
+        await aclose_shared_clients()
+
+    def test_pool_per_event_loop(self) -> None:
+        import asyncio
+
+        from src.runner_connector.client import AsyncRunnerClient, aclose_shared_clients
+
+        client = AsyncRunnerClient(base_url="http://runner.test", token="a")
+
+        async def grab() -> object:
+            pool = client._client
+            assert client._client is pool
+            await aclose_shared_clients()
+            return pool
+
+        assert asyncio.run(grab()) is not asyncio.run(grab())
+
+
+class TestRunnerPoller:
+    """Test the poller's async health check and backoff."""
+
+    async def test_check_once_online(self) -> None:
+        import httpx
+
+        from src.runner_connector.client import RunnerClient
+        from src.runner_connector.poller import RunnerPoller
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.headers["X-Runner-Token"] == "tok"
+            return httpx.Response(200, json={
+                "ok": True, "name": "cla-runner", "version": "0.2.0",
+                "platform": "linux", "timestamp": "2025-01-01T00:00:00Z",
+            })
+
+        poller = RunnerPoller(
+            client=RunnerClient(base_url="http://runner.test", token="tok"),
+            async_client=_mock_async_runner_client(handler),
+        )
+        await poller._check_once()
+        assert poller.state.online is True
+        assert poller.state.version == "0.2.0"
+        assert poller.state.consecutive_failures == 0
+
+        data = poller.state.to_dict()
+        assert data["last_seen"] == data["last_check"]
+        assert data["last_seen"].endswith("+00:00")
+        assert data["last_transition"] == f"offline→online @ {data['last_seen']}"
+
+    async def test_check_once_offline_backs_off(self) -> None:
+        import httpx
+
+        from src.runner_connector.client import RunnerClient
+        from src.runner_connector.poller import RunnerPoller
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        poller = RunnerPoller(
+            client=RunnerClient(base_url="http://runner.test", token="tok"),
+            async_client=_mock_async_runner_client(handler),
+            interval=10.0,
+        )
+        await poller._check_once()
+        await poller._check_once()
+        assert poller.state.online is False
+        assert poller.state.error == "Runner unreachable"
+        assert poller.state.consecutive_failures == 2
+        assert poller.state.current_interval == 20.0
+
+    def test_next_delay_jitters_only_while_offline(self) -> None:
+        from unittest.mock import patch
+
+        from src.runner_connector.client import RunnerClient
+        from src.runner_connector.poller import RunnerPoller
+
+        poller = RunnerPoller(
+            client=RunnerClient(base_url="http://runner.test", token="tok"), interval=10.0,
+        )
+        poller.state.current_interval = 40.0
+        with patch("src.runner_connector.poller.random.uniform", return_value=1.5) as uniform:
+            assert poller._next_delay() == 41.5
+            uniform.assert_called_once_with(0, 2.5)
+            poller.state.online = True
+            poller.state.current_interval = 10.0
+            assert poller._next_delay() == 10.0
+
+    async def test_check_once_runner_error_reports_detail(self) -> None:
+        import httpx
+
+        from src.runner_connector.client import RunnerClient
+        from src.runner_connector.poller import RunnerPoller
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(401, json={"detail": "Invalid or missing X-Runner-Token"})
+
+        poller = RunnerPoller(
+            client=RunnerClient(base_url="http://runner.test", token="tok"),
+            async_client=_mock_async_runner_client(handler),
+        )
+        await poller._check_once()
+        assert poller.state.online is False
+        assert "Invalid or missing X-Runner-Token" in (poller.state.error or "")
+
+    async def test_request_immediate_check_skips_backoff(self) -> None:
+        import asyncio
+
+        import httpx
+
+        from src.runner_connector.client import RunnerClient
+        from src.runner_connector.poller import RunnerPoller
+
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("refused", request=request)
+
+        poller = RunnerPoller(
+            client=RunnerClient(base_url="http://runner.test", token="tok"),
+            async_client=_mock_async_runner_client(handler),
+            interval=300.0,
+        )
+        await poller.start()
+        await asyncio.sleep(0.05)
+        assert calls == 1
+
+        poller.request_immediate_check()
+        await asyncio.sleep(0.05)
+        assert calls == 2
+        await asyncio.wait_for(poller.stop(), timeout=1.0)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
 from pathlib import Path
 
 import pytest
@@ -14,7 +15,10 @@ from src.token_tracker.session_parser import (
     UsageReport,
     _extract_session_data,
     _fmt,
+    _iter_jsonl_entries,
     _parse_jsonl_file,
+    _parse_ts,
+    _scan_session,
     parse_all_sessions,
     report_to_dict,
 )
@@ -160,6 +164,18 @@ class TestFmt:
         assert _fmt(42) == "42"
 
 
+class TestParseTs:
+    def test_z_suffix_is_utc(self):
+        from datetime import datetime, timezone
+
+        ts = _parse_ts("2025-01-15T10:23:45.123Z")
+        assert ts == datetime(2025, 1, 15, 10, 23, 45, 123000, tzinfo=timezone.utc)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            _parse_ts("not a timestamp")
+
+
 class TestParseJsonlFile:
     def test_valid_file(self, tmp_path: Path):
         p = tmp_path / "test.jsonl"
@@ -184,6 +200,13 @@ class TestParseJsonlFile:
         result = _parse_jsonl_file(p)
         assert len(result) == 2
 
+    def test_streams_and_skips_invalid_utf8(self, tmp_path: Path):
+        p = tmp_path / "test.jsonl"
+        p.write_bytes(b'{"a": 1}\n\xff\xfe\n{"b": "\xc3\xa9"}\n')
+        entries = _iter_jsonl_entries(p)
+        assert next(entries) == {"a": 1}
+        assert list(entries) == [{"b": "\u00e9"}]
+
 
 class TestExtractSessionData:
     def test_extracts_queries(self):
@@ -272,6 +295,18 @@ class TestExtractSessionData:
         queries = _extract_session_data(entries)
         assert len(queries) == 0
 
+    def test_scan_returns_first_timestamp(self):
+        entries = iter([
+            {"type": "summary"},
+            {"type": "user", "message": {"role": "user", "content": "hi"},
+             "timestamp": "2026-02-19T10:00:00Z"},
+            {"type": "assistant", "message": {"model": "m", "usage": {"output_tokens": 5}},
+             "timestamp": "2026-02-19T10:00:05Z"},
+        ])
+        queries, first_ts = _scan_session(entries)
+        assert first_ts == "2026-02-19T10:00:00Z"
+        assert [q.user_prompt for q in queries] == ["hi"]
+
 
 class TestParseAllSessions:
     def test_parses_test_data(self, tmp_claude_dir: Path):
@@ -286,8 +321,7 @@ class TestParseAllSessions:
         report = parse_all_sessions(claude_dir=tmp_claude_dir)
         assert len(report.daily_usage) == 2  # Two different dates
         dates = [d.date for d in report.daily_usage]
-        assert "2026-02-19" in dates
-        assert "2026-02-18" in dates
+        assert dates == ["2026-02-18", "2026-02-19"]  # predictive relies on date order
 
     def test_model_breakdown(self, tmp_claude_dir: Path):
         report = parse_all_sessions(claude_dir=tmp_claude_dir)
@@ -307,6 +341,121 @@ class TestParseAllSessions:
         tokens = [s.total_tokens for s in report.sessions]
         assert tokens == sorted(tokens, reverse=True)
 
+    def test_process_pool_matches_serial(self, tmp_claude_dir: Path):
+        from concurrent.futures import ProcessPoolExecutor
+        from unittest.mock import patch
+
+        from src.token_tracker import session_parser
+
+        serial = report_to_dict(parse_all_sessions(claude_dir=tmp_claude_dir))
+        shutil.rmtree(tmp_claude_dir / session_parser.SCAN_CACHE_DIRNAME)
+        with (
+            patch.object(session_parser, "_PARALLEL_MIN_FILES", 0),
+            patch.object(session_parser.os, "cpu_count", return_value=2),
+            patch.object(
+                session_parser, "ProcessPoolExecutor", wraps=ProcessPoolExecutor,
+            ) as pool,
+        ):
+            parallel = report_to_dict(parse_all_sessions(claude_dir=tmp_claude_dir))
+        pool.assert_called_once_with(max_workers=2, mp_context=session_parser._POOL_CONTEXT)
+        assert session_parser._POOL_CONTEXT.get_start_method() != "fork"
+        assert parallel == serial
+
+    def test_process_pool_from_worker_thread(self, tmp_claude_dir: Path):
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import patch
+
+        from src.token_tracker import session_parser
+
+        paths = sorted((tmp_claude_dir / "projects").glob("*/*.jsonl"))
+        serial = session_parser._scan_session_files(paths)
+        with (
+            patch.object(session_parser, "_PARALLEL_MIN_FILES", 0),
+            patch.object(session_parser.os, "cpu_count", return_value=2),
+            patch.object(session_parser.logger, "debug") as fallback,
+            ThreadPoolExecutor(max_workers=1) as threads,  # as a server threadpool would
+        ):
+            parallel = threads.submit(session_parser._scan_session_files, paths).result(60)
+        fallback.assert_not_called()  # the pool ran; no in-process fallback
+        assert parallel == serial
+
+    def test_default_dir_scan_cache_stays_in_tmp(
+        self, tmp_claude_dir: Path, _isolated_claude_dir: Path,
+    ):
+        from src.token_tracker import session_parser
+
+        shutil.copytree(tmp_claude_dir, _isolated_claude_dir)
+        assert parse_all_sessions().totals["total_sessions"] == 2
+        assert (_isolated_claude_dir / session_parser.SCAN_CACHE_DIRNAME).is_dir()
+
+    def test_scan_cache_reuses_finished_sessions(self, tmp_claude_dir: Path):
+        from unittest.mock import patch
+
+        from src.token_tracker import session_parser
+
+        files = sorted((tmp_claude_dir / "projects").glob("*/*.jsonl"))
+        old, live = files
+        os.utime(old, ns=(1_000_000_000, 1_000_000_000))
+        first = report_to_dict(parse_all_sessions(claude_dir=tmp_claude_dir))
+        cache_dir = tmp_claude_dir / session_parser.SCAN_CACHE_DIRNAME
+        assert len(list(cache_dir.glob("*.json"))) == 1  # the live session isn't cached
+
+        with patch.object(
+            session_parser, "_iter_jsonl_entries", wraps=session_parser._iter_jsonl_entries,
+        ) as read:
+            assert report_to_dict(parse_all_sessions(claude_dir=tmp_claude_dir)) == first
+        assert [c.args[0] for c in read.call_args_list if c.args[0] in files] == [live]
+
+        # A changed file misses the cache and its stale entry is pruned
+        with open(old, "a", encoding="utf-8") as f:
+            f.write("\n")
+        os.utime(old, ns=(2_000_000_000, 2_000_000_000))
+        assert report_to_dict(parse_all_sessions(claude_dir=tmp_claude_dir)) == first
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+    def test_corrupt_scan_cache_is_reparsed(self, tmp_claude_dir: Path):
+        from src.token_tracker import session_parser
+
+        for f in (tmp_claude_dir / "projects").glob("*/*.jsonl"):
+            os.utime(f, ns=(1_000_000_000, 1_000_000_000))
+        first = report_to_dict(parse_all_sessions(claude_dir=tmp_claude_dir))
+        for entry in (tmp_claude_dir / session_parser.SCAN_CACHE_DIRNAME).glob("*.json"):
+            entry.write_text("{not json")
+        assert report_to_dict(parse_all_sessions(claude_dir=tmp_claude_dir)) == first
+
+    def test_prompt_runs_and_model_totals(self, tmp_path: Path):
+        proj = tmp_path / ".claude" / "projects" / "p"
+        proj.mkdir(parents=True)
+
+        def user(text: str) -> dict:
+            return {"type": "user", "message": {"role": "user", "content": text},
+                    "timestamp": "2026-02-19T10:00:00Z"}
+
+        def reply(model: str, tokens: int) -> dict:
+            return {"type": "assistant", "timestamp": "2026-02-19T10:00:01Z",
+                    "message": {"model": model, "usage": {"output_tokens": tokens}}}
+
+        entries = [
+            reply("a", 1),  # before any prompt: counted, but in no prompt run
+            user("first"), reply("a", 10), reply("b", 20),
+            user("second"), reply("b", 100),
+            user("first"), reply("b", 1000),
+        ]
+        (proj / "s.jsonl").write_text("\n".join(json.dumps(e) for e in entries))
+        report = parse_all_sessions(claude_dir=tmp_path / ".claude")
+
+        (session,) = report.sessions
+        assert session.model == "b"
+        assert session.first_prompt == "first"
+        assert session.output_tokens == 1131
+        assert [(p.prompt, p.output_tokens) for p in report.top_prompts] == [
+            ("first", 1000), ("second", 100), ("first", 30),
+        ]
+        assert {m.model: (m.query_count, m.output_tokens) for m in report.model_breakdown} == {
+            "a": (2, 11), "b": (3, 1120),
+        }
+        assert not hasattr(session.queries[0], "__dict__")
+
     def test_empty_projects_dir(self, tmp_path: Path):
         claude_dir = tmp_path / ".claude"
         # No projects dir at all
@@ -347,3 +496,51 @@ class TestReportToDict:
         assert "output_tokens" in session
         assert "total_tokens" in session
         assert "model" in session
+
+
+class TestComputeRateLimits:
+    def test_windows_and_old_entries_skipped_unparsed(self, tmp_path: Path):
+        from datetime import datetime, timedelta, timezone
+        from unittest.mock import patch
+
+        from src.token_tracker import session_parser
+
+        now = datetime.now(timezone.utc)
+        proj = tmp_path / ".claude" / "projects" / "p"
+        proj.mkdir(parents=True)
+
+        def entry(age: timedelta, tokens: int) -> str:
+            return json.dumps({
+                "type": "assistant",
+                "timestamp": (now - age).isoformat().replace("+00:00", "Z"),
+                "message": {"model": "m", "usage": {"input_tokens": tokens}},
+            })
+
+        (proj / "s.jsonl").write_text("\n".join([
+            entry(timedelta(hours=1), 10),
+            entry(timedelta(days=2), 100),
+            entry(timedelta(days=30), 1000),
+        ]))
+        with patch.object(session_parser, "_parse_ts", wraps=session_parser._parse_ts) as parse:
+            limits = session_parser.compute_rate_limits(tmp_path / ".claude")
+        assert limits["session"]["tokens_used"] == 10
+        assert limits["weekly"]["tokens_used"] == 110
+        assert limits["weekly"]["query_count"] == 2
+        assert parse.call_count == 2  # the 30-day-old entry never reached the parser
+
+    def test_scans_nested_session_files(self, tmp_path: Path):
+        from datetime import datetime, timezone
+
+        from src.token_tracker.session_parser import compute_rate_limits
+
+        nested = tmp_path / ".claude" / "projects" / "p" / "s1" / "subagents"
+        nested.mkdir(parents=True)
+        ts = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        line = json.dumps({
+            "type": "assistant", "timestamp": ts,
+            "message": {"model": "m", "usage": {"output_tokens": 7}},
+        })
+        (nested / "agent-1.jsonl").write_text(line)
+        (nested / "notes.txt").write_text(line)
+        limits = compute_rate_limits(tmp_path / ".claude")
+        assert limits["session"]["tokens_used"] == 7
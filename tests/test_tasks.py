@@ -31,6 +31,12 @@ class TestTask:
         assert d["title"] == "Write tests"
         assert '"key"' in d["metadata"]  # JSON string
 
+    def test_to_dict_has_every_field(self):
+        from dataclasses import fields
+
+        d = Task(title="X").to_dict()
+        assert list(d) == [f.name for f in fields(Task)]
+
     def test_from_row(self):
         row = {
             "id": "abc123",
@@ -62,6 +68,20 @@ class TestTaskStore:
         assert fetched.title == "Test task"
         assert fetched.column == "backlog"
 
+    def test_create_many(self, store):
+        created = store.create_many([Task(title="A"), Task(title="B", column="done")])
+        assert [t.title for t in created] == ["A", "B"]
+        assert store.stats()["total"] == 2
+        assert store.get(created[1].id).column == "done"
+
+    def test_create_many_is_atomic(self, store):
+        import sqlite3
+
+        existing = store.create(Task(title="A"))
+        with pytest.raises(sqlite3.IntegrityError):
+            store.create_many([Task(title="B"), Task(id=existing.id, title="dup")])
+        assert store.stats()["total"] == 1
+
     def test_list_all(self, store):
         store.create(Task(title="A"))
         store.create(Task(title="B"))
@@ -141,6 +161,33 @@ class TestTaskStore:
         assert stats["by_column"]["in-progress"] == 1
         assert stats["autopilot_count"] == 1
 
+    def test_stats_by_project_and_unknown_column(self, store):
+        store.create(Task(title="A", column="backlog", project_id="p1", autopilot=True))
+        store.create(Task(title="B", column="review", project_id="p1"))
+        store.create(Task(title="C", column="done", project_id="p2"))
+        with store._conn() as conn:
+            conn.execute('UPDATE tasks SET "column" = \'legacy\' WHERE title = \'B\'')
+        stats = store.stats("p1")
+        assert stats["total"] == 2
+        assert stats["by_column"]["backlog"] == 2
+        assert stats["autopilot_count"] == 1
+        assert store.stats("missing") == {
+            "total": 0, "by_column": {col: 0 for col in COLUMNS}, "autopilot_count": 0,
+        }
+
+    def test_board_card_shape(self, store):
+        task = store.create(Task(title="A", autopilot=True, metadata={"k": 1}))
+        card = store.board()["backlog"][0]
+        assert card["id"] == task.id
+        assert card["autopilot"] is True
+        assert card["metadata"] == {"k": 1}
+
+    def test_list_without_metadata(self, store):
+        store.create(Task(title="A", metadata={"tags": ["x"]}))
+        assert store.list_all()[0].metadata == {"tags": ["x"]}
+        assert store.list_all(load_metadata=False)[0].metadata == {}
+        assert store.list_by_column("backlog", load_metadata=False)[0].title == "A"
+
     def test_priority_ordering(self, store):
         store.create(Task(title="Low", priority=0, column="backlog"))
         store.create(Task(title="High", priority=1, column="backlog"))
@@ -156,5 +203,49 @@ class TestTaskStore:
         updated = store.update(task.id, autopilot=True)
         assert updated.autopilot is True
 
+    def test_connection_shared_across_threads(self, store):
+        import threading
+
+        with store._conn() as conn:
+            main = conn
+        seen: list = []
+
+        def work() -> None:
+            store.stats()
+            with store._conn() as conn:
+                seen.append(conn)
+
+        threads = [threading.Thread(target=work) for _ in range(50)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(seen) == 50
+        assert all(conn is main for conn in seen)  # short-lived threads leak nothing
+
+    def test_concurrent_writes(self, store):
+        import threading
+
+        threads = [
+            threading.Thread(target=store.create, args=(Task(title=f"T{i}"),))
+            for i in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert store.stats()["total"] == 20
+
+    def test_connection_pragmas(self, store):
+        with store._conn() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+    def test_close_then_reopen(self, store):
+        task = store.create(Task(title="Persist"))
+        store.close()
+        assert store.get(task.id).title == "Persist"
+
     def test_columns_constant(self):
         assert COLUMNS == ("backlog", "planned", "in-progress", "review", "done")
@@ -22,6 +22,10 @@ class TestUsageRecord:
         record = UsageRecord(agent_id="test", model="test", input_chars=0, output_chars=0)
         assert record.timestamp > 0
 
+    def test_slotted(self):
+        record = UsageRecord(agent_id="test", model="test", input_chars=0, output_chars=0)
+        assert not hasattr(record, "__dict__")
+
 
 class TestTokenTracker:
     def test_create_message_tracks_usage(self, tracker):